@@ -0,0 +1,463 @@
+# adjacencia.py — Redes de coautoria em CSR (NumPy, memory-map): vizinhança (ego-rede) e caminhos entre pesquisadores
+#
+# Para cada grafo o build grava em grafos_dados/csr/<nome>/:
+#   indptr.npy   (n+1,)  int64    vizinhos de i = indices[indptr[i]:indptr[i+1]]
+#   indices.npy  (2m,)   int32    (cada aresta nos dois sentidos, vizinhos ordenados)
+#   pesos.npy    (2m,)   float32  coautorias
+#   larguras.npy (2m,)   float32  coautorias relativas (espessura no desenho)
+#   nos.parquet                   posição i → id, nome, instituição, UF, grau
+# e, em grafos_dados/csr/_global/, a rede de todos os INCTs juntos (com os INCTs de cada pesquisador).
+# Em tempo de execução os .npy são abertos com mmap: nada do grafo é copiado
+# para a memória do processo além das páginas tocadas pela consulta.
+import heapq
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+import dados
+import grafos
+import grafos_area
+
+CSR_DIR = Path("grafos_dados") / "csr"
+MANIFEST_PATH = CSR_DIR / "manifest.json"
+ARRAYS = ("indptr", "indices", "pesos", "larguras")
+
+# Muda quando o formato gravado muda (força reexportar mesmo com a fonte igual)
+VERSAO_CSR = 1
+
+# Ego-redes de 2 saltos em torno de pesquisadores muito conectados são
+# podadas: ficam os vizinhos diretos e os de 2º grau mais ligados a eles
+EGO_MAX_NOS = 400
+
+COR_EGO = "#e45756"
+COR_SALTO = {1: grafos.COR_NO, 2: "#d6e6fb"}
+TAMANHO_MAX = 40
+
+SCHEMA_NOS = pa.schema([
+    ("id", pa.string()),
+    ("nome", pa.string()),
+    ("instituicao", pa.string()),
+    ("uf", pa.string()),
+    ("grau", pa.int32()),
+])
+
+# Rede global: todos os INCTs juntos, pesquisadores fundidos pelo ID
+GLOBAL = "_global"
+SCHEMA_NOS_GLOBAL = SCHEMA_NOS.append(pa.field("incts", pa.string()))
+
+
+# ==========================================================
+# 🏭 EXPORTAÇÃO (build)
+# ==========================================================
+
+def csr_de_arestas(n: int, u: np.ndarray, v: np.ndarray, pesos: np.ndarray, larguras: np.ndarray) -> tuple:
+    """(indptr, indices, pesos, larguras) de `n` nós a partir das arestas não direcionadas (u, v)."""
+    # cada aresta nos dois sentidos, ordenadas por (origem, destino)
+    origem = np.concatenate([u, v]).astype(np.int32)
+    destino = np.concatenate([v, u]).astype(np.int32)
+    ordem = np.lexsort((destino, origem))
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(origem, minlength=n), out=indptr[1:])
+    return (
+        indptr,
+        destino[ordem],
+        np.concatenate([pesos, pesos]).astype(np.float32)[ordem],
+        np.concatenate([larguras, larguras]).astype(np.float32)[ordem],
+    )
+
+
+def csr_de_nx(G) -> tuple:
+    """(nós ordenados por id, indptr, indices, pesos, larguras) do grafo networkx não direcionado."""
+    ids = sorted(str(n) for n in G.nodes())
+    pos = {n: i for i, n in enumerate(ids)}
+    arestas = [(pos[str(u)], pos[str(v)], a) for u, v, a in G.edges(data=True) if u != v]
+
+    u = np.fromiter((a for a, _, _ in arestas), dtype=np.int32, count=len(arestas))
+    v = np.fromiter((b for _, b, _ in arestas), dtype=np.int32, count=len(arestas))
+    w = np.fromiter((a.get("weight", 1.0) for *_, a in arestas), dtype=np.float32, count=len(arestas))
+    r = np.fromiter(
+        (a.get("Relative coauthorships", 1.0) for *_, a in arestas), dtype=np.float32, count=len(arestas)
+    )
+    return (ids, *csr_de_arestas(len(ids), u, v, w, r))
+
+
+def _gravar(pasta: Path, arrays: tuple, nos: pd.DataFrame, schema: pa.Schema):
+    """Grava os arrays CSR e a tabela de nós em `pasta` (cada arquivo de forma atômica)."""
+    pasta.mkdir(parents=True, exist_ok=True)
+    for nome_array, array in zip(ARRAYS, arrays):
+        tmp = pasta / f"{nome_array}.{os.getpid()}.tmp.npy"
+        np.save(tmp, array)
+        os.replace(tmp, pasta / f"{nome_array}.npy")
+    tmp = pasta / f"nos.{os.getpid()}.tmp"
+    pq.write_table(pa.Table.from_pandas(nos, schema=schema, preserve_index=False), tmp, compression="zstd")
+    os.replace(tmp, pasta / "nos.parquet")
+
+
+def exportar_csr(nome: str, fonte, origem_sha256: str | None = None) -> dict:
+    """Grava o CSR e a tabela de nós do grafo `nome`; devolve a entrada do manifest."""
+    inicio = time.perf_counter()
+    G = grafos.carregar_nx(fonte)
+    ids, indptr, indices, pesos, larguras = csr_de_nx(G)
+
+    attrs = G.nodes
+    nos = pd.DataFrame({
+        "id": ids,
+        "nome": [str(attrs[n].get("label", n)) for n in ids],
+        "instituicao": [attrs[n].get("Institution") for n in ids],
+        "uf": [attrs[n].get("State") for n in ids],
+        "grau": np.diff(indptr).astype(np.int32),
+    })
+    _gravar(CSR_DIR / nome, (indptr, indices, pesos, larguras), nos, SCHEMA_NOS)
+
+    return {
+        "versao": VERSAO_CSR,
+        "origem": str(fonte),
+        "origem_sha256": origem_sha256 or dados.file_sha256(fonte),
+        "nos": len(ids),
+        "arestas": int(len(indices) // 2),
+        "segundos": round(time.perf_counter() - inicio, 3),
+    }
+
+
+def _exportar_tarefa(args):
+    return args[0], exportar_csr(*args)
+
+
+def build_csr(fontes: dict, workers: int | None = None) -> dict:
+    """
+    Exporta em paralelo o CSR de todos os grafos de `fontes` ({nome: gexf}).
+    Grafos cuja fonte tem o mesmo sha256 do último build são reaproveitados.
+    """
+    anterior = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))["grafos"] if MANIFEST_PATH.exists() else {}
+    entradas, pendentes, ausentes = {}, [], []
+    for nome, gexf in sorted(fontes.items()):
+        fonte = grafos.fonte_grafo(nome, gexf)
+        if fonte is None:
+            ausentes.append(nome)
+            continue
+        sha = dados.file_sha256(fonte)
+        entrada = anterior.get(nome)
+        if (entrada and entrada.get("versao") == VERSAO_CSR and entrada["origem"] == str(fonte)
+                and entrada["origem_sha256"] == sha and (CSR_DIR / nome / "nos.parquet").exists()):
+            entradas[nome] = entrada
+        else:
+            pendentes.append((nome, fonte, sha))
+
+    if pendentes:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for nome, entrada in pool.map(_exportar_tarefa, pendentes):
+                entradas[nome] = entrada
+
+    manifest = json.loads(MANIFEST_PATH.read_text(encoding="utf-8")) if MANIFEST_PATH.exists() else {}
+    manifest["grafos"] = dict(sorted(entradas.items()))
+    CSR_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = MANIFEST_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, MANIFEST_PATH)
+    return {"grafos": len(entradas), "exportados": len(pendentes), "ausentes": ausentes}
+
+
+def build_global(catalogo: pd.DataFrame) -> dict:
+    """
+    CSR da rede global, a partir das contribuições de cada INCT mantidas por
+    grafos_area.py (rodar `grafos-area` antes). Pesquisadores são fundidos pelo
+    ID e cada par de coautores aparece uma vez, com o maior peso entre os INCTs.
+    Só é regravada quando alguma fonte de INCT mudou.
+    """
+    inicio = time.perf_counter()
+    fontes = json.loads(grafos_area.MANIFEST_PATH.read_text(encoding="utf-8"))["incts"]
+    assinatura = dados.file_sha256(grafos_area.ARESTAS_PATH)[:16] + dados.file_sha256(grafos_area.NOS_PATH)[:16]
+    manifest = json.loads(MANIFEST_PATH.read_text(encoding="utf-8")) if MANIFEST_PATH.exists() else {"grafos": {}}
+    anterior = manifest.get("global", {})
+    if (anterior.get("versao") == VERSAO_CSR and anterior.get("assinatura") == assinatura
+            and (CSR_DIR / GLOBAL / "nos.parquet").exists()):
+        return {**anterior, "exportado": False}
+
+    nos = pq.read_table(grafos_area.NOS_PATH).to_pandas()
+    arestas = pq.read_table(grafos_area.ARESTAS_PATH).to_pandas()
+    nome_inct = dict(zip(catalogo["path_gexf_html"].map(lambda p: Path(p).stem), catalogo["nome_inct"]))
+
+    por_id = nos.sort_values(["id", "inct"]).groupby("id", sort=True)
+    tabela = por_id[["label", "instituicao", "uf"]].first().rename(columns={"label": "nome"})
+    tabela["incts"] = por_id["inct"].agg(lambda s: "; ".join(sorted({nome_inct.get(i, i) for i in s})))
+    ids = tabela.index.to_numpy()
+
+    pares = arestas.groupby(["u", "v"], sort=True).agg(
+        coautorias=("coautorias", "max"), relativa=("relativa", "max")
+    ).reset_index()
+    u = np.searchsorted(ids, pares["u"].to_numpy())
+    v = np.searchsorted(ids, pares["v"].to_numpy())
+    indptr, indices, pesos, larguras = csr_de_arestas(
+        len(ids), u, v, pares["coautorias"].to_numpy(), pares["relativa"].to_numpy()
+    )
+
+    tabela = tabela.reset_index()
+    tabela["grau"] = np.diff(indptr).astype(np.int32)
+    _gravar(CSR_DIR / GLOBAL, (indptr, indices, pesos, larguras), tabela[SCHEMA_NOS_GLOBAL.names], SCHEMA_NOS_GLOBAL)
+
+    manifest["global"] = {
+        "versao": VERSAO_CSR,
+        "assinatura": assinatura,
+        "incts": len(fontes),
+        "nos": len(ids),
+        "arestas": int(len(indices) // 2),
+        "segundos": round(time.perf_counter() - inicio, 3),
+    }
+    CSR_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = MANIFEST_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, MANIFEST_PATH)
+    return {**manifest["global"], "exportado": True}
+
+
+# ==========================================================
+# 🔎 CONSULTA (painel)
+# ==========================================================
+
+class Adjacencia:
+    """Grafo em CSR aberto por memory-map, com consultas de vizinhança por ID do pesquisador."""
+
+    def __init__(self, pasta: Path, mmap_mode: str | None = "r"):
+        arrays = {a: np.load(Path(pasta) / f"{a}.npy", mmap_mode=mmap_mode) for a in ARRAYS}
+        self.indptr = arrays["indptr"]
+        self.indices = arrays["indices"]
+        self.pesos = arrays["pesos"]
+        self.larguras = arrays["larguras"]
+        self.nos = pq.read_table(Path(pasta) / "nos.parquet").to_pandas()
+        self._posicao = dict(zip(self.nos["id"], range(len(self.nos))))
+        self._nomes_busca = None
+
+    def __len__(self) -> int:
+        return len(self.nos)
+
+    def posicao(self, id_: str) -> int | None:
+        return self._posicao.get(str(id_))
+
+    def buscar(self, texto: str, limite: int = 50) -> pd.DataFrame:
+        """Pesquisadores cujo nome contém `texto` (sem diferenciar caixa e acentos), mais conectados primeiro."""
+        if self._nomes_busca is None:
+            self._nomes_busca = _sem_acentos(self.nos["nome"])
+        alvo = _sem_acentos(pd.Series([texto])).iat[0].strip()
+        if not alvo:
+            return self.nos.iloc[:0]
+        achados = self.nos[self._nomes_busca.str.contains(alvo, regex=False)]
+        return achados.sort_values(["grau", "nome"], ascending=[False, True]).head(limite)
+
+    def vizinhos(self, i: int) -> np.ndarray:
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def _faixas(self, nos: np.ndarray) -> tuple:
+        """(origem, posições em `indices`) de todas as arestas que saem de `nos`."""
+        inicio, fim = self.indptr[nos], self.indptr[nos + 1]
+        graus = fim - inicio
+        origem = np.repeat(nos, graus)
+        deslocamento = np.arange(graus.sum()) - np.repeat(np.cumsum(graus) - graus, graus)
+        return origem, np.repeat(inicio, graus) + deslocamento
+
+    def ego(self, id_: str, saltos: int = 1, max_nos: int = EGO_MAX_NOS) -> dict | None:
+        """
+        Ego-rede do pesquisador: nós a até `saltos` arestas dele e as arestas
+        entre eles. Acima de `max_nos`, os nós do último salto são os mais
+        ligados ao salto anterior. Devolve posições, distância ao ego e arestas (i, j, peso, largura).
+        """
+        centro = self.posicao(id_)
+        if centro is None:
+            return None
+
+        distancia = {centro: 0}
+        fronteira = np.array([centro], dtype=np.int64)
+        for salto in range(1, saltos + 1):
+            _, pos = self._faixas(fronteira)
+            candidatos = np.asarray(self.indices[pos], dtype=np.int64)
+            novos, ligacoes = np.unique(candidatos, return_counts=True)
+            fora = ~np.isin(novos, np.fromiter(distancia, dtype=np.int64))
+            novos, ligacoes = novos[fora], ligacoes[fora]
+            vagas = max(0, max_nos - len(distancia))
+            if len(novos) > vagas:
+                manter = np.lexsort((novos, -ligacoes))[:vagas]
+                novos = np.sort(novos[manter])
+            distancia.update((int(n), salto) for n in novos)
+            fronteira = novos
+
+        nos = np.fromiter(distancia, dtype=np.int64)
+        origem, pos = self._faixas(nos)
+        destino = np.asarray(self.indices[pos], dtype=np.int64)
+        dentro = np.isin(destino, nos) & (origem < destino)
+        return {
+            "nos": nos,
+            "distancia": np.array([distancia[int(n)] for n in nos], dtype=np.int8),
+            "arestas": (
+                origem[dentro],
+                destino[dentro],
+                np.asarray(self.pesos[pos[dentro]]),
+                np.asarray(self.larguras[pos[dentro]]),
+            ),
+            "vizinhos_diretos": int(self.indptr[centro + 1] - self.indptr[centro]),
+        }
+
+    def _nos_vis(self, posicoes, cores) -> list:
+        info = self.nos.iloc[posicoes]
+        return [
+            {
+                "id": id_no,
+                "label": nome,
+                "title": " · ".join(str(x) for x in (inst, uf) if pd.notna(x)) + f" · {grau} coautores",
+                "color": cor,
+                "shape": "dot",
+                "size": min(TAMANHO_MAX, max(6, 2 * int(grau))),
+            }
+            for id_no, nome, inst, uf, grau, cor in zip(
+                info["id"], info["nome"], info["instituicao"], info["uf"], info["grau"], cores
+            )
+        ]
+
+    def _arestas_vis(self, origem, destino, pesos, larguras) -> list:
+        ids = self.nos["id"].to_numpy()
+        return [
+            {
+                "id": f"{ids[u]}-{ids[v]}",
+                "from": ids[u],
+                "to": ids[v],
+                "title": f"{p:g} coautorias",
+                "width": float(w),
+            }
+            for u, v, p, w in zip(
+                np.asarray(origem).tolist(), np.asarray(destino).tolist(),
+                np.asarray(pesos).tolist(), np.asarray(larguras).tolist(),
+            )
+        ]
+
+    def grafo_ego(self, id_: str, saltos: int = 1, max_nos: int = EGO_MAX_NOS) -> dict | None:
+        """Ego-rede no formato do vis-network (o layout fica por conta do navegador)."""
+        ego = self.ego(id_, saltos, max_nos)
+        if ego is None:
+            return None
+
+        cores = [COR_EGO if d == 0 else COR_SALTO[min(int(d), 2)] for d in ego["distancia"]]
+        nodes = self._nos_vis(ego["nos"], cores)
+        edges = self._arestas_vis(*ego["arestas"])
+        return {"nodes": nodes, "edges": edges, "vizinhos_diretos": ego["vizinhos_diretos"]}
+
+    # ---------- caminhos entre pesquisadores ----------
+
+    def _aresta(self, u: int, v: int) -> int:
+        """Posição em `indices` da aresta u → v (vizinhos de cada nó estão ordenados)."""
+        inicio = int(self.indptr[u])
+        return inicio + int(np.searchsorted(self.vizinhos(u), v))
+
+    def _bfs_bidirecional(self, s: int, t: int) -> list | None:
+        """
+        Menor número de saltos de s a t, expandindo a cada rodada o lado com
+        a fronteira de menor grau total. Cada rodada processa um nível inteiro
+        de uma vez (vetorizado sobre o CSR).
+        """
+        n = len(self)
+        dist = [np.full(n, -1, dtype=np.int32), np.full(n, -1, dtype=np.int32)]
+        pai = [np.full(n, -1, dtype=np.int64), np.full(n, -1, dtype=np.int64)]
+        fronteira = [np.array([s], dtype=np.int64), np.array([t], dtype=np.int64)]
+        dist[0][s] = dist[1][t] = 0
+
+        while len(fronteira[0]) and len(fronteira[1]):
+            custo = [int((self.indptr[f + 1] - self.indptr[f]).sum()) for f in fronteira]
+            lado, outro = (0, 1) if custo[0] <= custo[1] else (1, 0)
+            origem, pos = self._faixas(fronteira[lado])
+            destino = np.asarray(self.indices[pos], dtype=np.int64)
+            livres = dist[lado][destino] < 0
+            destino, primeiro = np.unique(destino[livres], return_index=True)
+            nivel = dist[lado][fronteira[lado][0]] + 1
+            dist[lado][destino] = nivel
+            pai[lado][destino] = origem[livres][primeiro]
+
+            encontro = destino[dist[outro][destino] >= 0]
+            if len(encontro):
+                meio = int(encontro[np.argmin(dist[outro][encontro])])
+                ida, volta = [meio], []
+                while ida[-1] != s:
+                    ida.append(int(pai[0][ida[-1]]))
+                no = meio
+                while no != t:
+                    no = int(pai[1][no])
+                    volta.append(no)
+                return ida[::-1] + volta
+            fronteira[lado] = destino
+        return None
+
+    def _dijkstra(self, s: int, t: int) -> list | None:
+        """Caminho de menor custo com custo da aresta = 1 / coautorias (laços fortes saem baratos)."""
+        dist, pai, feitos = {s: 0.0}, {s: s}, set()
+        fila = [(0.0, s)]
+        while fila:
+            d, u = heapq.heappop(fila)
+            if u in feitos:
+                continue
+            if u == t:
+                break
+            feitos.add(u)
+            inicio, fim = int(self.indptr[u]), int(self.indptr[u + 1])
+            for v, w in zip(self.indices[inicio:fim].tolist(), self.pesos[inicio:fim].tolist()):
+                nd = d + 1.0 / max(w, 1e-6)
+                if nd < dist.get(v, float("inf")):
+                    dist[v], pai[v] = nd, u
+                    heapq.heappush(fila, (nd, v))
+        if t not in pai:
+            return None
+        caminho = [t]
+        while caminho[-1] != s:
+            caminho.append(pai[caminho[-1]])
+        return caminho[::-1]
+
+    def caminho(self, origem_id: str, destino_id: str, ponderado: bool = False) -> list | None:
+        """
+        Posições dos pesquisadores no caminho de colaboração de `origem_id` a
+        `destino_id`: menos intermediários (BFS bidirecional) ou, com
+        `ponderado`, laços mais fortes (Dijkstra). None se não há ligação.
+        """
+        s, t = self.posicao(origem_id), self.posicao(destino_id)
+        if s is None or t is None:
+            return None
+        if s == t:
+            return [s]
+        return self._dijkstra(s, t) if ponderado else self._bfs_bidirecional(s, t)
+
+    def tabela_caminho(self, caminho: list) -> pd.DataFrame:
+        """Uma linha por pesquisador do caminho, com as coautorias com o anterior."""
+        tabela = self.nos.iloc[caminho].reset_index(drop=True)
+        pos = [self._aresta(u, v) for u, v in zip(caminho, caminho[1:])]
+        tabela["coautorias_com_anterior"] = [None] + [float(self.pesos[p]) for p in pos]
+        return tabela
+
+    def grafo_caminho(self, caminho: list) -> dict:
+        """O caminho no formato do vis-network: extremos destacados, intermediários na cor padrão."""
+        cores = [COR_EGO if k in (0, len(caminho) - 1) else grafos.COR_NO for k in range(len(caminho))]
+        pos = np.array([self._aresta(u, v) for u, v in zip(caminho, caminho[1:])], dtype=np.int64)
+        return {
+            "nodes": self._nos_vis(caminho, cores),
+            "edges": self._arestas_vis(caminho[:-1], caminho[1:], self.pesos[pos], self.larguras[pos]),
+        }
+
+
+def _sem_acentos(s: pd.Series) -> pd.Series:
+    return s.str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii").str.lower()
+
+
+def rotulos(nos: pd.DataFrame) -> dict:
+    """{rótulo: ID} para seletores; homônimos ganham o ID no rótulo."""
+    repetido = nos["nome"].duplicated(keep=False)
+    return dict(zip(nos["nome"].where(~repetido, nos["nome"] + " · " + nos["id"]), nos["id"]))
+
+
+@st.cache_resource(show_spinner=False)
+def load_adjacencia(nome: str) -> Adjacencia | None:
+    """CSR do grafo `nome` (build_assets.py csr) aberto por mmap, um por processo."""
+    pasta = CSR_DIR / nome
+    if not (pasta / "nos.parquet").exists():
+        return None
+    return Adjacencia(pasta)
@@ -1,34 +1,207 @@
 # app_area.py — Painel por Área
+#
+# Como em app_inct.py: plotly.express, wordcloud e polars só são importados
+# pela seção/função que os usa (mapa.py e sankey.py incluídos).
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 from pathlib import Path
-import networkx as nx
-from pyvis.network import Network
+import consultas
+import dados
+import grafos
+import indices
+import kpis
+import mapa
+import nuvem
+import sankey
+import similaridade
+import tendencias
+import metricas
 
-from wordcloud import WordCloud
 
 # ==========================================================
-# 🧠 FUNÇÕES CACHEADAS
+# 🧩 CARDS INTERATIVOS (st.fragment)
 # ==========================================================
+# Cada card com widget é um fragmento: mexer no widget reexecuta só o card,
+# sem redesenhar grafo, mapa, KPIs e os demais gráficos do painel.
 
-@st.cache_data(show_spinner=False)
-def load_csv_cached(path: str) -> pd.DataFrame:
-    """Lê CSV e guarda em cache"""
-    return pd.read_csv(path)
+@st.fragment
+def _card_sankey(area_sel: str, id_area):
+    with st.container(border=True):
+        col_periodos, col_janela, col_k = st.columns([3, 1, 1], gap="medium")
+        with col_periodos:
+            # os períodos escolhidos formam as janelas; os fluxos ligam janelas consecutivas
+            periodos_sankey = st.multiselect(
+                "Períodos comparados",
+                options=sankey.periodos(),
+                default=sankey.periodos(),
+                key=f"periodos_sankey_{area_sel}",
+            )
+        with col_janela:
+            # períodos consecutivos somados numa mesma janela (ex.: 2010-2020 × 2020-2025)
+            por_janela = 1
+            if len(sankey.periodos()) > 2:
+                por_janela = st.select_slider(
+                    "Períodos por janela",
+                    options=list(range(1, len(sankey.periodos()))),
+                    value=1,
+                    key=f"por_janela_sankey_{area_sel}",
+                )
+        with col_k:
+            top_k = st.select_slider(
+                "Fluxos exibidos",
+                options=sankey.TOP_K_VALORES,
+                value=sankey.TOP_K_PADRAO,
+                format_func=lambda k: "Todos" if k == 0 else str(k),
+                key=f"topk_sankey_{area_sel}",
+            )
+
+        # fluxos calculados pelo motor (memoizados por entidade/janelas/top-k) e desenhados nativamente
+        janelas = sankey.janelas_consecutivas(periodos_sankey, por_janela)
+        fig_sankey = sankey.get_figura("area", id_area, janelas, top_k)
+
+        if fig_sankey is not None:
+            st.plotly_chart(
+                fig_sankey,
+                config={
+                    "displayModeBar": True,
+                    "displaylogo": False,
+                    "responsive": True,
+                    "scrollZoom": False,
+                },
+            )
+        elif len(janelas) < 2:
+            st.info("Selecione períodos suficientes para ao menos duas janelas.")
+        else:
+            st.info("Nenhum gráfico Sankey disponível para esta área.")
+
+
+@st.fragment
+def _secao_palavras(area_sel: str, id_area, wc_area: pd.DataFrame):
+    """Filtro de período + barras de palavras-chave + nuvem | maior formação (o filtro vale para os três)."""
+    import plotly.express as px
+    # rollups (barras e maior formação) no backend Polars; a nuvem usa a fatia da Área
+    consultas_area = consultas.load_consultas()
+    st.divider()
+    st.subheader("Distribuição de Palavras-Chave")
+
+    periodos_sel = []
+    df_area_sel = wc_area
+    try:
+        # 🔹 Seleciona períodos da base agregada
+        periodos_wc = consultas_area.periodos()
+
+        # 🔹 Multiselect
+        periodos_sel = st.multiselect(
+            "Filtrar por período:",
+            options=periodos_wc,
+            default=periodos_wc
+        )
+
+        # 🔹 Filtra períodos
+        if periodos_sel:
+            df_area_sel = wc_area[wc_area["periodo"].isin(periodos_sel)]
+
+        # 🔹 Gráfico
+        top_words = consultas_area.top_palavras(id_area, periodos_sel, n=100)
+        if not top_words.empty:
+            st.bar_chart(top_words, width="stretch")
+        else:
+            st.info("Sem palavras disponíveis para esta área e período selecionado.")
+
+    except Exception as e:
+        st.warning(f"Erro ao carregar wordcloud: {e}")
+
+    # ====================== CARDS: WORDCLOUD | MAIOR FORMAÇÃO ======================
+    col_wc, col_form = st.columns(2, gap="medium")
+
+    with col_wc:
+        _card_nuvem(area_sel, id_area, df_area_sel, periodos_sel)
+
+    # ---------- CARD 2: MAIOR FORMAÇÃO ----------
+    with col_form:
+        with st.container(border=True):
+            st.markdown(f"#### Maior Formação por Área")
+
+            df_plot = consultas_area.maior_formacao(id_area)
+
+            if df_plot.empty:
+                st.warning("Nenhuma informação de formação disponível para esta Área.")
+            else:
+                fig_bar = px.bar(
+                    df_plot,
+                    x="count",
+                    # y="area_de_maior_formacao",
+                    y="area_de_maior_formacao",
+                    orientation="h",
+                    color="count",
+                    color_continuous_scale="Blues",
+                    text="count",
+                    labels={
+                        "count": "Quantidade",
+                        "area_de_maior_formacao": "Área"
+                    },
+                )
+                fig_bar.update_layout(
+                    xaxis_title="Número de Pesquisadores",
+                    yaxis_title="Área de Formação",
+                    #height=420,
+                    height=530,
+                    margin=dict(l=10, r=10, t=30, b=0),
+                )
+                fig_bar.update_traces(textposition="outside")
+
+                # Somente config (nada de kwargs antigos) -> sem avisos
+                st.plotly_chart(
+                    fig_bar,
+                    config={
+                        "displayModeBar": True,
+                        "displaylogo": False,
+                        "responsive": True,
+                        #"scrollZoom": True,
+                        "scrollZoom": False,
+                        "doubleClick": "reset",  # padrão seguro
+                        "modeBarButtonsToRemove": [
+                                    "zoom2d", "pan2d", "select2d", "lasso2d", "zoomIn2d",
+                                    "zoomOut2d", "resetScale2d" #"autoScale2d",
+                                ],
+                    },
+                )
 
-@st.cache_data(show_spinner=False)
-def load_cached_html(html_path: str) -> str | None:
-    """Carrega HTML pré-gerado do grafo (PyVis) se existir."""
-    p = Path(html_path)
-    if p.exists():
-        return p.read_text(encoding="utf-8")
-    return None
 
-@st.cache_data(show_spinner=False)
-def load_html_sankey_cached(path: str) -> str:
-    """Lê e cacheia o HTML do Sankey"""
-    return open(path, encoding="utf-8").read()
+@st.fragment
+def _card_nuvem(area_sel: str, id_area, wc_sel: pd.DataFrame, periodos_sel: list):
+    with st.container(border=True):
+        st.markdown("#### Nuvem de Palavras")
+
+        if wc_sel.empty:
+            st.warning("Nenhuma frase disponível para gerar a nuvem com os filtros atuais.")
+        else:
+            # remove palavras isoladas muito comuns e monta o
+            # dicionário de frequências diretamente da base
+            freqs = nuvem.frequencias(wc_sel)
+
+            if not freqs:
+                st.warning("Nenhuma frase disponível após filtragem.")
+            else:
+                top_n = st.slider(
+                    "Número de expressões exibidas",
+                    min_value=10,
+                    max_value=300,
+                    value=30,
+                    step=10,
+                    key=f"slider_wc_{area_sel}",
+                )
+
+                # top n ordenado
+                freqs_top = nuvem.top_frequencias(freqs, top_n)
+
+                # wordcloud via cache (memória → disco → renderização)
+                png = nuvem.load_nuvem_cache().get_or_render(
+                    f"area:{id_area}", top_n, periodos_sel, freqs_top
+                )
+
+                st.image(png, width="content")
+
 
 # ==========================================================
 # 🧩 FUNÇÃO PRINCIPAL
@@ -36,20 +209,16 @@ def load_html_sankey_cached(path: str) -> str:
 def run(area_sel: str, df_filtrado: pd.DataFrame):
     # ======================== IO ============================    
     INST_PATH     = "bases/select_instituicoes_por_inct.csv"
-    PROD_BBL_PATH = "bases/big_number_qtd_producao_bibliografica_periodo_area.csv"
-    MAIOR_FORMACAO_PATH = "bases/big_number_maior_formacao.csv"
     PALAVRAS_WORDCLOUD_PATH = "bases/wordcloud_area_agg.csv"
     PATH_GRAD = "bases/grafico_maior_graduacao_area.csv"
     TEXTO_PATH = "bases/texto_descricao_area.csv"
     
-    df_inst  = load_csv_cached(INST_PATH)
-    prod_bbl = load_csv_cached(PROD_BBL_PATH)
-    maior_formacoes = load_csv_cached(MAIOR_FORMACAO_PATH)
-    df_wc_area_agg = load_csv_cached(PALAVRAS_WORDCLOUD_PATH)
-    df_grad = load_csv_cached(PATH_GRAD)
-    df_texto_area = load_csv_cached(TEXTO_PATH)
-    
     info = df_filtrado.iloc[0]
+    id_area = info["identificador_area"]
+
+    # Fatias já indexadas por Área (sem varrer as bases a cada rerun)
+    idx = indices.load_indices()
+    df_texto_area = idx.area(TEXTO_PATH, id_area)
     
 
     # ====== FILTRO DE PERÍODO ======
@@ -79,62 +248,39 @@ def run(area_sel: str, df_filtrado: pd.DataFrame):
 #     st.markdown(texto_coautoria)
 
     # ==========================================================
-    # 🕸️ GRAFO INTERATIVO (GEXF CACHEADO)
+    # 🕸️ GRAFO INTERATIVO (união dos grafos dos INCTs da Área)
     # ==========================================================
-    # path_gexf = info.get("path_area_gexf_html", "")
-    # html_cached_path = f"gexf_html/{Path(path_gexf).stem}.html"
-    # with st.container(border=True):
-    #     st.markdown("#### Rede de Colaboração")
-    #     html = load_cached_html(html_cached_path)
-    #     if html:
-    #         st.components.v1.html(
-    #             #html,
-    #             f"""
-    #             <iframe srcdoc='{html.replace("'", "&apos;")}'
-    #                     style="width:100%; height:950px; border:none; overflow:hidden;">
-    #             </iframe>
-    #             """,
-    #             height=900,
-    #             scrolling=False
-    #         )
-    #     else:
-    #         st.info(
-    #             "📁 Grafo da área ainda não foi pré-gerado. "
-    #             f"Esperado: `{html_cached_path}`"
-    #         )
+    nome_grafo = Path(info.get("path_area_gexf_html", "")).stem
+
+    # o GEXF da Área é montado no build (build_assets.py grafos-area) e segue o
+    # mesmo caminho dos INCTs: layout pronto + vista reduzida servidos de static/
+    entrada_grafo = grafos.entrada_grafo(nome_grafo)
+    with st.container(border=True):
+        st.markdown("#### Rede de Colaboração")
+        if entrada_grafo:
+            st.components.v1.html(
+                grafos.html_visualizador(entrada_grafo),
+                height=grafos.ALTURA + 10,
+                scrolling=False
+            )
+        else:
+            st.info("📁 Grafo da área não publicado (rodar `build_assets.py grafos-area` e `grafos`).")
+
+    # ====== ATORES CENTRAIS E COMUNIDADES (métricas pré-calculadas no build) ======
+    metricas.render_card(nome_grafo)
+
+    # ====== TEMÁTICA SEMELHANTE (TF-IDF das palavras-chave, vizinhos pré-calculados) ======
+    similaridade.render_card("area", id_area)
 
     # ==========================================================
     # 🪢 FLUXO SANKEY (CACHEADO)
     # ==========================================================
     st.subheader("Fluxo Sankey — Palavras-chave por Período")
 
-    sankey_path = Path(f"sankey_inct_palavra_tratada_area/sankey_inct_{info['identificador_area']}.html")
+    _card_sankey(area_sel, id_area)
 
-    with st.container(border=True):
-        if sankey_path.exists():
-            try:
-                html = load_html_sankey_cached(sankey_path)
-                sankey_html = f"""
-                <div style="
-                        width: 100%;
-                        overflow-x: auto;
-                        padding: 10px;
-                        background-color: #fff;
-                        text-align: center;
-                        ">
-                    <div style="
-                        display: inline-block;
-                        min-width: 900px;
-                        width: max-content;
-                    ">
-                    {html}</div>
-                </div>
-                """
-                st.components.v1.html(sankey_html, height=1000, scrolling=False)
-            except Exception as e:
-                st.warning(f"⚠️ Erro ao carregar o gráfico Sankey: {e}")
-        else:
-            st.info("Nenhum gráfico Sankey disponível para esta área.")
+    # ====== PALAVRAS EMERGENTES | EM DECLÍNIO (tendências pré-calculadas no build) ======
+    tendencias.render_cards("area", info["identificador_area"])
 
     # ==========================================================
     # 📊 KPIs iniciais
@@ -199,64 +345,23 @@ def run(area_sel: str, df_filtrado: pd.DataFrame):
     st.divider()
     st.markdown("### Produção Bibliográfica por Período")
     
-    import unicodedata
-    
-    def normalize_text(text):
-        """Remove acentos, normaliza hífen e deixa em minúsculas."""
-        if pd.isna(text):
-            return ""
-        text = str(text).strip().lower()
-        text = unicodedata.normalize("NFKC", text)
-        text = text.replace("–", "-")  # troca hífen especial por simples
-        return text
-    
-    def get_val(df, tipo, periodo):
-        """Busca o valor de produção de forma robusta (tolerante a variações)."""
-        if df.empty:
-            return 0
-        tipo_norm = normalize_text(tipo)
-        periodo_norm = normalize_text(periodo)
-        df["tipo_norm"] = df["tipo_producao"].apply(normalize_text)
-        df["periodo_norm"] = df["periodo"].apply(normalize_text)
-        val = df.query("tipo_norm == @tipo_norm and periodo_norm == @periodo_norm")["n_tipos_producao"]
-        return int(val.iloc[0]) if not val.empty else 0
-    
-    
-    tipos = [
-        ("Artigos Publicados",               "Artigo Publicado"),
-        ("Trabalhos em Eventos",             "Trabalho Em Eventos"),
-        ("Capítulos de Livros",              "Capitulo De Livro Publicado"),
-        ("Livros Publicados/Organizados",    "Livro Publicado Ou Organizado"),
-        ("Textos em Jornais/Revistas",       "Texto Em Jornal Ou Revista"),
-        ("Outras Produções Bibliográficas",  "Outra Producao Bibliografica"),
-        ("Artigos Aceitos",                  "Artigo Aceito Para Publicacao"),
-        ("Prefácios/Pósfácios",              "Prefacio Posfacio"),
-        ("Traduções",                        "Traducao"),
-        ("Partituras Musicais",              "Partitura Musical"),
-    ]
-    
-    periodos = ["2010-2015", "2015-2020", "2020-2025"]
-    
-    df_prod_bbl = (
-        prod_bbl[prod_bbl["area"] == area_sel].copy()
-        if "area" in prod_bbl.columns
-        else pd.DataFrame()
-    )
+    # Grade 10 tipos × 3 períodos da área, pré-computada uma vez por processo
+    grade = kpis.load_kpis().area.grade(id_area)
     
     # === Layout responsivo: 2 linhas (5 métricas cada) ===
-    for periodo in periodos:
+    for j, periodo in enumerate(kpis.PERIODOS):
         st.markdown(f"### {periodo}")
         
     
         # Divide os 10 tipos em 2 linhas de 5
-        for linha in range(0, len(tipos), 5):
-            subset = tipos[linha:linha+5]
+        for linha in range(0, len(kpis.TIPOS), 5):
+            subset = kpis.TIPOS[linha:linha+5]
     
             with st.container(horizontal=True, gap="medium"):
                 cols = st.columns(len(subset), gap="medium")
     
                 for i, (titulo, tipo) in enumerate(subset):
-                    val = get_val(df_prod_bbl, tipo, periodo)
+                    val = int(grade[linha + i, j])
     
                     with cols[i]:
                         st.metric(
@@ -292,174 +397,10 @@ def run(area_sel: str, df_filtrado: pd.DataFrame):
     # ==========================================================
     # ☁️ NUVEM DE PALAVRAS — GRÁFICO DE BARRAS
     # ==========================================================
-    st.divider()
-    st.subheader("Distribuição de Palavras-Chave")
-    
-    try:
-        # 🔹 Seleciona períodos da base agregada
-        periodos_wc = sorted(df_wc_area_agg["periodo"].unique())
-    
-        # 🔹 Multiselect
-        periodos_sel = st.multiselect(
-            "Filtrar por período:",
-            options=periodos_wc,
-            default=periodos_wc
-        )
-    
-        # 🔹 Filtra pela área selecionada
-        df_area_sel = df_wc_area_agg[df_wc_area_agg["area"] == area_sel]
-    
-        # 🔹 Filtra períodos
-        if periodos_sel:
-            df_area_sel = df_area_sel[df_area_sel["periodo"].isin(periodos_sel)]
-    
-        # 🔹 Gráfico
-        if not df_area_sel.empty:
-            top_words = (
-                df_area_sel.groupby("palavra")["freq"]
-                .sum()
-                .sort_values(ascending=False)
-                .head(100)
-            )
-            st.bar_chart(top_words, width="stretch")
-        else:
-            st.info("Sem palavras disponíveis para esta área e período selecionado.")
-    
-    except Exception as e:
-        st.warning(f"Erro ao carregar wordcloud: {e}")
+    import plotly.express as px  # só carregado quando o painel chega aos gráficos de barras
 
-
-
-    # ====================== CARDS: WORDCLOUD | MAIOR FORMAÇÃO ======================
-    # ====================== CARDS: WORDCLOUD | MAIOR FORMAÇÃO ======================
-    import matplotlib
-    matplotlib.use("Agg")
-    
-    col_wc, col_form = st.columns(2, gap="medium")
-    
-    with col_wc:
-        with st.container(border=True):
-            st.markdown("#### Nuvem de Palavras")
-    
-            # 🔹 Filtra pela área
-            wc_sel = df_wc_area_agg[df_wc_area_agg["area"] == area_sel]
-    
-            # 🔹 Filtrar períodos selecionados
-            if periodos_sel:
-                wc_sel = wc_sel[wc_sel["periodo"].isin(periodos_sel)]
-    
-            if wc_sel.empty:
-                st.warning("Nenhuma frase disponível para gerar a nuvem com os filtros atuais.")
-            else:
-                s = wc_sel["palavra"].astype(str)
-    
-                # stopwords básicas
-                STOPWORDS_ONEWORD = {
-                    "de","da","do","das","dos","em","no","na","nas","nos","para","por",
-                    "e","a","o","os","as","um","uma","com","ao","aos","se","que",
-                    "sobre","entre","ou","como"
-                }
-    
-                # remove palavras isoladas muito comuns
-                mascara_um_termo = ~s.str.contains(r"\s", regex=True)
-                palavras_validas = s[~(mascara_um_termo & s.isin(STOPWORDS_ONEWORD))]
-    
-                # alinhar com a base original
-                wc_filtrado = wc_sel.loc[palavras_validas.index]
-    
-                # dicionário de frequências diretamenre da base
-                freqs = dict(
-                    zip(
-                        wc_filtrado["palavra"],
-                        wc_filtrado["freq"]
-                    )
-                )
-    
-                if not freqs:
-                    st.warning("Nenhuma frase disponível após filtragem.")
-                else:
-                    top_n = st.slider(
-                        "Número de expressões exibidas",
-                        min_value=10,
-                        max_value=300,
-                        value=30,
-                        step=10,
-                        key=f"slider_wc_{area_sel}",
-                    )
-    
-                    # top n ordenado
-                    freqs_top = dict(
-                        sorted(freqs.items(), key=lambda x: x[1], reverse=True)[:top_n]
-                    )
-    
-                    # gerar wordcloud
-                    wc_img = WordCloud(
-                        width=900,
-                        height=500,
-                        background_color="white",
-                        colormap="Blues",
-                        collocations=False,
-                    ).generate_from_frequencies(freqs_top)
-    
-                    st.image(wc_img.to_array(), width="content")
-    
-
-    # ---------- CARD 2: MAIOR FORMAÇÃO ----------
-    with col_form:
-        with st.container(border=True):
-            st.markdown(f"#### Maior Formação por Área")
-    
-            df_plot = (
-                maior_formacoes[maior_formacoes["area"] == area_sel]
-                #.sort_values("qtd", ascending=False)
-                # maior_formacoes
-                   .groupby(["area", "area_de_maior_formacao"], as_index=False)["count"]
-                   .sum()
-                   .sort_values("count", ascending=False)
-            )
-    
-            if df_plot.empty:
-                st.warning("Nenhuma informação de formação disponível para esta Área.")
-            else:
-                fig_bar = px.bar(
-                    df_plot,
-                    x="count",
-                    # y="area_de_maior_formacao",
-                    y="area_de_maior_formacao",
-                    orientation="h",
-                    color="count",
-                    color_continuous_scale="Blues",
-                    text="count",
-                    labels={
-                        "count": "Quantidade",
-                        "area_de_maior_formacao": "Área"
-                    },
-                )
-                fig_bar.update_layout(
-                    xaxis_title="Número de Pesquisadores",
-                    yaxis_title="Área de Formação",
-                    #height=420,
-                    height=530,
-                    margin=dict(l=10, r=10, t=30, b=0),
-                )
-                fig_bar.update_traces(textposition="outside")
-    
-                # Somente config (nada de kwargs antigos) -> sem avisos
-                st.plotly_chart(
-                    fig_bar,
-                    config={
-                        "displayModeBar": True,
-                        "displaylogo": False,
-                        "responsive": True,
-                        #"scrollZoom": True,
-                        "scrollZoom": False,
-                        "doubleClick": "reset",  # padrão seguro
-                        "modeBarButtonsToRemove": [
-                                    "zoom2d", "pan2d", "select2d", "lasso2d", "zoomIn2d",
-                                    "zoomOut2d", "resetScale2d" #"autoScale2d",
-                                ],
-                    },
-                )
+    # o filtro de período reexecuta barras, nuvem e maior formação; o slider, só a nuvem
+    _secao_palavras(area_sel, id_area, idx.area(PALAVRAS_WORDCLOUD_PATH, id_area))
 
     # ======================== MAPA + TOP INSTITUIÇÕES ===================
     col_uf, col_form = st.columns(2, gap="medium")
@@ -469,50 +410,11 @@ def run(area_sel: str, df_filtrado: pd.DataFrame):
             st.markdown("#### Distribuição do Endereço Profissional por UF")
             
     
-            info_instituicao = df_inst[df_inst["area"] == area_sel].copy()
-            ufs = [
-                "AC","AL","AM","AP","BA","CE","DF","ES","GO","MA","MG","MS","MT",
-                "PA","PB","PE","PI","PR","RJ","RN","RO","RR","RS","SC","SE","SP","TO"
-            ]
-            uf_base = pd.DataFrame({"uf": ufs})
-    
-            if not info_instituicao.empty:
-                uf_counts = (
-                    info_instituicao.groupby("uf")["nome_instituicao_empresa"]
-                    .count()
-                    .reset_index(name="qtd")
-                )
-            else:
-                uf_counts = pd.DataFrame(columns=["uf", "qtd"])
-    
-            uf_counts = uf_base.merge(uf_counts, on="uf", how="left").fillna(0)
-    
-            geojson_url = "https://raw.githubusercontent.com/codeforamerica/click_that_hood/master/public/data/brazil-states.geojson"
+            info_instituicao = idx.area(INST_PATH, id_area)
+            uf_counts = mapa.contagem_uf(info_instituicao)
     
-            fig_mapa = px.choropleth(
-                uf_counts,
-                geojson=geojson_url,
-                locations="uf",
-                featureidkey="properties.sigla",
-                color="qtd",
-                hover_name="uf",
-                hover_data={"qtd": True},
-                #hover_data={"qtd": "Quantidade de Instituições/Empresas"},
-                color_continuous_scale="Blues",
-                range_color=(0, int(uf_counts["qtd"].max()) if len(uf_counts) else 0),
-                #title="Distribuição do Endereço Profissional por UF",
-                labels={
-                        "uf": "UF",
-                        "qtd": "Quantidade de Instituições/Empresas"
-                    },
-            )
-            fig_mapa.update_geos(fitbounds="locations", visible=False, scope="south america")
-            fig_mapa.update_layout(
-                height=500,
-                margin=dict(l=0, r=0, t=40, b=0),
-                coloraxis_colorbar=dict(title="Instituições"),
-                dragmode=False,
-            )
+            # Figura base (GeoJSON local simplificado) montada uma vez; só `qtd` muda
+            fig_mapa = mapa.figura_uf(uf_counts)
     
             # ✅ NENHUM argumento solto — tudo via config
             st.plotly_chart(
@@ -586,9 +488,9 @@ def run(area_sel: str, df_filtrado: pd.DataFrame):
     with st.container(border=True):
         st.markdown("#### Distribuição das Formações Mais Altas")
     
-        if Path(PATH_GRAD).exists():
+        if dados.base_disponivel(PATH_GRAD):
             df_plot = (
-                df_grad[df_grad["area"] == area_sel]
+                idx.area(PATH_GRAD, id_area)
                 .sort_values("qtd", ascending=False)
             )
     
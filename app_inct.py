@@ -1,39 +1,248 @@
 # app_inct.py — Painel por INCT
+#
+# Só importa o que o painel desenha; bibliotecas pesadas usadas por um único
+# card (plotly.express, wordcloud/matplotlib, networkx no build) são
+# importadas dentro da seção ou da função que as usa — inclusive em mapa.py
+# e sankey.py, cujas figuras só importam plotly ao serem montadas.
 import streamlit as st
-import io, json
 import pandas as pd
 from pathlib import Path
-import plotly.express as px
-import networkx as nx
-from pyvis.network import Network
-import plotly.graph_objects as go
-
-import matplotlib.pyplot as plt
-#import matplotlib
-#matplotlib.use("Agg")   # garante renderização estática
-
-from wordcloud import WordCloud
-
-import plotly.io as pio
-pio.renderers.default = "browser"
+import dados
+import indices
+import kpis
+import mapa
+import nuvem
+import sankey
+import grafos
+import metricas
+import adjacencia
+import sobreposicao
+import similaridade
+import tendencias
 
 # ============================ FUNÇÕES AUXILIARES ============================
 
 def gap(px=24):
     st.markdown(f"<div style='height:{px}px'></div>", unsafe_allow_html=True)
 
-@st.cache_data(show_spinner=False)
-def load_csv(path: str) -> pd.DataFrame:
-    return pd.read_csv(path)
-
-@st.cache_data(show_spinner=False)
-def load_cached_html(html_path: str) -> str | None:
-    """Carrega HTML pré-gerado do grafo (PyVis) se existir."""
-    p = Path(html_path)
-    if p.exists():
-        return p.read_text(encoding="utf-8")
-    return None
-    
+# ====================== CARDS INTERATIVOS (st.fragment) ======================
+# Cada card com widget é um fragmento: mexer no widget reexecuta só o card,
+# sem redesenhar grafo, mapa, KPIs e os demais gráficos do painel.
+
+@st.fragment
+def _card_vizinhanca(inct_sel: str, adj, ids_pesq: dict):
+    with st.container(border=True):
+        st.markdown("#### Vizinhança de um pesquisador")
+
+        col_pesq, col_saltos = st.columns([3, 1], gap="medium")
+        with col_pesq:
+            pesquisador = st.selectbox(
+                "Pesquisador",
+                options=list(ids_pesq),
+                key=f"ego_pesquisador_{inct_sel}",
+            )
+        with col_saltos:
+            saltos = st.radio(
+                "Alcance",
+                options=[1, 2],
+                format_func=lambda s: "Coautores diretos" if s == 1 else "Até 2 saltos",
+                key=f"ego_saltos_{inct_sel}",
+            )
+
+        ego = adj.grafo_ego(ids_pesq[pesquisador], saltos)
+        st.caption(
+            f"{ego['vizinhos_diretos']} coautores diretos · {len(ego['nodes'])} pesquisadores e "
+            f"{len(ego['edges'])} coautorias na vizinhança"
+            + (f" (2º grau limitado aos {adjacencia.EGO_MAX_NOS} mais ligados)"
+               if len(ego["nodes"]) >= adjacencia.EGO_MAX_NOS else "")
+        )
+        st.components.v1.html(grafos.html_subgrafo(ego), height=510, scrolling=False)
+
+
+@st.fragment
+def _card_caminho(inct_sel: str, rede_global, ids_pesq: dict):
+    with st.container(border=True):
+        st.markdown("#### Como um pesquisador chega a outro")
+        st.caption(
+            f"Caminhos de coautoria na rede de todos os INCTs ({len(rede_global)} pesquisadores), "
+            "atravessando as fronteiras entre eles."
+        )
+
+        col_origem, col_busca, col_destino = st.columns(3, gap="medium")
+        with col_origem:
+            origem = st.selectbox("De", options=list(ids_pesq), key=f"caminho_origem_{inct_sel}")
+        with col_busca:
+            busca = st.text_input("Buscar destino pelo nome", key=f"caminho_busca_{inct_sel}")
+        with col_destino:
+            ids_destino = adjacencia.rotulos(rede_global.buscar(busca))
+            destino = st.selectbox(
+                "Para",
+                options=list(ids_destino),
+                index=None,
+                placeholder="Digite parte do nome ao lado" if not busca else "Escolha o pesquisador",
+                key=f"caminho_destino_{inct_sel}",
+            )
+
+        modo = st.radio(
+            "Critério",
+            options=["saltos", "forca"],
+            format_func=lambda m: "Menos intermediários" if m == "saltos" else "Laços mais fortes",
+            horizontal=True,
+            key=f"caminho_modo_{inct_sel}",
+        )
+
+        if destino:
+            caminho = rede_global.caminho(ids_pesq[origem], ids_destino[destino], ponderado=modo == "forca")
+            if caminho is None:
+                st.info("Não há caminho de coautoria entre esses pesquisadores nos INCTs mapeados.")
+            else:
+                st.caption(f"{len(caminho) - 1} saltos · {max(len(caminho) - 2, 0)} intermediários")
+                df_caminho = rede_global.tabela_caminho(caminho)[
+                    ["nome", "instituicao", "uf", "incts", "coautorias_com_anterior"]
+                ].rename(columns={
+                    "nome": "Pesquisador",
+                    "instituicao": "Instituição",
+                    "uf": "UF",
+                    "incts": "INCTs",
+                    "coautorias_com_anterior": "Coautorias com o anterior",
+                })
+                st.dataframe(df_caminho, width="stretch", hide_index=True)
+                st.components.v1.html(
+                    grafos.html_subgrafo(rede_global.grafo_caminho(caminho), altura=300),
+                    height=310,
+                    scrolling=False,
+                )
+
+
+@st.fragment
+def _card_relacionados(inct_sel: str, id_inct, catalogo: pd.DataFrame, sobrepos):
+    with st.container(border=True):
+        col_titulo, col_criterio = st.columns([3, 1], gap="medium")
+        with col_titulo:
+            st.markdown("#### INCTs relacionados")
+        with col_criterio:
+            criterio = st.radio(
+                "Em comum",
+                options=["pesquisadores", "instituicoes"],
+                format_func=lambda c: "Pesquisadores" if c == "pesquisadores" else "Instituições",
+                horizontal=True,
+                key=f"relacionados_criterio_{inct_sel}",
+            )
+
+        df_relacionados = sobrepos.relacionados(id_inct, n=10, por=criterio)
+        if df_relacionados.empty:
+            st.info(
+                "Nenhum outro INCT tem pesquisadores em comum com este nos grafos de coautoria."
+                if criterio == "pesquisadores"
+                else "Nenhum outro INCT tem instituições em comum com este na base de instituições."
+            )
+        else:
+            catalogo = catalogo.set_index("Identificador")
+            df_relacionados = df_relacionados.assign(
+                nome=lambda d: d["relacionado"].map(catalogo["nome_inct"]),
+                area_rel=lambda d: d["relacionado"].map(catalogo["area"]),
+            )[[
+                "nome", "area_rel", "pesquisadores_comuns", "instituicoes_comuns", f"jaccard_{criterio}",
+            ]].rename(columns={
+                "nome": "INCT",
+                "area_rel": "Área",
+                "pesquisadores_comuns": "Pesquisadores em comum",
+                "instituicoes_comuns": "Instituições em comum",
+                f"jaccard_{criterio}": "Jaccard",
+            })
+            st.dataframe(
+                df_relacionados,
+                width="stretch",
+                hide_index=True,
+                column_config={"Jaccard": st.column_config.NumberColumn(format="%.3f")},
+            )
+
+
+@st.fragment
+def _card_sankey(inct_sel: str, id_inct):
+    with st.container(border=True):
+        col_periodos, col_janela, col_k = st.columns([3, 1, 1], gap="medium")
+        with col_periodos:
+            # os períodos escolhidos formam as janelas; os fluxos ligam janelas consecutivas
+            periodos_sankey = st.multiselect(
+                "Períodos comparados",
+                options=sankey.periodos(),
+                default=sankey.periodos(),
+                key=f"periodos_sankey_{inct_sel}",
+            )
+        with col_janela:
+            # períodos consecutivos somados numa mesma janela (ex.: 2010-2020 × 2020-2025)
+            por_janela = 1
+            if len(sankey.periodos()) > 2:
+                por_janela = st.select_slider(
+                    "Períodos por janela",
+                    options=list(range(1, len(sankey.periodos()))),
+                    value=1,
+                    key=f"por_janela_sankey_{inct_sel}",
+                )
+        with col_k:
+            top_k = st.select_slider(
+                "Fluxos exibidos",
+                options=sankey.TOP_K_VALORES,
+                value=sankey.TOP_K_PADRAO,
+                format_func=lambda k: "Todos" if k == 0 else str(k),
+                key=f"topk_sankey_{inct_sel}",
+            )
+
+        # fluxos calculados pelo motor (memoizados por entidade/janelas/top-k) e desenhados nativamente
+        janelas = sankey.janelas_consecutivas(periodos_sankey, por_janela)
+        fig_sankey = sankey.get_figura("inct", id_inct, janelas, top_k)
+
+        if fig_sankey is not None:
+            st.plotly_chart(
+                fig_sankey,
+                config={
+                    "displayModeBar": True,
+                    "displaylogo": False,
+                    "responsive": True,
+                    "scrollZoom": False,
+                },
+            )
+        elif len(janelas) < 2:
+            st.info("Selecione períodos suficientes para ao menos duas janelas.")
+        else:
+            st.info("Nenhum gráfico Sankey disponível para este INCT.")
+
+
+@st.fragment
+def _card_nuvem(inct_sel: str, id_inct, wc_sel: pd.DataFrame):
+    with st.container(border=True):
+        st.markdown("#### Nuvem de Palavras")
+
+        if wc_sel.empty:
+            st.warning("Nenhuma palavra encontrada para este INCT.")
+        else:
+            # Mantém as palavras + remove conectivos isolados
+            # (freq já vem pronta na coluna `freq`)
+            freqs = nuvem.frequencias(wc_sel)
+
+            if not freqs:
+                st.warning("Nenhuma palavra disponível após filtragem.")
+            else:
+                top_n = st.slider(
+                    "Número de expressões exibidas",
+                    min_value=10,
+                    max_value=300,
+                    value=30,
+                    step=10,
+                    key=f"slider_wc_{inct_sel}",
+                )
+
+                freqs_top = nuvem.top_frequencias(freqs, top_n)
+
+                # === Wordcloud via cache (memória → disco → renderização) ===
+                png = nuvem.load_nuvem_cache().get_or_render(
+                    f"inct:{id_inct}", top_n, [], freqs_top
+                )
+
+                st.image(png, width="content")
+
+
 def run(inct_sel: str, df_filtrado: pd.DataFrame):
 
     # === CSS global (adicione uma vez no topo do app) ===
@@ -55,18 +264,16 @@ def run(inct_sel: str, df_filtrado: pd.DataFrame):
         
     # ======================== IO ============================    
     INST_PATH     = "bases/select_instituicoes_por_inct.csv"
-    PROD_BBL_PATH = "bases/big_number_qtd_producao_bibliografica_periodo.csv"
     MAIOR_FORMACAO_PATH = "bases/big_number_maior_formacao.csv"
     PALAVRAS_WORDCLOUD_PATH = "bases/wordcloud_inct_agg.csv"
     TEXTO_PATH = "bases/texto_descricao_inct.csv"
     
-    df_inst  = load_csv(INST_PATH)
-    prod_bbl = load_csv(PROD_BBL_PATH)
-    maior_formacoes = load_csv(MAIOR_FORMACAO_PATH)
-    palavras_wc_inct = load_csv(PALAVRAS_WORDCLOUD_PATH)
-    df_texto_inct = load_csv(TEXTO_PATH)
-
     info = df_filtrado.iloc[0]
+    id_inct = info["Identificador"]
+
+    # Fatias já indexadas por INCT (sem varrer as bases a cada rerun)
+    idx = indices.load_indices()
+    df_texto_inct = idx.inct(TEXTO_PATH, id_inct)
 
     # ======================== HELPERS KPI ===================
     def safe_int(x):
@@ -74,13 +281,6 @@ def run(inct_sel: str, df_filtrado: pd.DataFrame):
             return int(x)
         except Exception:
             return 0
-    
-    def get_val(df, tipo, periodo):
-        """Retorna n_tipos_producao para um tipo/periodo (ou 0)."""
-        if df is None or df.empty:
-            return 0
-        sub = df[(df["tipo_producao"] == tipo) & (df["periodo"] == periodo)]["n_tipos_producao"]
-        return safe_int(sub.iloc[0]) if not sub.empty else 0
 
     
     # ======================== INFOS INCT ===================
@@ -124,142 +324,63 @@ def run(inct_sel: str, df_filtrado: pd.DataFrame):
     # with right:
 
     path_gexf = info.get("path_gexf_html", "")
-    html_cached_path = f"gexf_html/{Path(path_gexf).stem}.html"
+    nome_grafo = Path(path_gexf).stem
 
-    html = load_cached_html(html_cached_path)
+    # dados do grafo (com layout pronto) servidos como arquivo estático com hash;
+    # pelo websocket só trafega o visualizador de poucos KB
+    entrada_grafo = grafos.entrada_grafo(nome_grafo)
 
-    if html:
+    if entrada_grafo:
         st.components.v1.html(
-            f"""
-            <iframe srcdoc='{html.replace("'", "&apos;")}'
-                    style="width:100%; height:950px; border:none; overflow:hidden;">
-            </iframe>
-            """,
-            height=960,
+            grafos.html_visualizador(entrada_grafo),
+            height=grafos.ALTURA + 10,
             scrolling=False
         )
     else:
-        st.info(f"📁 Grafo ainda não foi pré-gerado. Arquivo esperado: `{html_cached_path}`")
+        st.info("📁 Grafo não publicado (rodar `build_assets.py grafos`).")
+
+    # ====== VIZINHANÇA DE UM PESQUISADOR (ego-rede sobre o CSR em mmap) ======
+    adj = adjacencia.load_adjacencia(nome_grafo)
+    if adj is not None and len(adj):
+        # mais conectados primeiro
+        ids_pesq = adjacencia.rotulos(adj.nos.sort_values(["grau", "nome"], ascending=[False, True]))
+        _card_vizinhanca(inct_sel, adj, ids_pesq)
+
+        # ====== COMO X CHEGA A Y (caminho na rede global de todos os INCTs) ======
+        rede_global = adjacencia.load_adjacencia(adjacencia.GLOBAL)
+        if rede_global is not None:
+            _card_caminho(inct_sel, rede_global, ids_pesq)
+
+    # ====== ATORES CENTRAIS E COMUNIDADES (métricas pré-calculadas no build) ======
+    metricas.render_card(nome_grafo)
+
+    # ====== INCTs RELACIONADOS (sobreposição pré-calculada no build) ======
+    sobrepos = sobreposicao.load_sobreposicao()
+    if sobrepos is not None:
+        _card_relacionados(inct_sel, id_inct, idx.catalogo, sobrepos)
 
+    # ====== TEMÁTICA SEMELHANTE (TF-IDF das palavras-chave, vizinhos pré-calculados) ======
+    similaridade.render_card("inct", info["Identificador"])
 
     # ====== SANKEY (pré-gerado, centralizado e em card) ======
     # st.divider()
     st.subheader("Fluxo Sankey — Palavras-chave por Período")
 
-    
-    sankey_path = Path(f"sankey_inct_palavra_tratada/sankey_inct_{info['Identificador']}.html")
-    
-    with st.container(border=True):
-        if sankey_path.exists():
-            try:
-                # Lê o HTML do Sankey
-                html = open(sankey_path, encoding="utf-8").read()
-    
-                # Centraliza o gráfico com um container interno
-                sankey_html = f"""
-                <div style="
-                    width: 100%;
-                    overflow-x: auto;
-                    padding: 10px;
-                    background-color: #fff;
-                    text-align: center;
-                ">
-                    <div style="
-                        display: inline-block;
-                        min-width: 900px;
-                        width: max-content;    /* largura = largura real do gráfico */
-                    ">
-                        {html}
-                    </div>
-                </div>
-                """
-    
-                # Exibe dentro do card
-                st.components.v1.html(
-                    sankey_html,
-                    height=1000,  # altura padrão ajustada
-                    scrolling=False,  # rolagem interna automática
-                )
-            except Exception as e:
-                st.warning(f"⚠️ Erro ao carregar o gráfico Sankey: {e}")
-        else:
-            st.info("Nenhum gráfico Sankey disponível para este INCT.")
+    _card_sankey(inct_sel, id_inct)
+
+    # ====== PALAVRAS EMERGENTES | EM DECLÍNIO (tendências pré-calculadas no build) ======
+    tendencias.render_cards("inct", info["Identificador"])
 
     # ====================== CARDS: WORDCLOUD | MAIOR FORMAÇÃO ======================
     # ====================== CARDS: WORDCLOUD | MAIOR FORMAÇÃO ======================
-    import matplotlib
-    matplotlib.use("Agg")  # garante renderização estática
+    import plotly.express as px  # só carregado quando o painel chega aos gráficos de barras
     
     # ---------- CARD 1: WORDCLOUD ----------
     col_wc, col_form = st.columns(2, gap="medium")
     
     with col_wc:
-        with st.container(border=True):
-            st.markdown("#### Nuvem de Palavras")
-    
-            # ---------------------------------------------
-            # 🔹 FILTRO DIRETO NA BASE AGREGADA
-            # ---------------------------------------------
-            wc_sel = palavras_wc_inct[palavras_wc_inct["nome_inct"] == inct_sel]
-    
-            if wc_sel.empty:
-                st.warning("Nenhuma palavra encontrada para este INCT.")
-            else:
-                # Remove stopwords simples
-                STOPWORDS_ONEWORD = {
-                    "de","da","do","das","dos","em","no","na","nas","nos","para","por",
-                    "e","a","o","os","as","um","uma","com","ao","aos","se","que",
-                    "sobre","entre","ou","como"
-                }
-    
-                # Mantém as palavras + remove conectivos isolados
-                s = wc_sel["palavra"].astype(str)
-                mascara_um_termo = ~s.str.contains(r"\s")
-                palavras_validas = s[~(mascara_um_termo & s.isin(STOPWORDS_ONEWORD))]
-    
-                # Juntar novamente com df original para manter a coluna freq
-                wc_filtrado = wc_sel.loc[palavras_validas.index]
-    
-                # ---------------------------------------------
-                # 🔹 Freq já vem pronta (coluna `freq`)
-                # ---------------------------------------------
-                freqs = dict(
-                    zip(
-                        wc_filtrado["palavra"],
-                        wc_filtrado["freq"]
-                    )
-                )
-    
-                if not freqs:
-                    st.warning("Nenhuma palavra disponível após filtragem.")
-                else:
-    
-                    top_n = st.slider(
-                        "Número de expressões exibidas",
-                        min_value=10,
-                        max_value=300,
-                        value=30,
-                        step=10,
-                        key=f"slider_wc_{inct_sel}",
-                    )
-    
-                    # Ordena e pega o top_n
-                    freqs_top = dict(
-                        sorted(freqs.items(), key=lambda x: x[1], reverse=True)[:top_n]
-                    )
-    
-                    # === Gera a wordcloud diretamente das frequências ===
-                    wc = WordCloud(
-                        width=900,
-                        height=500,
-                        background_color="white",
-                        colormap="Blues",
-                        collocations=False,
-                    ).generate_from_frequencies(freqs_top)
-    
-                    img_array = wc.to_array()
-    
-                    st.image(img_array, width="content")
+        # filtro direto na base agregada; o slider reexecuta só o card
+        _card_nuvem(inct_sel, id_inct, idx.inct(PALAVRAS_WORDCLOUD_PATH, id_inct))
 
     # ---------- CARD 2: MAIOR FORMAÇÃO ----------
     with col_form:
@@ -267,7 +388,7 @@ def run(inct_sel: str, df_filtrado: pd.DataFrame):
             st.markdown(f"#### Maior Formação por INCT")
     
             df_plot = (
-                maior_formacoes[maior_formacoes["nome_inct"] == inct_sel]
+                idx.inct(MAIOR_FORMACAO_PATH, id_inct)
                 .sort_values("count", ascending=False)
             )
     
@@ -354,64 +475,23 @@ def run(inct_sel: str, df_filtrado: pd.DataFrame):
     st.divider()
     st.markdown("### Produção Bibliográfica por Período")
     
-    import unicodedata
-    
-    def normalize_text(text):
-        """Remove acentos, normaliza hífen e deixa em minúsculas."""
-        if pd.isna(text):
-            return ""
-        text = str(text).strip().lower()
-        text = unicodedata.normalize("NFKC", text)
-        text = text.replace("–", "-")  # troca hífen especial por simples
-        return text
-    
-    def get_val(df, tipo, periodo):
-        """Busca o valor de produção de forma robusta (tolerante a variações)."""
-        if df.empty:
-            return 0
-        tipo_norm = normalize_text(tipo)
-        periodo_norm = normalize_text(periodo)
-        df["tipo_norm"] = df["tipo_producao"].apply(normalize_text)
-        df["periodo_norm"] = df["periodo"].apply(normalize_text)
-        val = df.query("tipo_norm == @tipo_norm and periodo_norm == @periodo_norm")["n_tipos_producao"]
-        return int(val.iloc[0]) if not val.empty else 0
-    
-    
-    tipos = [
-        ("Artigos Publicados",               "Artigo Publicado"),
-        ("Trabalhos em Eventos",             "Trabalho Em Eventos"),
-        ("Capítulos de Livros",              "Capitulo De Livro Publicado"),
-        ("Livros Publicados/Organizados",    "Livro Publicado Ou Organizado"),
-        ("Textos em Jornais/Revistas",       "Texto Em Jornal Ou Revista"),
-        ("Outras Produções Bibliográficas",  "Outra Producao Bibliografica"),
-        ("Artigos Aceitos",                  "Artigo Aceito Para Publicacao"),
-        ("Prefácios/Pósfácios",              "Prefacio Posfacio"),
-        ("Traduções",                        "Traducao"),
-        ("Partituras Musicais",              "Partitura Musical"),
-    ]
-    
-    periodos = ["2010-2015", "2015-2020", "2020-2025"]
-    
-    df_prod_bbl = (
-        prod_bbl[prod_bbl["nome_inct"] == inct_sel].copy()
-        if "nome_inct" in prod_bbl.columns
-        else pd.DataFrame()
-    )
+    # Grade 10 tipos × 3 períodos do INCT, pré-computada uma vez por processo
+    grade = kpis.load_kpis().inct.grade(id_inct)
     
     # === Layout responsivo: 2 linhas (5 métricas cada) ===
-    for periodo in periodos:
+    for j, periodo in enumerate(kpis.PERIODOS):
         st.markdown(f"### {periodo}")
         
     
         # Divide os 10 tipos em 2 linhas de 5
-        for linha in range(0, len(tipos), 5):
-            subset = tipos[linha:linha+5]
+        for linha in range(0, len(kpis.TIPOS), 5):
+            subset = kpis.TIPOS[linha:linha+5]
     
             with st.container(horizontal=True, gap="medium"):
                 cols = st.columns(len(subset), gap="medium")
     
                 for i, (titulo, tipo) in enumerate(subset):
-                    val = get_val(df_prod_bbl, tipo, periodo)
+                    val = int(grade[linha + i, j])
     
                     with cols[i]:
                         st.metric(
@@ -434,49 +514,11 @@ def run(inct_sel: str, df_filtrado: pd.DataFrame):
             st.markdown("#### Distribuição do Endereço Profissional por UF")
             
     
-            info_instituicao = df_inst[df_inst["nome_inct"] == inct_sel].copy()
-            ufs = [
-                "AC","AL","AM","AP","BA","CE","DF","ES","GO","MA","MG","MS","MT",
-                "PA","PB","PE","PI","PR","RJ","RN","RO","RR","RS","SC","SE","SP","TO"
-            ]
-            uf_base = pd.DataFrame({"uf": ufs})
+            info_instituicao = idx.inct(INST_PATH, id_inct)
+            uf_counts = mapa.contagem_uf(info_instituicao)
     
-            if not info_instituicao.empty:
-                uf_counts = (
-                    info_instituicao.groupby("uf")["nome_instituicao_empresa"]
-                    .count()
-                    .reset_index(name="qtd")
-                )
-            else:
-                uf_counts = pd.DataFrame(columns=["uf", "qtd"])
-    
-            uf_counts = uf_base.merge(uf_counts, on="uf", how="left").fillna(0)
-    
-            geojson_url = "https://raw.githubusercontent.com/codeforamerica/click_that_hood/master/public/data/brazil-states.geojson"
-    
-            fig_mapa = px.choropleth(
-                uf_counts,
-                geojson=geojson_url,
-                locations="uf",
-                featureidkey="properties.sigla",
-                color="qtd",
-                hover_name="uf",
-                hover_data={"qtd": True},
-                color_continuous_scale="Blues",
-                range_color=(0, int(uf_counts["qtd"].max()) if len(uf_counts) else 0),
-                #title="Distribuição do Endereço Profissional por UF",
-                labels={
-                        "uf": "UF",
-                        "qtd": "Quantidade de Instituições/Empresas"
-                    },
-            )
-            fig_mapa.update_geos(fitbounds="locations", visible=False, scope="south america")
-            fig_mapa.update_layout(
-                height=500,
-                margin=dict(l=0, r=0, t=40, b=0),
-                coloraxis_colorbar=dict(title="Instituições"),
-                dragmode=False,
-            )
+            # Figura base (GeoJSON local simplificado) montada uma vez; só `qtd` muda
+            fig_mapa = mapa.figura_uf(uf_counts)
     
             # ✅ NENHUM argumento solto — tudo via config
             st.plotly_chart(
@@ -549,10 +591,9 @@ def run(inct_sel: str, df_filtrado: pd.DataFrame):
         st.markdown("#### Distribuição das Formações Mais Altas")
         path_grad = "bases/grafico_maior_graduacao_inct.csv"
     
-        if Path(path_grad).exists():
-            df_grad = pd.read_csv(path_grad)
+        if dados.base_disponivel(path_grad):
             df_plot = (
-                df_grad[df_grad["nome_inct"] == inct_sel]
+                idx.inct(path_grad, id_inct)
                 .sort_values("qtd", ascending=False)
             )
     
@@ -0,0 +1,60 @@
+# bench_carga_bases.py — Tempo de carga e RSS: pd.read_csv vs snapshot Arrow memory-mapped
+#
+# Uso (na raiz do projeto, após `python build_assets.py snapshot`):
+#   python benchmarks/bench_carga_bases.py
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# Cada modo roda num processo novo para medir o custo de cold start real
+SCRIPT = """
+import sys, time, psutil
+sys.path.insert(0, {raiz!r})
+from pathlib import Path
+import pandas as pd
+import dados
+
+proc = psutil.Process()
+csvs = sorted(Path("bases").glob("*.csv"))
+rss0 = proc.memory_info().rss
+t0 = time.perf_counter()
+if {modo!r} == "csv":
+    frames = [pd.read_csv(p) for p in csvs]
+else:
+    frames = [dados.load_base(str(p)) for p in csvs]
+dt = time.perf_counter() - t0
+rss = proc.memory_info().rss - rss0
+print(f"{{dt*1000:.1f}} {{rss/2**20:.1f}} {{sum(len(f) for f in frames)}}")
+"""
+
+
+def medir(modo: str, repeticoes: int):
+    tempos, rss = [], []
+    for _ in range(repeticoes):
+        out = subprocess.run(
+            [sys.executable, "-c", SCRIPT.format(raiz=str(RAIZ), modo=modo)],
+            cwd=RAIZ, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        tempos.append(float(out[0]))
+        rss.append(float(out[1]))
+        linhas = int(out[2])
+    tempos.sort()
+    return tempos[len(tempos) // 2], max(rss), linhas
+
+
+def main():
+    import dados
+    if not dados.load_manifest(RAIZ / dados.SNAPSHOT_DIR):
+        sys.exit("Snapshot não encontrado. Rode `python build_assets.py snapshot` antes.")
+
+    print(f"{'modo':<10}{'tempo (ms)':>12}{'ΔRSS (MiB)':>12}{'linhas':>10}")
+    for modo in ("csv", "snapshot"):
+        t, r, n = medir(modo, repeticoes=5)
+        print(f"{modo:<10}{t:>12.1f}{r:>12.1f}{n:>10}")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(RAIZ))
+    main()
@@ -0,0 +1,75 @@
+# bench_cold_start.py — Cold start por estágio: tempo da 1ª execução, módulos importados e RSS
+#
+# Uso (na raiz do projeto, após os passos de build_assets.py):
+#   python benchmarks/bench_cold_start.py [--inct NOME] [--area NOME] [--repeticoes N]
+#
+# Cada estágio (home, login, painel de INCT, painel de Área) roda main_app.py
+# uma vez num processo novo, já com o Streamlit importado: o tempo medido é o
+# da primeira execução do script (imports do app + carga dos dados), e a lista
+# mostra quais bibliotecas pesadas ficaram carregadas.
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+PESADAS = ["pandas", "pyarrow", "numpy", "plotly.express", "scipy", "networkx", "matplotlib", "wordcloud", "pyvis"]
+
+SCRIPT = """
+import sys, time, psutil
+sys.path.insert(0, {raiz!r})
+from streamlit.testing.v1 import AppTest
+
+proc = psutil.Process()
+at = AppTest.from_file("main_app.py", default_timeout=300)
+if {estagio!r} != "home":
+    at.session_state["stage"] = "login" if {estagio!r} == "login" else "app"
+    at.session_state["logged_in"] = {estagio!r} != "login"
+if {estagio!r} in ("inct", "area"):
+    at.session_state["tipo_painel"] = "INCT" if {estagio!r} == "inct" else "Área"
+
+modulos0 = set(sys.modules)
+rss0 = proc.memory_info().rss
+t0 = time.perf_counter()
+at.run()
+if {estagio!r} in ("inct", "area"):
+    at.selectbox[0].set_value({nome!r}).run()
+dt = time.perf_counter() - t0
+if at.exception:
+    sys.exit(at.exception[0].message)
+novos = set(sys.modules) - modulos0
+pesadas = [b for b in {pesadas!r} if any(m == b or m.startswith(b + '.') for m in novos)]
+print(f"{{dt*1000:.0f}} {{(proc.memory_info().rss - rss0)/2**20:.1f}} {{proc.memory_info().rss/2**20:.1f}} {{len(novos)}} {{','.join(pesadas) or '-'}}")
+"""
+
+
+def medir(estagio: str, nome: str, repeticoes: int) -> tuple:
+    rodadas = []
+    for _ in range(repeticoes):
+        out = subprocess.run(
+            [sys.executable, "-c", SCRIPT.format(raiz=str(RAIZ), estagio=estagio, nome=nome, pesadas=PESADAS)],
+            cwd=RAIZ, capture_output=True, text=True,
+        )
+        if out.returncode:
+            sys.exit(f"{estagio}: {out.stderr.strip().splitlines()[-1]}")
+        rodadas.append(out.stdout.split())
+    rodadas.sort(key=lambda r: float(r[0]))
+    return rodadas[len(rodadas) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start por estágio do painel")
+    parser.add_argument("--inct", default="INCT Brasil Plural")
+    parser.add_argument("--area", default="Saúde")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'estágio':<8}{'1ª execução (ms)':>18}{'ΔRSS (MiB)':>12}{'RSS (MiB)':>11}{'módulos':>9}  bibliotecas pesadas")
+    for estagio, nome in (("home", ""), ("login", ""), ("inct", args.inct), ("area", args.area)):
+        t, drss, rss, n, pesadas = medir(estagio, nome, args.repeticoes)
+        print(f"{estagio:<8}{t:>18}{drss:>12}{rss:>11}{n:>9}  {pesadas.replace(',', ', ')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# bench_consultas_polars.py — Rollups do painel de Área: pandas (código anterior) × backend Polars
+#
+# Uso (na raiz do projeto, após os passos de build_assets.py):
+#   python benchmarks/bench_consultas_polars.py [--fatores 1 10 100] [--repeticoes 5]
+#
+# As bases de palavras por Área e de maior formação são replicadas `fator`
+# vezes (palavras com sufixo por réplica, para o vocabulário crescer junto).
+# Para cada Área e seleção de períodos (todos, o último, os dois últimos),
+# mede a consulta do painel: "pandas" é o código anterior sobre a fatia
+# indexada (isin + groupby + sort + head); "polars" é consultas.ConsultasArea.
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def escalar(df, fator: int, coluna: str | None = None):
+    """`df` repetida `fator` vezes; com `coluna`, cada réplica ganha um sufixo nela."""
+    import pandas as pd
+
+    replicas = []
+    for k in range(fator):
+        rep = df
+        if coluna and k:
+            rep = df.assign(**{coluna: df[coluna].astype(str) + f"~{k}"})
+        replicas.append(rep)
+    return pd.concat(replicas, ignore_index=True)
+
+
+def cronometrar(fn, casos: list, repeticoes: int) -> float:
+    """Mediana (ms) do tempo de uma chamada, sobre todos os casos."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for caso in casos:
+            fn(*caso)
+        tempos.append((time.perf_counter() - inicio) / len(casos))
+    return statistics.median(tempos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rollups por Área: pandas × Polars")
+    parser.add_argument("--fatores", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+    import consultas
+    import indices
+    import nuvem
+
+    idx = indices.load_indices()
+    palavras = idx.base(nuvem.WC_AREA_PATH)
+    formacao = idx.base(consultas.MAIOR_FORMACAO_PATH)
+    if palavras.empty or formacao.empty:
+        sys.exit("Bases de palavras por Área / maior formação não encontradas.")
+
+    areas = list(idx.dim_area["identificador_area"])
+    periodos = sorted(palavras["periodo"].unique())
+    selecoes = [[], periodos[-1:], periodos[-2:]]
+
+    print(f"{'fator':>6}{'linhas':>10}  {'consulta':<16}{'pandas (ms)':>13}{'polars (ms)':>13}{'razão':>8}")
+    for fator in args.fatores:
+        wc = escalar(palavras, fator, "palavra")
+        mf = escalar(formacao, fator)
+        wc_idx = indices.BaseIndexada(wc, wc["id_area"])
+        mf_idx = indices.BaseIndexada(mf, mf["id_area"])
+        id_area = dict(zip(idx.dim_area["identificador_area"], idx.dim_area["id_area"]))
+        backend = consultas.ConsultasArea(wc, mf, idx.dim_area)
+
+        def palavras_pandas(area, sel):
+            df = wc_idx.get(id_area[area])
+            if sel:
+                df = df[df["periodo"].isin(sel)]
+            return df.groupby("palavra")["freq"].sum().sort_values(ascending=False).head(100)
+
+        def formacao_pandas(area):
+            return (
+                mf_idx.get(id_area[area])
+                .groupby(["id_area", "area_de_maior_formacao"], as_index=False)["count"]
+                .sum()
+                .sort_values("count", ascending=False)
+            )
+
+        medidas = [
+            ("top palavras", palavras_pandas, backend.top_palavras, [(a, s) for a in areas for s in selecoes], len(wc)),
+            ("maior formação", formacao_pandas, backend.maior_formacao, [(a,) for a in areas], len(mf)),
+        ]
+        for nome, fn_pandas, fn_polars, casos, linhas in medidas:
+            t_pd = cronometrar(fn_pandas, casos, args.repeticoes)
+            t_pl = cronometrar(fn_polars, casos, args.repeticoes)
+            print(f"{fator:>6}{linhas:>10}  {nome:<16}{t_pd:>13.2f}{t_pl:>13.2f}{t_pd / t_pl:>7.1f}×")
+
+
+if __name__ == "__main__":
+    os.chdir(RAIZ)  # o app lê bases/ e os artefatos por caminho relativo
+    sys.path.insert(0, str(RAIZ))
+    main()
@@ -0,0 +1,80 @@
+# bench_memoria_sessoes.py — Memória por sessão: cópias por chamada (st.cache_data) × camada compartilhada
+#
+# Uso (na raiz do projeto, após `python build_assets.py snapshot`):
+#   python benchmarks/bench_memoria_sessoes.py [--sessoes 50]
+#
+# Simula N sessões renderizando ao mesmo tempo (uma por INCT, em rodízio): cada
+# uma obtém as bases do painel e as mantém vivas, como durante o render.
+# "copia" reproduz o acesso antigo — `load_csv` com st.cache_data, que devolve
+# um DataFrame despicklado a cada chamada, filtrado por INCT no painel;
+# "compartilhada" usa o índice do processo (st.cache_resource), que entrega
+# fatias sem cópia dos mesmos buffers. Cada modo roda num processo novo.
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+SCRIPT = """
+import gc, logging, sys, time, psutil
+sys.path.insert(0, {raiz!r})
+logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+import streamlit as st
+import dados, indices
+
+idx = indices.load_indices()
+nomes = list(idx.catalogo["nome_inct"].drop_duplicates())
+paths = [p for p in indices.BASES_INCT if dados.base_disponivel(p)]
+
+@st.cache_data(show_spinner=False)
+def load_csv(path):
+    return dados.load_base(path)
+
+def sessao_copia(nome):
+    bases = [load_csv(p) for p in [indices.CATALOGO_PATH, *paths]]
+    return bases + [df[df["nome_inct"] == nome] for df in bases]
+
+def sessao_compartilhada(nome):
+    id_inct = idx.id_por_nome[nome]
+    return [idx.catalogo, idx.catalogo_inct(nome)] + [idx.inct(p, id_inct) for p in paths]
+
+sessao = sessao_{modo}
+sessao(nomes[0])  # aquece o cache do modo (1ª leitura/pickle)
+gc.collect()
+proc = psutil.Process()
+rss0 = proc.memory_info().rss
+vivas = []
+t0 = time.perf_counter()
+for i in range({sessoes}):
+    vivas.append(sessao(nomes[i % len(nomes)]))
+dt = time.perf_counter() - t0
+gc.collect()
+rss = proc.memory_info().rss
+print(f"{{dt / {sessoes} * 1000:.2f}} {{rss0 / 2**20:.1f}} {{rss / 2**20:.1f}} {{(rss - rss0) / 2**20 / {sessoes}:.3f}}")
+"""
+
+
+def medir(modo: str, sessoes: int) -> list:
+    out = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(raiz=str(RAIZ), modo=modo, sessoes=sessoes)],
+        cwd=RAIZ, capture_output=True, text=True,
+    )
+    if out.returncode:
+        sys.exit(f"{modo}: {out.stderr.strip().splitlines()[-1]}")
+    return out.stdout.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória por sessão simulada")
+    parser.add_argument("--sessoes", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'modo':<14}{'ms/sessão':>11}{'RSS base (MiB)':>16}{f'RSS {args.sessoes} sessões':>18}{'MiB/sessão':>12}")
+    for modo in ("copia", "compartilhada"):
+        ms, rss0, rss, por_sessao = medir(modo, args.sessoes)
+        print(f"{modo:<14}{ms:>11}{rss0:>16}{rss:>18}{por_sessao:>12}")
+
+
+if __name__ == "__main__":
+    main()
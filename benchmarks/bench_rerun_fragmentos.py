@@ -0,0 +1,126 @@
+# bench_rerun_fragmentos.py — Latência de rerun por interação: página inteira vs só o fragmento do card
+#
+# Uso (na raiz do projeto, após os passos de build_assets.py):
+#   python benchmarks/bench_rerun_fragmentos.py [--inct NOME] [--area NOME] [--repeticoes N]
+#
+# "página" reexecuta main_app.py inteiro após mudar o widget (o que toda
+# interação custava antes dos fragmentos); "fragmento" executa só a função
+# do card (o que o Streamlit reexecuta agora). Além do tempo, conta os
+# elementos gerados, que é o que vai pelo websocket para o navegador.
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+PREAMBULO = """
+import sys
+sys.path.insert(0, {raiz!r})
+import adjacencia, indices, sobreposicao
+import app_inct, app_area
+from pathlib import Path
+idx = indices.load_indices()
+cat = idx.catalogo
+"""
+
+# (painel, widget, valores alternados, chamada do fragmento)
+INTERACOES = [
+    ("INCT", "slider_wc_{nome}", [60, 30],
+     "inct = cat[cat['nome_inct'] == {nome!r}].iloc[0]\n"
+     "app_inct._card_nuvem({nome!r}, inct['Identificador'], idx.inct(nuvem_path, inct['Identificador']))"),
+    ("INCT", "topk_sankey_{nome}", [40, 80],
+     "inct = cat[cat['nome_inct'] == {nome!r}].iloc[0]\n"
+     "app_inct._card_sankey({nome!r}, inct['Identificador'])"),
+    ("INCT", "relacionados_criterio_{nome}", ["instituicoes", "pesquisadores"],
+     "inct = cat[cat['nome_inct'] == {nome!r}].iloc[0]\n"
+     "app_inct._card_relacionados({nome!r}, inct['Identificador'], cat, sobreposicao.load_sobreposicao())"),
+    ("INCT", "ego_saltos_{nome}", [2, 1],
+     "inct = cat[cat['nome_inct'] == {nome!r}].iloc[0]\n"
+     "adj = adjacencia.load_adjacencia(Path(inct['path_gexf_html']).stem)\n"
+     "ids = adjacencia.rotulos(adj.nos.sort_values(['grau', 'nome'], ascending=[False, True]))\n"
+     "app_inct._card_vizinhanca({nome!r}, adj, ids)"),
+    ("Área", "slider_wc_{nome}", [60, 30],
+     "area = cat[cat['area'] == {nome!r}].iloc[0]['identificador_area']\n"
+     "app_area._card_nuvem({nome!r}, area, idx.area(nuvem_area_path, area), [])"),
+    ("Área", "topk_sankey_{nome}", [40, 80],
+     "area = cat[cat['area'] == {nome!r}].iloc[0]['identificador_area']\n"
+     "app_area._card_sankey({nome!r}, area)"),
+]
+
+
+def elementos(no):
+    """Percorre a árvore de elementos do AppTest (blocos e folhas)."""
+    filhos = getattr(no, "children", None)
+    if not filhos:
+        yield no
+        return
+    for filho in filhos.values():
+        yield from elementos(filho)
+
+
+def widget(at, chave: str):
+    return next((e for e in elementos(at._tree) if getattr(e, "key", None) == chave), None)
+
+
+def medir(at, chave: str, valores: list, repeticoes: int) -> tuple:
+    """(mediana em ms, nº de elementos) do rerun que segue cada mudança do widget."""
+    tempos = []
+    for i in range(repeticoes + 1):
+        widget(at, chave).set_value(valores[i % len(valores)])
+        inicio = time.perf_counter()
+        at.run()
+        if i:  # a primeira rodada aquece os caches de figura/nuvem
+            tempos.append(time.perf_counter() - inicio)
+        if at.exception:
+            sys.exit(f"Erro ao executar {chave}: {at.exception[0].message}")
+    return statistics.median(tempos) * 1000, sum(1 for _ in elementos(at._tree))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--inct", default="INCT Brasil Plural")
+    parser.add_argument("--area", default="Saúde")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    import nuvem
+    from streamlit.testing.v1 import AppTest
+
+    pagina = {}
+    for tipo, nome in (("INCT", args.inct), ("Área", args.area)):
+        at = AppTest.from_file(str(RAIZ / "main_app.py"), default_timeout=300)
+        at.session_state["stage"] = "app"
+        at.session_state["logged_in"] = True
+        at.run()
+        at.radio(key="tipo_painel").set_value(tipo).run()
+        at.selectbox[0].set_value(nome).run()
+        pagina[tipo] = (at, nome)
+
+    print(f"{'painel':<8}{'widget':<24}{'página (ms)':>13}{'elem.':>7}{'fragmento (ms)':>16}{'elem.':>7}")
+    for tipo, modelo, valores, chamada in INTERACOES:
+        at, nome = pagina[tipo]
+        chave = modelo.format(nome=nome)
+        rotulo = modelo.split("_{")[0]
+        if widget(at, chave) is None:
+            print(f"{tipo:<8}{rotulo:<24}{'(card ausente nesta base)':>43}")
+            continue
+        t_pag, n_pag = medir(at, chave, valores, args.repeticoes)
+
+        script = PREAMBULO.format(raiz=str(RAIZ)) + (
+            f"nuvem_path = {nuvem.WC_INCT_PATH!r}\nnuvem_area_path = {nuvem.WC_AREA_PATH!r}\n"
+            + chamada.format(nome=nome)
+        )
+        frag = AppTest.from_string(script, default_timeout=300)
+        frag.run()
+        t_frag, n_frag = medir(frag, chave, valores, args.repeticoes)
+
+        print(f"{tipo:<8}{rotulo:<24}{t_pag:>13.1f}{n_pag:>7}{t_frag:>16.1f}{n_frag:>7}")
+
+
+if __name__ == "__main__":
+    os.chdir(RAIZ)  # o app lê bases/ e os artefatos por caminho relativo
+    sys.path.insert(0, str(RAIZ))
+    main()
@@ -0,0 +1,221 @@
+# build_assets.py — Etapas de build dos artefatos do painel (rodar antes de subir o app)
+#
+# Uso:
+#   python build_assets.py snapshot
+#   python build_assets.py nuvens [--workers N] [--limpar]
+#   python build_assets.py geojson --fonte arquivo
+#   python build_assets.py sankey-html
+#   python build_assets.py sankey [--workers N] [--top-k K]
+#   python build_assets.py tendencias
+#   python build_assets.py grafos-area [--workers N] [--forcar]
+#   python build_assets.py grafos [--workers N] [--limpar]
+#   python build_assets.py metricas [--workers N]
+#   python build_assets.py csr [--workers N]
+#   python build_assets.py sobreposicao
+#   python build_assets.py similaridade [--top-k K]
+import argparse
+
+import pyarrow.parquet as pq
+
+import adjacencia
+import dados
+import grafos
+import grafos_area
+import indices
+import mapa
+import metricas
+import nuvem
+import sankey
+import similaridade
+import sobreposicao
+import tendencias
+
+
+def cmd_snapshot(args):
+    manifest = dados.build_snapshot(args.bases, args.out)
+    for nome, entrada in manifest["bases"].items():
+        print(f"  {nome:<55} {entrada['linhas']:>7} linhas")
+    print(f"Snapshot gerado em {args.out} ({len(manifest['bases'])} bases).")
+
+
+def cmd_nuvens(args):
+    cache = nuvem.NuvemCache(cache_dir=args.out)
+    stats = nuvem.prerender(indices.build_indices(), cache, workers=args.workers, limpar=args.limpar)
+    print(
+        f"{stats['variantes']} variantes ({stats['imagens_unicas']} imagens distintas): "
+        f"{stats['renderizadas']} renderizadas, {stats['removidas']} órfãs removidas."
+    )
+
+
+def cmd_geojson(args):
+    manifest = mapa.build_geojson(args.fonte)
+    for nivel, entrada in manifest["niveis"].items():
+        print(f"  {nivel:<6} tol={entrada['tolerancia']:<6} {entrada['vertices']:>7} vértices  {entrada['bytes'] / 1024:>8.1f} KiB")
+    print(f"GeoJSON das UFs gravado em {mapa.GEO_DIR}/.")
+
+
+def cmd_sankey_html(args):
+    n = sankey.build_palavras_periodo(out=args.out)
+    print(f"{n} pares palavra/período extraídos para {args.out}.")
+
+
+def cmd_sankey(args):
+    motor = sankey.build_motor(args.palavras)
+    if motor is None:
+        raise SystemExit(f"Agregado {args.palavras} não encontrado (ver `sankey-html`).")
+    n = sankey.gerar_todos(motor, top_k=args.top_k, workers=args.workers, out=args.out)
+    print(f"{n} Sankeys gerados em {args.out} (top-{args.top_k or 'todos'} fluxos).")
+
+
+def cmd_tendencias(args):
+    stats = tendencias.build_tendencias(args.palavras, out=args.out)
+    print(
+        f"Tendências de {stats['pares']} pares palavra/entidade ({stats['entidades']} INCTs/Áreas) "
+        f"em {args.out} ({stats['segundos']:.2f}s)."
+    )
+
+
+def cmd_grafos_area(args):
+    stats = grafos_area.build_grafos_area(
+        indices.build_indices().catalogo, workers=args.workers, forcar=args.forcar
+    )
+    for area, g in stats["areas_geradas"].items():
+        print(f"  {area:<12} {g['incts']:>3} INCTs {g['nos']:>6} nós {g['arestas']:>7} arestas")
+    print(
+        f"{len(stats['areas_geradas'])} grafos de Área regravados, {stats['incts_relidos']} INCTs relidos "
+        f"({stats['segundos']:.2f}s)."
+    )
+    if stats["areas_removidas"]:
+        print(f"Áreas sem INCTs (GEXF removido): {', '.join(stats['areas_removidas'])}")
+
+
+def cmd_grafos(args):
+    stats = grafos.build_grafos(
+        grafos.fontes_catalogo(indices.build_indices().catalogo), workers=args.workers, limpar=args.limpar
+    )
+    manifest = grafos.read_manifest()
+    for nome, entrada in manifest["grafos"].items():
+        print(f"  {nome:<40} {entrada['nos']:>6} nós {entrada['arestas']:>7} arestas  {entrada['segundos']:>6.2f}s  ← {entrada['origem']}")
+    print(
+        f"{stats['grafos']} grafos publicados em {grafos.MANIFEST_PATH.parent}/ "
+        f"({stats['publicados']} reconstruídos, {stats['removidos']} versões antigas removidas)."
+    )
+    if stats["ausentes"]:
+        print(f"Sem GEXF nem HTML legado: {', '.join(stats['ausentes'])}")
+
+
+def cmd_metricas(args):
+    stats = metricas.build_metricas(
+        grafos.fontes_catalogo(indices.build_indices().catalogo), workers=args.workers
+    )
+    resumos = pq.read_table(metricas.GRAFOS_PATH).to_pylist()
+    for r in resumos:
+        print(
+            f"  {r['grafo']:<40} {r['nos']:>6} nós {r['comunidades']:>4} comunidades  "
+            f"Q={r['modularidade']:.2f}  {r['segundos']:>6.2f}s{'  (intermediação amostrada)' if r['betweenness_amostrado'] else ''}"
+        )
+    print(f"Métricas de {stats['grafos']} grafos em {metricas.METRICAS_DIR}/ ({stats['calculados']} recalculados).")
+
+
+def cmd_csr(args):
+    stats = adjacencia.build_csr(
+        grafos.fontes_catalogo(indices.build_indices().catalogo), workers=args.workers
+    )
+    print(
+        f"CSR de {stats['grafos']} grafos em {adjacencia.CSR_DIR}/ "
+        f"({stats['exportados']} exportados, {stats['grafos'] - stats['exportados']} sem mudança)."
+    )
+    if not grafos_area.MANIFEST_PATH.exists():
+        print("Rede global não gerada: rode `grafos-area` antes.")
+        return
+    g = adjacencia.build_global(indices.build_indices().catalogo)
+    print(
+        f"Rede global de {g['incts']} INCTs: {g['nos']} pesquisadores, {g['arestas']} pares de coautores "
+        f"({'exportada' if g['exportado'] else 'sem mudança'})."
+    )
+
+
+def cmd_sobreposicao(args):
+    stats = sobreposicao.build_sobreposicao(indices.build_indices(), out=args.out)
+    print(
+        f"Sobreposição entre {stats['incts']} INCTs em {args.out}: {stats['pares']} pares "
+        f"({stats['pares_pesquisadores']} com pesquisadores e {stats['pares_instituicoes']} com instituições em comum)."
+    )
+
+
+def cmd_similaridade(args):
+    stats = similaridade.build_similaridade(indices.build_indices(), out=args.out, k=args.top_k)
+    print(
+        f"Vizinhos temáticos de {stats['entidades']} INCTs/Áreas em {args.out}: "
+        f"{stats['pares']} pares ({stats['segundos']:.2f}s)."
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build dos artefatos do Painel CGEE INCT")
+    sub = parser.add_subparsers(dest="etapa", required=True)
+
+    p = sub.add_parser("snapshot", help="Compila bases/*.csv em snapshot Arrow + manifest")
+    p.add_argument("--bases", default=str(dados.BASES_DIR))
+    p.add_argument("--out", default=str(dados.SNAPSHOT_DIR))
+    p.set_defaults(func=cmd_snapshot)
+
+    p = sub.add_parser("nuvens", help="Pré-renderiza todas as nuvens de palavras (INCT e Área)")
+    p.add_argument("--out", default=str(nuvem.CACHE_DIR))
+    p.add_argument("--workers", type=int, default=None, help="Processos (padrão: nº de CPUs)")
+    p.add_argument("--limpar", action="store_true", help="Remove imagens que não correspondem a nenhuma variante")
+    p.set_defaults(func=cmd_nuvens)
+
+    p = sub.add_parser("geojson", help="Gera o GeoJSON local das UFs em vários níveis de simplificação")
+    p.add_argument("--fonte", required=True, help=f"Arquivo GeoJSON de origem (baixado de {mapa.GEOJSON_ORIGEM})")
+    p.set_defaults(func=cmd_geojson)
+
+    p = sub.add_parser("sankey-html", help="Extrai dos HTMLs Plotly de Sankey legados o agregado palavra × período")
+    p.add_argument("--out", default=str(sankey.PALAVRAS_PATH))
+    p.set_defaults(func=cmd_sankey_html)
+
+    p = sub.add_parser("sankey", help="Recalcula em paralelo o Sankey padrão de todos os INCTs e Áreas")
+    p.add_argument("--palavras", default=str(sankey.PALAVRAS_PATH))
+    p.add_argument("--out", default=str(sankey.SANKEY_PATH))
+    p.add_argument("--top-k", type=int, default=sankey.TOP_K_PADRAO, help="Fluxos mantidos por Sankey (0 = todos)")
+    p.add_argument("--workers", type=int, default=None, help="Processos (padrão: nº de CPUs)")
+    p.set_defaults(func=cmd_sankey)
+
+    p = sub.add_parser("tendencias", help="Palavras emergentes e em declínio de todos os INCTs e Áreas")
+    p.add_argument("--palavras", default=str(sankey.PALAVRAS_PATH))
+    p.add_argument("--out", default=str(tendencias.TENDENCIAS_PATH))
+    p.set_defaults(func=cmd_tendencias)
+
+    p = sub.add_parser("grafos-area", help="Une os grafos dos INCTs no GEXF de cada Área (só as Áreas com INCT alterado)")
+    p.add_argument("--workers", type=int, default=None, help="Processos (padrão: nº de CPUs)")
+    p.add_argument("--forcar", action="store_true", help="Relê todos os INCTs e regrava todas as Áreas")
+    p.set_defaults(func=cmd_grafos_area)
+
+    p = sub.add_parser("grafos", help="Publica os grafos (GEXF do catálogo ou HTML legado) em static/, em paralelo")
+    p.add_argument("--workers", type=int, default=None, help="Processos (padrão: nº de CPUs)")
+    p.add_argument("--limpar", action="store_true", help="Remove versões que não estão mais no manifest")
+    p.set_defaults(func=cmd_grafos)
+
+    p = sub.add_parser("metricas", help="Calcula centralidade e comunidades de todos os grafos, em paralelo")
+    p.add_argument("--workers", type=int, default=None, help="Processos (padrão: nº de CPUs)")
+    p.set_defaults(func=cmd_metricas)
+
+    p = sub.add_parser("csr", help="Exporta em CSR (.npy) a adjacência de todos os grafos e a rede global dos INCTs")
+    p.add_argument("--workers", type=int, default=None, help="Processos (padrão: nº de CPUs)")
+    p.set_defaults(func=cmd_csr)
+
+    p = sub.add_parser("sobreposicao", help="Pesquisadores e instituições em comum entre todos os pares de INCTs")
+    p.add_argument("--out", default=str(sobreposicao.SOBREPOSICAO_PATH))
+    p.set_defaults(func=cmd_sobreposicao)
+
+    p = sub.add_parser("similaridade", help="TF-IDF das palavras-chave e INCTs/Áreas de temática semelhante")
+    p.add_argument("--out", default=str(similaridade.SIMILARIDADE_PATH))
+    p.add_argument("--top-k", type=int, default=similaridade.TOP_K, help="Vizinhos gravados por entidade")
+    p.set_defaults(func=cmd_similaridade)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# busca.py — Busca "quais INCTs trabalham com X": índice invertido de palavras-chave e descrições
+#
+# Termos vêm do nome do INCT (catálogo, peso PESO_TITULO), das palavras-chave
+# (wordcloud_inct_agg.csv, peso = frequência) e do texto de descrição de cada
+# INCT (texto_descricao_inct.csv, peso = nº de ocorrências), normalizados com
+# as regras de kpis.normalize_text e sem acentos. A busca por tema depende das
+# palavras-chave: sem wordcloud_inct_agg.csv, só o nome e a descrição contam.
+# O vocabulário fica ordenado num array: cada termo da consulta vira um
+# intervalo de prefixo (searchsorted) e as listas de ocorrências são fatias
+# contíguas (CSR), somadas por INCT com bincount.
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import indices
+import kpis
+import nuvem
+
+TEXTO_PATH = "bases/texto_descricao_inct.csv"
+MIN_PREFIXO = 2
+PESO_TITULO = 5.0  # o nome do INCT é o indicador mais direto do tema
+TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def normalizar(texto) -> str:
+    """`kpis.normalize_text` + remoção de acentos (busca insensível a caixa e acentuação)."""
+    texto = unicodedata.normalize("NFKD", kpis.normalize_text(texto))
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+def termos(texto) -> list:
+    """Termos indexáveis do texto, sem conectivos."""
+    return [t for t in TOKEN.findall(normalizar(texto)) if t not in nuvem.STOPWORDS_ONEWORD]
+
+
+def _tokenizar(textos: pd.Series) -> pd.Series:
+    """`termos` aplicado uma vez por valor distinto."""
+    unicos = pd.unique(textos.astype(str))
+    return textos.astype(str).map(dict(zip(unicos, map(termos, unicos))))
+
+
+class IndiceInvertido:
+    """Vocabulário ordenado + listas de ocorrências (INCT, peso) em CSR."""
+
+    def __init__(self, ocorrencias: pd.DataFrame, n_entidades: int):
+        """`ocorrencias`: colunas termo, entidade (posição 0..n-1) e peso."""
+        agregado = ocorrencias.groupby(["termo", "entidade"], sort=True)["peso"].sum().reset_index()
+        self.termos, inicio = np.unique(agregado["termo"].to_numpy(dtype=str), return_index=True)
+        self.indptr = np.append(inicio, len(agregado)).astype(np.int64)
+        self.entidades = agregado["entidade"].to_numpy(dtype=np.int32)
+        self.pesos = agregado["peso"].to_numpy(dtype=np.float32)
+        self.n_entidades = n_entidades
+
+    def _intervalo(self, termo: str, prefixo: bool) -> tuple:
+        inicio = int(np.searchsorted(self.termos, termo, side="left"))
+        if prefixo and len(termo) >= MIN_PREFIXO:
+            fim = int(np.searchsorted(self.termos, termo + "\uffff", side="left"))
+        else:
+            fim = inicio + 1 if inicio < len(self.termos) and self.termos[inicio] == termo else inicio
+        return inicio, fim
+
+    def pontuar(self, termo: str, prefixo: bool = True) -> np.ndarray:
+        """Peso de `termo` (e dos termos que começam por ele) em cada entidade."""
+        inicio, fim = self._intervalo(termo, prefixo)
+        a, b = self.indptr[inicio], self.indptr[fim]
+        return np.bincount(self.entidades[a:b], weights=self.pesos[a:b], minlength=self.n_entidades)
+
+    def buscar(self, consulta: str) -> tuple:
+        """
+        (pontuação, casa): entidades que têm todos os termos da consulta (cada
+        termo como prefixo) e a soma das frequências dos termos encontrados.
+        """
+        consulta = termos(consulta)
+        if not consulta:
+            return np.zeros(self.n_entidades), np.zeros(self.n_entidades, dtype=bool)
+        pontos = [self.pontuar(t) for t in consulta]
+        casa = np.logical_and.reduce([p > 0 for p in pontos])
+        return np.sum(pontos, axis=0), casa
+
+
+class BuscaINCT:
+    """Busca de INCTs (e das suas Áreas) por tema."""
+
+    def __init__(self, idx: indices.IndiceEntidades):
+        catalogo = idx.catalogo.drop_duplicates("Identificador").reset_index(drop=True)
+        self.catalogo = catalogo[["Identificador", "nome_inct", "area", "identificador_area"]]
+        self._colunas = {c: self.catalogo[c].to_numpy() for c in self.catalogo.columns}
+        posicao = pd.Series(np.arange(len(catalogo)), index=catalogo["Identificador"])
+
+        partes = [pd.DataFrame({
+            "termo": _tokenizar(catalogo["nome_inct"]),
+            "entidade": np.arange(len(catalogo)),
+            "peso": PESO_TITULO,
+        }).explode("termo")]
+        wc = idx.base(nuvem.WC_INCT_PATH)
+        if not wc.empty:
+            wc = wc[nuvem.palavras_validas(wc["palavra"])]
+            partes.append(pd.DataFrame({
+                "termo": _tokenizar(wc["palavra"]),
+                "entidade": wc["Identificador"].map(posicao),
+                "peso": wc["freq"].astype(float),
+            }).explode("termo"))
+        textos = idx.base(TEXTO_PATH)
+        if not textos.empty:
+            partes.append(pd.DataFrame({
+                "termo": _tokenizar(textos["texto_descricao"].fillna("")),
+                "entidade": textos["Identificador"].map(posicao),
+                "peso": 1.0,
+            }).explode("termo"))
+
+        ocorrencias = pd.concat(partes, ignore_index=True).dropna()
+        self.indice = IndiceInvertido(ocorrencias.astype({"entidade": "int64"}), len(catalogo))
+
+    def incts(self, consulta: str, limite: int = 20) -> pd.DataFrame:
+        """INCTs com todos os termos da consulta, dos que mais falam do tema para os que menos."""
+        pontos, casa = self.indice.buscar(consulta)
+        achados = np.flatnonzero(casa)
+        achados = achados[np.lexsort((achados, -pontos[achados]))][:limite]
+        return pd.DataFrame({
+            **{c: valores[achados] for c, valores in self._colunas.items()},
+            "relevancia": pontos[achados],
+        })
+
+    def areas(self, consulta: str) -> pd.DataFrame:
+        """Áreas ordenadas pela soma da relevância dos seus INCTs que casam com a consulta."""
+        pontos, casa = self.indice.buscar(consulta)
+        por_area = self.catalogo.assign(relevancia=np.where(casa, pontos, 0.0), incts=casa.astype(int))
+        por_area = por_area[por_area["incts"] > 0].groupby(["identificador_area", "area"], as_index=False)[
+            ["relevancia", "incts"]
+        ].sum()
+        return por_area.sort_values("relevancia", ascending=False, kind="stable")
+
+
+@st.cache_resource(show_spinner=False)
+def load_busca() -> BuscaINCT:
+    """Índice de busca único por processo, montado sobre as bases já indexadas."""
+    return BuscaINCT(indices.load_indices())
@@ -0,0 +1,194 @@
+# dados.py — Camada de dados: snapshot colunar (Arrow) das bases em `bases/`
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc
+
+# Copy-on-Write: as bases são carregadas uma vez por processo e compartilhadas
+# entre sessões; fatias e visões entregues ao painel não copiam os dados e
+# qualquer escrita numa delas copia só aquela visão, nunca o frame compartilhado.
+pd.set_option("mode.copy_on_write", True)
+
+BASES_DIR = Path("bases")
+SNAPSHOT_DIR = Path("bases_snapshot")
+MANIFEST_PATH = SNAPSHOT_DIR / "manifest.json"
+SNAPSHOT_VERSAO = 1
+
+# Colunas obrigatórias e tipos de cada base. Bases que não estão aqui são
+# compiladas com o tipo inferido pelo pandas.
+SCHEMAS = {
+    "select_incts_areas_coord_sexo": {
+        "nome_inct": "string", "coordenador": "string", "Identificador": "int64",
+        "path_gexf": "string", "inct_folder": "string", "n_pesquisadores": "int64",
+        "n_feminino": "int64", "n_masculino": "int64", "area": "string",
+        "identificador_area": "string", "path_area_gexf_html": "string",
+        "path_gexf_html": "string",
+    },
+    "select_instituicoes_por_inct": {
+        "inct_folder": "string", "nome_instituicao_empresa": "string", "uf": "string",
+        "n_pesquisadores": "int64", "nome_inct": "string", "area": "string",
+    },
+    "big_number_qtd_producao_bibliografica_periodo": {
+        "nome_inct": "string", "tipo_producao": "string", "periodo": "string",
+        "n_tipos_producao": "int64",
+    },
+    "big_number_qtd_producao_bibliografica_periodo_area": {
+        "area": "string", "tipo_producao": "string", "periodo": "string",
+        "n_tipos_producao": "int64",
+    },
+    "big_number_maior_formacao": {
+        "inct_folder": "string", "nome_inct": "string", "area_de_maior_formacao": "string",
+        "count": "int64", "area": "string",
+    },
+    "grafico_maior_graduacao_inct": {
+        "inct_folder": "string", "formacao_mais_alta": "string", "qtd": "int64",
+        "nome_inct": "string", "area": "string",
+    },
+    "grafico_maior_graduacao_area": {
+        "area": "string", "formacao_mais_alta": "string", "qtd": "int64",
+    },
+    "texto_descricao_inct": {
+        "nome_inct": "string", "area": "string", "texto_descricao": "string",
+    },
+    "texto_descricao_area": {
+        "area": "string", "periodo": "string", "texto_md": "string",
+    },
+    "wordcloud_inct_agg": {
+        "nome_inct": "string", "palavra": "string", "freq": "int64",
+    },
+    "wordcloud_area_agg": {
+        "area": "string", "periodo": "string", "palavra": "string", "freq": "int64",
+    },
+}
+
+
+# ==========================================================
+# 🔧 BUILD DO SNAPSHOT
+# ==========================================================
+
+def file_sha256(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def _to_arrow(df: pd.DataFrame, schema: dict, nome: str) -> pa.Table:
+    """Valida e tipa o DataFrame conforme o schema declarado da base."""
+    faltando = [c for c in schema if c not in df.columns]
+    if faltando:
+        raise ValueError(f"Base '{nome}': colunas obrigatórias ausentes: {faltando}")
+
+    for col, tipo in schema.items():
+        if tipo == "int64":
+            if df[col].isna().any():
+                raise ValueError(f"Base '{nome}': coluna '{col}' possui valores nulos")
+            df[col] = df[col].astype("int64")
+
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    # large_string permite que o pandas envolva o buffer memory-mapped sem cópia
+    campos = [
+        pa.field(f.name, pa.large_string()) if pa.types.is_string(f.type) else f
+        for f in tabela.schema
+    ]
+    return tabela.cast(pa.schema(campos))
+
+
+def build_snapshot(bases_dir=BASES_DIR, out_dir=SNAPSHOT_DIR) -> dict:
+    """Compila todos os CSVs de `bases/` em arquivos Arrow IPC + manifest."""
+    bases_dir, out_dir = Path(bases_dir), Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = {"versao": SNAPSHOT_VERSAO, "gerado_em": time.strftime("%Y-%m-%dT%H:%M:%S"), "bases": {}}
+
+    for csv_path in sorted(bases_dir.glob("*.csv")):
+        nome = csv_path.stem
+        df = pd.read_csv(csv_path)
+        tabela = _to_arrow(df, SCHEMAS.get(nome, {}), nome)
+
+        destino = out_dir / f"{nome}.arrow"
+        tmp = destino.with_suffix(".arrow.tmp")
+        with pa.OSFile(str(tmp), "wb") as sink:
+            with pa.ipc.new_file(sink, tabela.schema) as writer:
+                writer.write_table(tabela)
+        os.replace(tmp, destino)
+
+        stat = csv_path.stat()
+        manifest["bases"][nome] = {
+            "origem": csv_path.as_posix(),
+            "arquivo": destino.name,
+            "sha256": file_sha256(csv_path),
+            "tamanho": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "linhas": tabela.num_rows,
+            "colunas": {f.name: str(f.type) for f in tabela.schema},
+        }
+
+    tmp = out_dir / "manifest.json.tmp"
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, out_dir / "manifest.json")
+    return manifest
+
+
+# ==========================================================
+# 📥 LEITURA
+# ==========================================================
+
+_manifest_cache = {}
+
+
+def load_manifest(snapshot_dir=SNAPSHOT_DIR) -> dict:
+    """Lê o manifest do snapshot (ou {} se ainda não foi gerado)."""
+    p = Path(snapshot_dir) / "manifest.json"
+    if not p.exists():
+        return {}
+    chave = (str(p), p.stat().st_mtime_ns)
+    if chave not in _manifest_cache:
+        _manifest_cache.clear()
+        _manifest_cache[chave] = json.loads(p.read_text(encoding="utf-8"))
+    return _manifest_cache[chave]
+
+
+def _snapshot_valido(entrada: dict, csv_path: Path) -> bool:
+    """O snapshot vale enquanto o CSV de origem não mudar (ou não existir)."""
+    if not csv_path.exists():
+        return True
+    stat = csv_path.stat()
+    return stat.st_size == entrada["tamanho"] and stat.st_mtime_ns == entrada["mtime_ns"]
+
+
+def read_arrow(path) -> pa.Table:
+    """Abre um arquivo Arrow IPC via memory-map (sem copiar para o heap)."""
+    with pa.memory_map(str(path), "r") as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def base_disponivel(path: str, snapshot_dir=SNAPSHOT_DIR) -> bool:
+    """True se a base existe como CSV ou no snapshot."""
+    if Path(path).exists():
+        return True
+    return Path(path).stem in load_manifest(snapshot_dir).get("bases", {})
+
+
+def load_base(path: str, snapshot_dir=SNAPSHOT_DIR) -> pd.DataFrame:
+    """
+    Carrega uma base de `bases/` a partir do snapshot Arrow, se disponível e
+    atualizado; caso contrário, cai no `pd.read_csv` original.
+    """
+    csv_path = Path(path)
+    entrada = load_manifest(snapshot_dir).get("bases", {}).get(csv_path.stem)
+
+    if entrada and _snapshot_valido(entrada, csv_path):
+        tabela = read_arrow(Path(snapshot_dir) / entrada["arquivo"])
+        return tabela.to_pandas(
+            split_blocks=True,
+            types_mapper={pa.large_string(): pd.StringDtype("pyarrow")}.get,
+        )
+
+    return pd.read_csv(csv_path)
@@ -0,0 +1,57 @@
+# estaticos.py — Artefatos pesados servidos como arquivos estáticos com URL por hash de conteúdo
+#
+# O Streamlit serve `static/` em `app/static/...` (server.enableStaticServing).
+# Como o nome do arquivo carrega o hash do conteúdo e a URL leva `?v=<hash>`,
+# o Tornado responde com Cache-Control de longa duração e o navegador baixa
+# cada versão uma única vez; reruns e visitas repetidas não retransmitem nada.
+import hashlib
+import os
+import re
+from pathlib import Path
+
+STATIC_DIR = Path("static")
+URL_PREFIXO = "app/static"
+
+# O handler estático do Streamlit só mantém o Content-Type real destas extensões
+# (as demais, inclusive .html e .js, saem como text/plain + nosniff)
+EXTENSOES_SEGURAS = {".json", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".pdf", ".xml"}
+
+
+def digest(dados: bytes) -> str:
+    return hashlib.sha256(dados).hexdigest()[:16]
+
+
+def publicar(subdir: str, nome: str, dados: bytes, ext: str = ".json") -> str:
+    """
+    Grava `static/<subdir>/<nome>.<hash><ext>` (se ainda não existir) e devolve
+    o caminho relativo a `static/`. Conteúdo igual → mesmo arquivo.
+    """
+    if ext not in EXTENSOES_SEGURAS:
+        raise ValueError(f"Extensão {ext} seria servida como text/plain pelo Streamlit")
+
+    rel = f"{subdir}/{nome}.{digest(dados)}{ext}"
+    p = STATIC_DIR / rel
+    if not p.exists():
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(dados)
+        os.replace(tmp, p)
+    return rel
+
+
+def url(rel: str) -> str:
+    """URL relativa à página do app, com o hash como versão (cache imutável)."""
+    versao = rel.rsplit(".", 2)[-2]
+    return f"{URL_PREFIXO}/{rel}?v={versao}"
+
+
+def remover_orfaos(subdir: str, validos) -> int:
+    """Apaga versões antigas em `static/<subdir>/` que não estão em `validos`."""
+    validos = set(validos)
+    removidos = 0
+    for p in (STATIC_DIR / subdir).glob("*.*"):
+        rel = f"{subdir}/{p.name}"
+        if rel not in validos and re.search(r"\.[0-9a-f]{16}\.\w+$", p.name):
+            p.unlink()
+            removidos += 1
+    return removidos
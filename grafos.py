@@ -0,0 +1,453 @@
+# grafos.py — Rede de colaboração: build GEXF → grafo publicado em static/ + visualizador vis-network
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import streamlit as st
+
+import dados
+import estaticos
+
+GEXF_HTML_DIR = Path("gexf_html")
+SUBDIR = "grafos"
+MANIFEST_PATH = estaticos.STATIC_DIR / SUBDIR / "manifest.json"
+
+# vis-network 9.1.2 (a cópia distribuída com o PyVis) versionado em static/vis/,
+# com o hash do conteúdo no nome como os grafos publicados: funciona sem acesso
+# à internet e tem o mesmo cache HTTP de longa duração. O Streamlit serve .js e
+# .css como text/plain + nosniff, então a página baixa os dois com fetch
+# (conferindo o SRI) e os injeta como <style>/<script>.
+VIS_JS = (
+    "vis/vis-network.1f20f0736f32cb9b.js",
+    "sha512-k+MZGZNJ7vnxTpItmJsIITJwEc7r9llzQGh+XE8NZZr44f8a7ica7KgZ+uvntWHUVCTWQ4eV0sP2lLRr6jI6Mg==",
+)
+VIS_CSS = (
+    "vis/vis-network.2e82d445ad5878ea.css",
+    "sha512-WgxfT5LWjfszlPHXRmBWHkV2eceiWTOBvrKCNbdgDYTHrT2AeLCGbF4sZlZw3UMN3WtL0tGUoIAKsu8mllg/XA==",
+)
+
+# Só os campos que o vis-network usa para desenhar
+CAMPOS_NO = ("id", "label", "title", "color", "font", "shape", "size", "x", "y")
+CAMPOS_ARESTA = ("id", "from", "to", "label", "title", "width")
+
+# Aparência dos grafos (a mesma dos HTMLs gerados com PyVis). As posições vêm
+# prontas do build, então a simulação física fica desligada no navegador.
+COR_NO = "#97c2fc"
+OPCOES = {
+    "configure": {"enabled": False},
+    "edges": {"color": {"inherit": True}, "smooth": {"enabled": False}},
+    "interaction": {"dragNodes": True, "hideEdgesOnDrag": False, "hideNodesOnDrag": False},
+    "physics": {"enabled": False},
+}
+
+# Subgrafos pequenos (ego-redes, caminhos) chegam sem posições: o navegador
+# estabiliza a física antes do primeiro desenho e depois desliga a simulação
+OPCOES_SUBGRAFO = {
+    "configure": {"enabled": False},
+    "edges": {"color": {"inherit": True}, "smooth": {"enabled": False}},
+    "interaction": {"dragNodes": True, "hover": True},
+    "physics": {
+        "enabled": True,
+        "solver": "forceAtlas2Based",
+        "stabilization": {"enabled": True, "iterations": 200, "fit": True},
+    },
+}
+
+# Layout (Fruchterman-Reingold do networkx), calculado uma vez por grafo no build
+LAYOUT_ITERACOES = 50
+LAYOUT_SEMENTE = 42
+LAYOUT_ESCALA_PX = 40  # raio ≈ ESCALA * sqrt(n) pixels
+
+# Nível de detalhe: grafos maiores que isso abrem só com os nós de maior grau
+# e as arestas mais fortes entre eles
+LOD_NOS = 300
+LOD_ARESTAS = 1200
+
+# Muda quando o formato publicado muda (força republicar mesmo com a fonte igual)
+VERSAO_PAYLOAD = 2
+
+ALTURA = 800
+
+
+def payload(grafo: dict) -> bytes:
+    return json.dumps(grafo, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# ==========================================================
+# 🔧 LEITURA DAS FONTES (GEXF ou HTML legado do PyVis)
+# ==========================================================
+
+def grafo_de_gexf(path) -> dict:
+    """Lê o GEXF com networkx e monta nós/arestas no formato do vis-network."""
+    import networkx as nx
+
+    G = nx.read_gexf(path)
+    grau = dict(G.degree())
+    nodes = [
+        {
+            "id": str(n),
+            "label": str(attrs.get("label", n)),
+            "color": COR_NO,
+            "font": {"color": "black"},
+            "shape": "dot",
+            "size": max(6, 2 * int(attrs.get("Grau", grau[n]))),
+        }
+        for n, attrs in G.nodes(data=True)
+    ]
+    rotulo = {n["id"]: n["label"] for n in nodes}
+    edges = [
+        {
+            "id": f"{u}-{v}",
+            "from": str(u),
+            "to": str(v),
+            "label": f"{rotulo[str(u)]}-{rotulo[str(v)]}",
+            "width": float(attrs.get("Relative coauthorships", 1.0)),
+        }
+        for u, v, attrs in G.edges(data=True)
+    ]
+    return {"nodes": nodes, "edges": edges, "options": OPCOES}
+
+
+def _pyvis_dados(path) -> tuple:
+    """(nós, arestas, opções) completos do `vis.DataSet(...)` de um HTML exportado pelo PyVis."""
+    html = Path(path).read_text(encoding="utf-8")
+    dec = json.JSONDecoder()
+
+    def _valor(marcador):
+        inicio = html.index(marcador) + len(marcador)
+        return dec.raw_decode(html, inicio)[0]
+
+    return _valor("nodes = new vis.DataSet("), _valor("edges = new vis.DataSet("), _valor("var options = ")
+
+
+def parse_pyvis_html(path) -> dict:
+    """Extrai nós, arestas e opções de um HTML exportado pelo PyVis."""
+    nodes, edges, options = _pyvis_dados(path)
+    return {
+        "nodes": [{k: n[k] for k in CAMPOS_NO if k in n} for n in nodes],
+        "edges": [{k: e[k] for k in CAMPOS_ARESTA if k in e} for e in edges],
+        "options": options,
+    }
+
+
+def carregar_nx(fonte):
+    """
+    Grafo networkx não direcionado da fonte (GEXF ou HTML legado), com os
+    atributos dos pesquisadores nos nós e `weight` = coautorias nas arestas.
+    """
+    import networkx as nx
+
+    fonte = Path(fonte)
+    if fonte.suffix == ".gexf":
+        G = nx.Graph(nx.read_gexf(fonte))
+        for _, _, attrs in G.edges(data=True):
+            attrs["weight"] = float(attrs.get("Coauthorships", attrs.get("weight", 1.0)))
+        return G
+
+    nodes, edges, _ = _pyvis_dados(fonte)
+    G = nx.Graph()
+    G.add_nodes_from((str(n["id"]), {k: v for k, v in n.items() if k != "id"}) for n in nodes)
+    G.add_edges_from(
+        (str(e["from"]), str(e["to"]), {
+            "weight": float(e.get("Coauthorships", 1.0)),
+            "Relative coauthorships": float(e.get("Relative coauthorships", e.get("width", 1.0))),
+        })
+        for e in edges
+    )
+    return G
+
+
+# ==========================================================
+# 📐 LAYOUT E NÍVEL DE DETALHE
+# ==========================================================
+
+def calcular_layout(grafo: dict) -> dict:
+    """
+    Posições fixas (x, y) para todos os nós. Os nós com arestas passam pelo
+    spring layout; os isolados vão para uma grade logo abaixo do desenho.
+    """
+    import networkx as nx
+    import numpy as np
+
+    G = nx.Graph()
+    G.add_nodes_from(n["id"] for n in grafo["nodes"])
+    G.add_weighted_edges_from(
+        (e["from"], e["to"], e.get("width", 1.0)) for e in grafo["edges"] if e["from"] != e["to"]
+    )
+    conectados = G.subgraph([n for n, g in G.degree() if g > 0])
+
+    pos = {}
+    if conectados.number_of_nodes():
+        pos = nx.spring_layout(
+            conectados,
+            iterations=LAYOUT_ITERACOES,
+            seed=LAYOUT_SEMENTE,
+            scale=LAYOUT_ESCALA_PX * np.sqrt(conectados.number_of_nodes()),
+        )
+
+    isolados = [n for n, g in G.degree() if g == 0]
+    if isolados:
+        passo = 2 * LAYOUT_ESCALA_PX
+        colunas = max(1, int(np.ceil(np.sqrt(len(isolados)) * 2)))
+        topo = max((y for _, y in pos.values()), default=0) + 2 * passo
+        x0 = -(min(colunas, len(isolados)) - 1) * passo / 2
+        for i, n in enumerate(isolados):
+            pos[n] = (x0 + (i % colunas) * passo, topo + (i // colunas) * passo)
+
+    for no in grafo["nodes"]:
+        x, y = pos[no["id"]]
+        no["x"], no["y"] = round(float(x), 1), round(float(y), 1)
+    grafo["options"] = OPCOES
+    return grafo
+
+
+def nivel_detalhe(grafo: dict, k: int = LOD_NOS, max_arestas: int = LOD_ARESTAS) -> dict:
+    """
+    Subgrafo com os `k` nós de maior grau (empate: grau ponderado) e até
+    `max_arestas` arestas entre eles, das mais fortes para as mais fracas.
+    """
+    grau, peso = {}, {}
+    for e in grafo["edges"]:
+        for n in (e["from"], e["to"]):
+            grau[n] = grau.get(n, 0) + 1
+            peso[n] = peso.get(n, 0.0) + e.get("width", 1.0)
+
+    ordem = sorted(grafo["nodes"], key=lambda n: (-grau.get(n["id"], 0), -peso.get(n["id"], 0.0), n["id"]))
+    manter = {n["id"] for n in ordem[:k]}
+    arestas = [e for e in grafo["edges"] if e["from"] in manter and e["to"] in manter]
+    arestas = sorted(arestas, key=lambda e: -e.get("width", 1.0))[:max_arestas]
+    return {
+        "nodes": [n for n in grafo["nodes"] if n["id"] in manter],
+        "edges": arestas,
+        "options": grafo["options"],
+    }
+
+
+def fonte_grafo(nome: str, gexf_path=None) -> Path | None:
+    """GEXF do catálogo, se existir; senão o HTML legado em gexf_html/."""
+    for p in (gexf_path, GEXF_HTML_DIR / f"{nome}.html"):
+        if p and Path(p).exists():
+            return Path(p)
+    return None
+
+
+def fontes_catalogo(catalogo) -> dict:
+    """{nome do grafo: caminho do GEXF} para todos os INCTs e Áreas do catálogo."""
+    fontes = {}
+    for col_html, col_gexf in (("path_gexf_html", "path_gexf"), ("path_area_gexf_html", "path_area_gexf")):
+        for html, gexf in catalogo[[col_html, col_gexf]].dropna().itertuples(index=False):
+            fontes.setdefault(Path(html).stem, gexf)
+    return fontes
+
+
+# ==========================================================
+# 🏭 BUILD (paralelo e incremental)
+# ==========================================================
+
+def publicar_grafo(nome: str, fonte, origem_sha256: str | None = None) -> dict:
+    """
+    Lê a fonte, calcula o layout e publica em static/ o grafo completo e, se
+    ele passar de LOD_NOS nós ou LOD_ARESTAS arestas, a vista inicial reduzida.
+    Devolve a entrada do manifest.
+    """
+    inicio = time.perf_counter()
+    fonte = Path(fonte)
+    grafo = grafo_de_gexf(fonte) if fonte.suffix == ".gexf" else parse_pyvis_html(fonte)
+    grafo = calcular_layout(grafo)
+    dados_grafo = payload(grafo)
+
+    entrada = {
+        "versao": VERSAO_PAYLOAD,
+        "origem": str(fonte),
+        "origem_sha256": origem_sha256 or dados.file_sha256(fonte),
+        "arquivo": estaticos.publicar(SUBDIR, nome, dados_grafo),
+        "bytes": len(dados_grafo),
+        "nos": len(grafo["nodes"]),
+        "arestas": len(grafo["edges"]),
+        "arquivo_lod": None,
+    }
+    if len(grafo["nodes"]) > LOD_NOS or len(grafo["edges"]) > LOD_ARESTAS:
+        lod = nivel_detalhe(grafo)
+        dados_lod = payload(lod)
+        entrada.update({
+            "arquivo_lod": estaticos.publicar(SUBDIR, f"{nome}.top{LOD_NOS}", dados_lod),
+            "bytes_lod": len(dados_lod),
+            "nos_lod": len(lod["nodes"]),
+            "arestas_lod": len(lod["edges"]),
+        })
+    entrada["segundos"] = round(time.perf_counter() - inicio, 3)
+    return entrada
+
+
+def _publicada(entrada: dict) -> bool:
+    """Entrada no formato atual e com os arquivos ainda presentes em static/."""
+    arquivos = [entrada.get("arquivo"), entrada.get("arquivo_lod")]
+    return entrada.get("versao") == VERSAO_PAYLOAD and all(
+        (estaticos.STATIC_DIR / a).exists() for a in arquivos if a
+    )
+
+
+def _publicar_tarefa(args):
+    return args[0], publicar_grafo(*args)
+
+
+def read_manifest(path=MANIFEST_PATH) -> dict:
+    path = Path(path)
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {"grafos": {}}
+
+
+def write_manifest(manifest: dict, path=MANIFEST_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def build_grafos(fontes: dict, workers: int | None = None, limpar: bool = False) -> dict:
+    """
+    Publica todos os grafos de `fontes` ({nome: gexf}) em paralelo. Grafos cuja
+    fonte tem o mesmo sha256 do último build são reaproveitados do manifest.
+    """
+    anterior = read_manifest()["grafos"]
+    grafos, pendentes, ausentes = {}, [], []
+    for nome, gexf in sorted(fontes.items()):
+        fonte = fonte_grafo(nome, gexf)
+        if fonte is None:
+            ausentes.append(nome)
+            continue
+        sha = dados.file_sha256(fonte)
+        entrada = anterior.get(nome)
+        if (entrada and entrada.get("origem") == str(fonte) and entrada.get("origem_sha256") == sha
+                and _publicada(entrada)):
+            grafos[nome] = entrada
+        else:
+            pendentes.append((nome, fonte, sha))
+
+    inicio = time.perf_counter()
+    if pendentes:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for nome, entrada in pool.map(_publicar_tarefa, pendentes):
+                grafos[nome] = entrada
+
+    write_manifest({
+        "gerado_em": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "segundos": round(time.perf_counter() - inicio, 3),
+        "grafos": dict(sorted(grafos.items())),
+    })
+
+    validos = [a for e in grafos.values() for a in (e["arquivo"], e.get("arquivo_lod")) if a]
+    removidos = estaticos.remover_orfaos(SUBDIR, validos) if limpar else 0
+    return {"grafos": len(grafos), "publicados": len(pendentes), "ausentes": ausentes, "removidos": removidos}
+
+
+# ==========================================================
+# 🕸️ VISUALIZAÇÃO
+# ==========================================================
+
+@st.cache_resource(show_spinner=False)
+def entrada_grafo(nome: str) -> dict | None:
+    """
+    Entrada do manifest do grafo `nome`, ou None se ele não foi publicado (ou
+    foi publicado num formato antigo). O painel só lê o manifest: o layout é
+    calculado no build (build_assets.py grafos), nunca durante a sessão.
+    """
+    entrada = read_manifest()["grafos"].get(nome)
+    return entrada if entrada is not None and _publicada(entrada) else None
+
+
+def _carregar_vis() -> str:
+    """Script que define `visPronto`: resolve quando o vis-network de static/vis/ já rodou na página."""
+    return f"""
+<script>
+  const incluir = (url, integrity, tag) => fetch(url, {{ integrity }})
+    .then((r) => {{ if (!r.ok) throw new Error(r.status); return r.text(); }})
+    .then((texto) => {{
+      const el = document.createElement(tag);
+      el.textContent = texto;
+      document.head.appendChild(el);
+    }});
+  const visPronto = Promise.all([
+    incluir("{estaticos.url(VIS_CSS[0])}", "{VIS_CSS[1]}", "style"),
+    incluir("{estaticos.url(VIS_JS[0])}", "{VIS_JS[1]}", "script"),
+  ]);
+</script>"""
+
+
+def html_visualizador(entrada: dict, altura: int = ALTURA) -> str:
+    """
+    Página mínima que baixa o grafo pela URL estática (cacheável) e desenha
+    com vis-network, sem simulação. Grafos grandes abrem na vista reduzida;
+    o botão carrega o restante mantendo as posições.
+    """
+    url_completo = estaticos.url(entrada["arquivo"])
+    url_inicial = estaticos.url(entrada["arquivo_lod"]) if entrada.get("arquivo_lod") else url_completo
+    botao = (
+        f'<button id="expandir">Mostrar rede completa ({entrada["nos"]} nós)</button>'
+        if url_inicial != url_completo else ""
+    )
+    return f"""{_carregar_vis()}
+<style>
+  body {{ margin: 0; font-family: sans-serif; }}
+  #mynetwork {{ width: 100%; height: {altura}px; background-color: #ffffff; border: 1px solid lightgray; position: relative; }}
+  #status {{ position: absolute; top: 12px; left: 12px; color: #555; font-size: 14px; }}
+  #expandir {{ position: absolute; top: 10px; right: 10px; padding: 6px 10px; border: 1px solid #ccc;
+               border-radius: 8px; background: #fff; cursor: pointer; font-size: 13px; }}
+</style>
+<div id="mynetwork"></div>
+<div id="status">Carregando grafo…</div>
+{botao}
+<script>
+  const status = document.getElementById("status");
+  const baixar = (url) => fetch(url).then((r) => {{ if (!r.ok) throw new Error(r.status); return r.json(); }});
+  Promise.all([baixar("{url_inicial}"), visPronto])
+    .then(([g]) => {{
+      const nodes = new vis.DataSet(g.nodes);
+      const edges = new vis.DataSet(g.edges);
+      new vis.Network(document.getElementById("mynetwork"), {{ nodes, edges }}, g.options);
+      status.remove();
+
+      const expandir = document.getElementById("expandir");
+      if (expandir) {{
+        expandir.onclick = () => {{
+          expandir.disabled = true;
+          expandir.textContent = "Carregando…";
+          baixar("{url_completo}").then((c) => {{
+            nodes.update(c.nodes);
+            edges.update(c.edges);
+            expandir.remove();
+          }});
+        }};
+      }}
+    }})
+    .catch(() => {{ status.textContent = "Não foi possível carregar o grafo."; }});
+</script>
+"""
+
+
+
+def html_subgrafo(grafo: dict, altura: int = 500) -> str:
+    """Página com o subgrafo embutido (poucos KB) desenhado com vis-network."""
+    dados_grafo = json.dumps(
+        {"nodes": grafo["nodes"], "edges": grafo["edges"]}, ensure_ascii=False, separators=(",", ":")
+    ).replace("</", "<\\/")
+    return f"""{_carregar_vis()}
+<style>
+  body {{ margin: 0; font-family: sans-serif; }}
+  #mynetwork {{ width: 100%; height: {altura}px; background-color: #ffffff; border: 1px solid lightgray; }}
+</style>
+<div id="mynetwork"></div>
+<script>
+  const g = {dados_grafo};
+  visPronto.then(() => {{
+    const rede = new vis.Network(
+      document.getElementById("mynetwork"),
+      {{ nodes: new vis.DataSet(g.nodes), edges: new vis.DataSet(g.edges) }},
+      {json.dumps(OPCOES_SUBGRAFO)}
+    );
+    rede.once("stabilizationIterationsDone", () => rede.setOptions({{ physics: {{ enabled: false }} }}));
+  }});
+</script>
+"""
@@ -0,0 +1,222 @@
+# grafos_area.py — Rede de coautoria por Área: união deduplicada dos grafos dos seus INCTs
+#
+# Cada INCT contribui com seus nós e arestas para uma tabela de contribuições
+# (grafos_dados/area_*.parquet). Quando o GEXF de um INCT muda, só ele é relido:
+# suas linhas são trocadas e apenas o grafo da Área a que ele pertence é refeito;
+# quando o catálogo muda um INCT de Área, as duas Áreas são refeitas, e a Área
+# que fica sem INCTs tem o GEXF removido.
+# O resultado é gravado como GEXF no `path_area_gexf` do catálogo, de onde segue
+# pelo mesmo pipeline de layout/LOD (grafos.py) e métricas (metricas.py).
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import dados
+import grafos
+
+ESTADO_DIR = Path("grafos_dados")
+NOS_PATH = ESTADO_DIR / "area_nos.parquet"
+ARESTAS_PATH = ESTADO_DIR / "area_arestas.parquet"
+MANIFEST_PATH = ESTADO_DIR / "area_manifest.json"
+
+SCHEMA_NOS = pa.schema([
+    ("inct", pa.string()),
+    ("id", pa.string()),
+    ("label", pa.string()),
+    ("instituicao", pa.string()),
+    ("uf", pa.string()),
+])
+SCHEMA_ARESTAS = pa.schema([
+    ("inct", pa.string()),
+    ("u", pa.string()),
+    ("v", pa.string()),
+    ("coautorias", pa.float64()),
+    ("relativa", pa.float64()),
+])
+
+
+# ==========================================================
+# 🧩 CONTRIBUIÇÃO DE CADA INCT
+# ==========================================================
+
+def contribuicao(nome: str, fonte) -> tuple:
+    """Nós e arestas (u < v) do grafo de um INCT, como linhas das tabelas de contribuição."""
+    G = grafos.carregar_nx(fonte)
+    nos = [
+        {
+            "inct": nome,
+            "id": str(n),
+            "label": str(attrs.get("label", n)),
+            "instituicao": attrs.get("Institution"),
+            "uf": attrs.get("State"),
+        }
+        for n, attrs in G.nodes(data=True)
+    ]
+    arestas = []
+    for u, v, attrs in G.edges(data=True):
+        u, v = sorted((str(u), str(v)))
+        if u == v:
+            continue
+        arestas.append({
+            "inct": nome,
+            "u": u,
+            "v": v,
+            "coautorias": float(attrs.get("weight", attrs.get("Coauthorships", 1.0))),
+            "relativa": float(attrs.get("Relative coauthorships", 1.0)),
+        })
+    return nome, nos, arestas
+
+
+def _contribuicao_tarefa(args):
+    return contribuicao(*args)
+
+
+# ==========================================================
+# 🔗 UNIÃO POR ÁREA
+# ==========================================================
+
+def unir_area(nos: pd.DataFrame, arestas: pd.DataFrame):
+    """
+    Grafo networkx da Área: pesquisadores fundidos pelo ID Lattes (atributos do
+    primeiro INCT em que aparecem) e cada par de coautores uma única vez, com o
+    maior peso registrado entre os INCTs.
+    """
+    import networkx as nx
+
+    G = nx.Graph()
+    if not nos.empty:
+        por_id = nos.groupby("id", sort=True)
+        atributos = por_id.first()
+        n_incts = por_id["inct"].nunique()
+        for id_, attrs in atributos.iterrows():
+            G.add_node(id_, **{
+                k: v for k, v in {
+                    "label": attrs["label"],
+                    "Institution": attrs["instituicao"],
+                    "State": attrs["uf"],
+                    "INCTs": int(n_incts[id_]),
+                }.items() if pd.notna(v)
+            })
+
+    if not arestas.empty:
+        pares = arestas.groupby(["u", "v"], sort=True).agg(
+            coautorias=("coautorias", "max"), relativa=("relativa", "max")
+        )
+        G.add_edges_from(
+            (u, v, {"Coauthorships": c, "Relative coauthorships": r})
+            for (u, v), c, r in zip(pares.index, pares["coautorias"], pares["relativa"])
+        )
+    return G
+
+
+def _write_gexf(G, path: Path):
+    import networkx as nx
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    nx.write_gexf(G, tmp)
+    os.replace(tmp, path)
+
+
+def _write_parquet(df: pd.DataFrame, schema: pa.Schema, out: Path):
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(".tmp")
+    pq.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False), tmp, compression="zstd")
+    os.replace(tmp, out)
+
+
+def _read_parquet(path: Path, schema: pa.Schema) -> pd.DataFrame:
+    return pq.read_table(path).to_pandas() if path.exists() else schema.empty_table().to_pandas()
+
+
+def build_grafos_area(catalogo: pd.DataFrame, workers: int | None = None, forcar: bool = False) -> dict:
+    """
+    Atualiza a tabela de contribuições só com os INCTs cuja fonte mudou (sha256)
+    e regrava o GEXF apenas das Áreas afetadas (inclusive as de origem e destino
+    de INCTs que mudaram de Área); Áreas sem INCTs perdem o GEXF.
+    """
+    inicio = time.perf_counter()
+    manifest = json.loads(MANIFEST_PATH.read_text(encoding="utf-8")) if MANIFEST_PATH.exists() else {}
+    anteriores = {} if forcar else manifest.get("incts", {})
+    nos = _read_parquet(NOS_PATH, SCHEMA_NOS)
+    arestas = _read_parquet(ARESTAS_PATH, SCHEMA_ARESTAS)
+
+    # INCT (nome do grafo) → Área e caminhos
+    incts = {}
+    areas = {}
+    for r in catalogo.itertuples():
+        nome = Path(r.path_gexf_html).stem
+        incts[nome] = {"area": r.identificador_area, "gexf": r.path_gexf}
+        areas[r.identificador_area] = r.path_area_gexf
+
+    fontes, pendentes, mudaram_de_area = {}, [], set()
+    for nome, inct in sorted(incts.items()):
+        fonte = grafos.fonte_grafo(nome, inct["gexf"])
+        if fonte is None:
+            continue
+        sha = dados.file_sha256(fonte)
+        fontes[nome] = {"area": inct["area"], "origem": str(fonte), "origem_sha256": sha}
+        anterior = anteriores.get(nome)
+        if not (anterior and anterior["origem"] == str(fonte) and anterior["origem_sha256"] == sha):
+            pendentes.append((nome, fonte))
+        if anterior and anterior["area"] != inct["area"]:
+            mudaram_de_area |= {anterior["area"], inct["area"]}
+
+    # INCTs alterados ou que saíram do catálogo/ficaram sem fonte
+    removidos = set(anteriores) - set(fontes)
+    trocar = {nome for nome, _ in pendentes} | removidos
+    afetadas = {incts[n]["area"] for n, _ in pendentes} | {anteriores[n]["area"] for n in removidos} | mudaram_de_area
+    if forcar:
+        afetadas = set(areas)
+    afetadas |= {a for a, p in areas.items() if not Path(p).exists()}
+
+    nos = nos[~nos["inct"].isin(trocar)]
+    arestas = arestas[~arestas["inct"].isin(trocar)]
+    if pendentes:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            novos = list(pool.map(_contribuicao_tarefa, pendentes))
+        nos = pd.concat([nos] + [pd.DataFrame(n, columns=SCHEMA_NOS.names) for _, n, _ in novos], ignore_index=True)
+        arestas = pd.concat([arestas] + [pd.DataFrame(a, columns=SCHEMA_ARESTAS.names) for _, _, a in novos], ignore_index=True)
+
+    area_do_inct = {nome: f["area"] for nome, f in fontes.items()}
+    areas_manifest = manifest.get("areas", {})
+    gerados, esvaziadas = {}, set()
+    for area in sorted(afetadas):
+        # a Área pode ter saído do catálogo: o caminho fica no manifesto
+        gexf = areas.get(area) or areas_manifest.get(area, {}).get("gexf")
+        membros = {n for n, a in area_do_inct.items() if a == area}
+        if not membros:
+            if gexf:
+                Path(gexf).unlink(missing_ok=True)
+            esvaziadas.add(area)
+            continue
+        G = unir_area(nos[nos["inct"].isin(membros)], arestas[arestas["inct"].isin(membros)])
+        _write_gexf(G, Path(gexf))
+        gerados[area] = {
+            "gexf": gexf, "incts": len(membros), "nos": G.number_of_nodes(), "arestas": G.number_of_edges(),
+        }
+
+    _write_parquet(nos, SCHEMA_NOS, NOS_PATH)
+    _write_parquet(arestas, SCHEMA_ARESTAS, ARESTAS_PATH)
+    manifest = {
+        "gerado_em": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "segundos": round(time.perf_counter() - inicio, 3),
+        "incts": fontes,
+        "areas": {a: g for a, g in {**areas_manifest, **gerados}.items() if a not in esvaziadas},
+    }
+    tmp = MANIFEST_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, MANIFEST_PATH)
+
+    return {
+        "incts_relidos": len(pendentes),
+        "areas_geradas": gerados,
+        "areas_removidas": sorted(esvaziadas),
+        "segundos": manifest["segundos"],
+    }
@@ -0,0 +1,208 @@
+# indices.py — Índice por entidade (INCT / Área) sobre as bases carregadas
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import dados
+
+CATALOGO_PATH = "bases/select_incts_areas_coord_sexo.csv"
+
+# Bases indexadas por INCT (chave: Identificador) e por Área (chave: identificador_area)
+BASES_INCT = [
+    "bases/select_instituicoes_por_inct.csv",
+    "bases/big_number_qtd_producao_bibliografica_periodo.csv",
+    "bases/big_number_maior_formacao.csv",
+    "bases/wordcloud_inct_agg.csv",
+    "bases/grafico_maior_graduacao_inct.csv",
+    "bases/texto_descricao_inct.csv",
+]
+BASES_AREA = [
+    "bases/select_instituicoes_por_inct.csv",
+    "bases/big_number_qtd_producao_bibliografica_periodo_area.csv",
+    "bases/big_number_maior_formacao.csv",
+    "bases/wordcloud_area_agg.csv",
+    "bases/grafico_maior_graduacao_area.csv",
+    "bases/texto_descricao_area.csv",
+]
+
+# Modelo normalizado: nas bases, `nome_inct`/`inct_folder` e `area` dão lugar às
+# chaves inteiras das dimensões (Identificador, id_area) e as colunas de baixa
+# cardinalidade abaixo viram categóricas (códigos inteiros + dicionário).
+CATEGORICAS = ["tipo_producao", "periodo", "uf", "formacao_mais_alta"]
+COLUNAS_DIMENSAO = ["nome_inct", "inct_folder", "area"]
+SEM_CHAVE = -1  # nome ausente do catálogo
+
+
+def visao(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Novo objeto sobre os mesmos buffers de `df` (sem cópia). Com Copy-on-Write
+    (ativado em `dados`), adicionar/alterar colunas na visão não afeta `df`.
+    """
+    return df.copy(deep=False)
+
+
+def dimensoes(catalogo: pd.DataFrame) -> tuple:
+    """
+    (dim_inct, dim_area) a partir do catálogo: uma linha por INCT, chaveada pelo
+    Identificador e com o id_area da sua Área, e uma linha por Área, com
+    id_area = posição na ordem de identificador_area.
+    """
+    areas = catalogo.drop_duplicates("identificador_area").sort_values("identificador_area", kind="stable")
+    dim_area = pd.DataFrame({
+        "id_area": np.arange(len(areas), dtype="int16"),
+        "identificador_area": areas["identificador_area"].to_numpy(),
+        "area": areas["area"].to_numpy(),
+    })
+
+    incts = catalogo.drop_duplicates("Identificador")
+    dim_inct = pd.DataFrame({
+        "Identificador": incts["Identificador"].to_numpy("int32"),
+        "nome_inct": incts["nome_inct"].to_numpy(),
+        "inct_folder": incts["inct_folder"].to_numpy() if "inct_folder" in incts else None,
+        "id_area": _codigos(incts["identificador_area"], dim_area["identificador_area"], dim_area["id_area"]),
+    })
+    return dim_inct, dim_area
+
+
+def _codigos(valores: pd.Series, nomes: pd.Series, chaves: pd.Series) -> np.ndarray:
+    """Chave de cada valor (pela dimensão `nomes` → `chaves`), SEM_CHAVE se ausente."""
+    mapa = dict(zip(nomes, chaves))
+    return valores.map(mapa).fillna(SEM_CHAVE).to_numpy(chaves.dtype)
+
+
+class BaseIndexada:
+    """
+    Base ordenada (de forma estável) pela chave da entidade: as linhas de cada
+    entidade ficam contíguas e a consulta é um `iloc[início:fim]`, sem varrer o frame.
+    """
+
+    def __init__(self, df: pd.DataFrame, chaves: pd.Series):
+        validas = chaves.notna().to_numpy()
+        df, chaves = df[validas], chaves[validas].to_numpy()
+        if chaves.dtype.kind == "f":  # `map` com chaves ausentes gera float
+            chaves = chaves.astype("int64")
+
+        ordem = np.argsort(chaves, kind="stable")
+        self.df = df.iloc[ordem]
+        chaves = chaves[ordem]
+
+        unicas, inicios = np.unique(chaves, return_index=True)
+        fins = np.append(inicios[1:], len(chaves))
+        self._fatias = {
+            k.item() if hasattr(k, "item") else k: (int(i), int(f))
+            for k, i, f in zip(unicas, inicios, fins)
+        }
+
+    def get(self, chave) -> pd.DataFrame:
+        ini, fim = self._fatias.get(chave, (0, 0))
+        return self.df.iloc[ini:fim]  # fatia = visão sem cópia (Copy-on-Write)
+
+
+class IndiceEntidades:
+    """
+    Mapeia cada INCT e cada Área para as suas linhas em todas as bases.
+    Os frames são compartilhados por todas as sessões do processo: os
+    acessores devolvem só visões/fatias, nunca o objeto guardado.
+    """
+
+    def __init__(self, catalogo: pd.DataFrame):
+        self._catalogo = catalogo
+        self.id_por_nome = dict(zip(catalogo["nome_inct"], catalogo["Identificador"]))
+        self.id_area_por_nome = dict(zip(catalogo["area"], catalogo["identificador_area"]))
+
+        self._dim_inct, self._dim_area = dimensoes(catalogo)
+        self._id_area = dict(zip(self._dim_area["identificador_area"], self._dim_area["id_area"]))
+        self._identificador_area = dict(zip(self._dim_area["id_area"], self._dim_area["identificador_area"]))
+
+        self._catalogo_inct = BaseIndexada(catalogo, catalogo["Identificador"])
+        self._catalogo_area = BaseIndexada(catalogo, catalogo["identificador_area"])
+        self._bases = {}
+        self._completas = {}
+
+    @property
+    def catalogo(self) -> pd.DataFrame:
+        return visao(self._catalogo)
+
+    @property
+    def dim_inct(self) -> pd.DataFrame:
+        return visao(self._dim_inct)
+
+    @property
+    def dim_area(self) -> pd.DataFrame:
+        return visao(self._dim_area)
+
+    def chave_area(self, id_area: pd.Series) -> pd.Series:
+        """identificador_area de cada `id_area` de uma base (NaN para SEM_CHAVE)."""
+        return id_area.map(self._identificador_area)
+
+    def normalizar(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Base no modelo normalizado: chaves `Identificador` (int32) e `id_area`
+        (int16) no lugar dos nomes e CATEGORICAS como categóricas.
+        """
+        chaves = {}
+        if "nome_inct" in df:
+            chaves["Identificador"] = _codigos(df["nome_inct"], self._dim_inct["nome_inct"], self._dim_inct["Identificador"])
+        if "area" in df:
+            chaves["id_area"] = _codigos(df["area"], self._dim_area["area"], self._dim_area["id_area"])
+        resto = df.drop(columns=[c for c in COLUNAS_DIMENSAO if c in df])
+        normalizada = pd.concat([pd.DataFrame(chaves, index=df.index), resto], axis=1)
+        for col in CATEGORICAS:
+            if col in normalizada:
+                normalizada[col] = normalizada[col].astype("category")
+        return normalizada
+
+    def indexar(self, path: str, df: pd.DataFrame, nivel: str):
+        """
+        Indexa `df` (já normalizada) por INCT (`nivel="inct"`, pelo Identificador)
+        ou por Área (`nivel="area"`, pelo id_area).
+        """
+        nome = Path(path).stem
+        chaves = df["Identificador"] if nivel == "inct" else df["id_area"]
+        self._bases[(nome, nivel)] = BaseIndexada(df, chaves)
+        self._completas[nome] = df
+
+    def base(self, path: str) -> pd.DataFrame:
+        """Base completa (para filtros que não são por entidade)."""
+        df = self._completas.get(Path(path).stem)
+        return visao(df) if df is not None else pd.DataFrame()
+
+    def _get(self, path: str, nivel: str, chave) -> pd.DataFrame:
+        indexada = self._bases.get((Path(path).stem, nivel))
+        if indexada is None:
+            return pd.DataFrame()
+        return indexada.get(chave)
+
+    def inct(self, path: str, identificador) -> pd.DataFrame:
+        return self._get(path, "inct", identificador)
+
+    def area(self, path: str, identificador_area) -> pd.DataFrame:
+        return self._get(path, "area", self._id_area.get(identificador_area))
+
+    def catalogo_inct(self, nome_inct: str) -> pd.DataFrame:
+        return self._catalogo_inct.get(self.id_por_nome.get(nome_inct))
+
+    def catalogo_area(self, area: str) -> pd.DataFrame:
+        return self._catalogo_area.get(self.id_area_por_nome.get(area))
+
+
+def build_indices() -> IndiceEntidades:
+    """Carrega o catálogo e todas as bases disponíveis e monta o índice."""
+    idx = IndiceEntidades(dados.load_base(CATALOGO_PATH))
+    carregadas = {}
+    for nivel, paths in (("inct", BASES_INCT), ("area", BASES_AREA)):
+        for path in paths:
+            if not dados.base_disponivel(path):
+                continue
+            if path not in carregadas:
+                carregadas[path] = idx.normalizar(dados.load_base(path))
+            idx.indexar(path, carregadas[path], nivel)
+    return idx
+
+
+@st.cache_resource(show_spinner=False)
+def load_indices() -> IndiceEntidades:
+    """Índice único por processo, compartilhado entre sessões."""
+    return build_indices()
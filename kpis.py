@@ -0,0 +1,109 @@
+# kpis.py — Matriz de produção bibliográfica (entidade × tipo × período)
+import unicodedata
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import indices
+
+PROD_INCT_PATH = "bases/big_number_qtd_producao_bibliografica_periodo.csv"
+PROD_AREA_PATH = "bases/big_number_qtd_producao_bibliografica_periodo_area.csv"
+
+# (título exibido, tipo_producao na base)
+TIPOS = [
+    ("Artigos Publicados",               "Artigo Publicado"),
+    ("Trabalhos em Eventos",             "Trabalho Em Eventos"),
+    ("Capítulos de Livros",              "Capitulo De Livro Publicado"),
+    ("Livros Publicados/Organizados",    "Livro Publicado Ou Organizado"),
+    ("Textos em Jornais/Revistas",       "Texto Em Jornal Ou Revista"),
+    ("Outras Produções Bibliográficas",  "Outra Producao Bibliografica"),
+    ("Artigos Aceitos",                  "Artigo Aceito Para Publicacao"),
+    ("Prefácios/Pósfácios",              "Prefacio Posfacio"),
+    ("Traduções",                        "Traducao"),
+    ("Partituras Musicais",              "Partitura Musical"),
+]
+
+PERIODOS = ["2010-2015", "2015-2020", "2020-2025"]
+
+
+def normalize_text(text):
+    """Remove acentos, normaliza hífen e deixa em minúsculas."""
+    if pd.isna(text):
+        return ""
+    text = str(text).strip().lower()
+    text = unicodedata.normalize("NFKC", text)
+    text = text.replace("–", "-")  # troca hífen especial por simples
+    return text
+
+
+def _posicoes(s: pd.Series, pos: dict) -> np.ndarray:
+    """
+    Posição em `pos` (pelo texto normalizado) de cada valor da coluna, NaN se
+    ausente: `normalize_text` roda uma vez por categoria e cada linha só
+    consulta o seu código inteiro.
+    """
+    cat = s.astype("category")
+    por_codigo = np.array([pos.get(normalize_text(v), np.nan) for v in cat.cat.categories] + [np.nan])
+    return por_codigo[cat.cat.codes.to_numpy()]  # código -1 (nulo) → NaN
+
+
+class MatrizKPI:
+    """Valores densos `n_tipos_producao` indexados por [entidade, tipo, período]."""
+
+    def __init__(self, chaves, valores: np.ndarray):
+        self._linha = {k: i for i, k in enumerate(chaves)}
+        self.valores = valores
+        self._vazio = np.zeros(valores.shape[1:], dtype=valores.dtype)
+
+    def grade(self, chave) -> np.ndarray:
+        """Grade (len(TIPOS) × len(PERIODOS)) da entidade, ou zeros."""
+        i = self._linha.get(chave)
+        return self._vazio if i is None else self.valores[i]
+
+
+def build_matriz(df: pd.DataFrame, chaves: pd.Series) -> MatrizKPI:
+    """Normaliza a base de produção uma única vez e monta a matriz densa."""
+    pos_tipo = {normalize_text(t): i for i, (_, t) in enumerate(TIPOS)}
+    pos_periodo = {normalize_text(p): j for j, p in enumerate(PERIODOS)}
+
+    if df.empty:
+        return MatrizKPI([], np.zeros((0, len(TIPOS), len(PERIODOS)), dtype="int64"))
+
+    longo = pd.DataFrame({
+        "chave": chaves.to_numpy(),
+        "t": _posicoes(df["tipo_producao"], pos_tipo),
+        "p": _posicoes(df["periodo"], pos_periodo),
+        "valor": df["n_tipos_producao"].to_numpy(),
+    }).dropna(subset=["chave", "t", "p"])
+    # mesma regra do lookup antigo: vale a primeira linha de cada combinação
+    longo = longo.drop_duplicates(subset=["chave", "t", "p"], keep="first")
+
+    unicas, linhas = np.unique(longo["chave"].to_numpy(), return_inverse=True)
+    valores = np.zeros((len(unicas), len(TIPOS), len(PERIODOS)), dtype="int64")
+    valores[linhas, longo["t"].to_numpy("int64"), longo["p"].to_numpy("int64")] = longo["valor"].to_numpy("int64")
+
+    return MatrizKPI([k.item() if hasattr(k, "item") else k for k in unicas], valores)
+
+
+class KPIs:
+    """Matrizes de produção por INCT (Identificador) e por Área (identificador_area)."""
+
+    def __init__(self, idx: indices.IndiceEntidades):
+        prod_inct = idx.base(PROD_INCT_PATH)
+        prod_area = idx.base(PROD_AREA_PATH)
+        self.inct = build_matriz(
+            prod_inct,
+            prod_inct["Identificador"].where(prod_inct["Identificador"] != indices.SEM_CHAVE)
+            if not prod_inct.empty else pd.Series(dtype=object),
+        )
+        self.area = build_matriz(
+            prod_area,
+            idx.chave_area(prod_area["id_area"]) if not prod_area.empty else pd.Series(dtype=object),
+        )
+
+
+@st.cache_resource(show_spinner=False)
+def load_kpis() -> KPIs:
+    """Matrizes de KPI únicas por processo, compartilhadas entre sessões."""
+    return KPIs(indices.load_indices())
@@ -1,9 +1,10 @@
 # main_app.py — Portal principal do painel CGEE INCT
+#
+# Home e login só precisam do Streamlit: a camada de dados (pandas/pyarrow)
+# é importada depois do login e cada painel (plotly, scipy, ...) só quando
+# é escolhido. Nos reruns seguintes os imports já estão em sys.modules.
 import streamlit as st
-import pandas as pd
 from pathlib import Path
-import app_inct
-import app_area
 
 
 def do_rerun():
@@ -114,12 +115,10 @@ def gap(px=24):
     st.markdown(f"<div style='height:{px}px'></div>", unsafe_allow_html=True)
 
 # ========== LEITURA DAS BASES ==========
-@st.cache_data(show_spinner=False)
-def load_csv(path: str) -> pd.DataFrame:
-    return pd.read_csv(path)
+import indices
 
-CATALOGO_PATH = "bases/select_incts_areas_coord_sexo.csv"
-catalogo = load_csv(CATALOGO_PATH)
+idx = indices.load_indices()
+catalogo = idx.catalogo
 
 # ========== CABEÇALHO ==========
 #st.title("Rede de Competências Lattes")
@@ -159,7 +158,7 @@ with c2:
             index=None,
             placeholder="Escolha um INCT..."
         )
-        df_filtrado = catalogo[catalogo["nome_inct"] == inct_sel]
+        df_filtrado = idx.catalogo_inct(inct_sel)
 
     else:  # filtro por área
         area_sel = st.selectbox(
@@ -168,10 +167,46 @@ with c2:
             index=None,
             placeholder="Escolha uma Área..."
         )
-        df_filtrado = catalogo[catalogo["area"] == area_sel]
+        df_filtrado = idx.catalogo_area(area_sel)
 
 if df_filtrado.empty:
     st.info("👆 Escolha um INCT ou uma Área para visualizar os dados.")
+
+    # ========== BUSCA POR TEMA (índice invertido carregado uma vez por processo) ==========
+    st.markdown("#### 🔎 Quais INCTs trabalham com...")
+    consulta = st.text_input(
+        "Tema",
+        placeholder="Ex.: cana de açúcar, nanotec, covid",
+        label_visibility="collapsed",
+        key="busca_tema",
+    )
+    if consulta.strip():
+        import busca
+
+        motor_busca = busca.load_busca()
+        df_busca = motor_busca.incts(consulta)
+        if df_busca.empty:
+            st.warning("Nenhum INCT encontrado com todos esses termos.")
+        else:
+            df_areas_busca = motor_busca.areas(consulta)
+            st.caption(
+                "Por Área: " + " · ".join(
+                    f"{a} ({n} INCT{'s' if n > 1 else ''})"
+                    for a, n in zip(df_areas_busca["area"], df_areas_busca["incts"])
+                )
+            )
+            st.dataframe(
+                df_busca[["nome_inct", "area", "relevancia"]].rename(columns={
+                    "nome_inct": "INCT",
+                    "area": "Área",
+                    "relevancia": "Relevância",
+                }),
+                width="stretch",
+                hide_index=True,
+                column_config={"Relevância": st.column_config.ProgressColumn(
+                    format="%.0f", min_value=0, max_value=float(df_busca["relevancia"].max()),
+                )},
+            )
     st.stop()
 
 # uso
@@ -182,6 +217,10 @@ gap(16)
 
 # ========== DIRECIONAMENTO ==========
 if filtro_tipo == "INCT" and inct_sel:
+    import app_inct
+
     app_inct.run(inct_sel, df_filtrado)
 elif filtro_tipo == "Área" and area_sel:
+    import app_area
+
     app_area.run(area_sel, df_filtrado)
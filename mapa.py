@@ -0,0 +1,168 @@
+# mapa.py — Mapa coroplético por UF: GeoJSON local simplificado + figura base cacheada
+#
+# A geometria vem só de `geo/`, versionado com o projeto (o deploy não tem acesso
+# à internet): o build lê um arquivo local e o painel nunca busca nada na rede.
+import json
+import math
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+# Origem do GeoJSON das UFs (baixar uma vez, fora do deploy, e passar com --fonte)
+GEOJSON_ORIGEM = "https://raw.githubusercontent.com/codeforamerica/click_that_hood/master/public/data/brazil-states.geojson"
+GEO_DIR = Path("geo")
+
+# Tolerância (em graus) de cada nível de precisão gerado no build
+NIVEIS = {
+    "alto": 0.005,
+    "medio": 0.02,
+    "baixo": 0.05,
+}
+NIVEL_PADRAO = "medio"
+
+UFS = [
+    "AC","AL","AM","AP","BA","CE","DF","ES","GO","MA","MG","MS","MT",
+    "PA","PB","PE","PI","PR","RJ","RN","RO","RR","RS","SC","SE","SP","TO"
+]
+
+
+# ==========================================================
+# 🔧 BUILD DO GEOJSON
+# ==========================================================
+
+def geojson_path(nivel: str | None = None) -> Path:
+    return GEO_DIR / ("brasil_uf.geojson" if nivel is None else f"brasil_uf_{nivel}.geojson")
+
+
+def _write_json(path: Path, obj):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(obj, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def build_geojson(fonte, niveis: dict = NIVEIS) -> dict:
+    """
+    Lê o GeoJSON das UFs de um arquivo local, mantém só a `sigla` e grava a
+    geometria original + uma versão simplificada por nível de precisão.
+    A simplificação é feita sobre a cobertura inteira (`coverage_simplify`),
+    para que as fronteiras compartilhadas entre estados continuem coincidentes.
+    """
+    import geopandas as gpd
+    import shapely
+
+    if not Path(fonte).is_file():
+        raise FileNotFoundError(f"GeoJSON de origem não encontrado: {fonte} (baixar de {GEOJSON_ORIGEM})")
+
+    gdf = gpd.read_file(fonte)[["sigla", "geometry"]]
+    faltando = sorted(set(UFS) - set(gdf["sigla"]))
+    if faltando:
+        raise ValueError(f"GeoJSON sem as UFs: {faltando}")
+
+    gdf = gdf.set_index("sigla").loc[UFS].reset_index()
+    _write_json(geojson_path(), json.loads(gdf.to_json(drop_id=True)))
+
+    manifest = {"fonte": Path(fonte).name, "gerado_em": time.strftime("%Y-%m-%dT%H:%M:%S"), "niveis": {}}
+    for nivel, tolerancia in niveis.items():
+        simplificado = gdf.copy()
+        if hasattr(shapely, "coverage_simplify"):
+            simplificado["geometry"] = shapely.coverage_simplify(gdf.geometry.values, tolerancia)
+        else:
+            simplificado["geometry"] = gdf.geometry.simplify(tolerancia, preserve_topology=True)
+        # coordenadas com casas decimais compatíveis com a tolerância
+        decimais = max(2, int(-math.log10(tolerancia)) + 1)
+        simplificado["geometry"] = shapely.transform(
+            simplificado.geometry.values, lambda c: c.round(decimais)
+        )
+
+        path = geojson_path(nivel)
+        _write_json(path, json.loads(simplificado.to_json(drop_id=True)))
+        manifest["niveis"][nivel] = {
+            "arquivo": path.name,
+            "tolerancia": tolerancia,
+            "vertices": int(shapely.get_num_coordinates(simplificado.geometry.values).sum()),
+            "bytes": path.stat().st_size,
+        }
+
+    _write_json(GEO_DIR / "manifest.json", manifest)
+    return manifest
+
+
+# ==========================================================
+# 🗺️ FIGURA
+# ==========================================================
+
+@st.cache_resource(show_spinner=False)
+def load_geojson(nivel: str = NIVEL_PADRAO) -> dict:
+    """GeoJSON local do nível pedido (ou o original). Sem `geo/`, erro — nunca busca na rede."""
+    for p in (geojson_path(nivel), geojson_path()):
+        if p.exists():
+            return json.loads(p.read_text(encoding="utf-8"))
+    raise FileNotFoundError(
+        f"GeoJSON das UFs não encontrado em {GEO_DIR}/ (rodar `build_assets.py geojson --fonte <arquivo>` e versionar)"
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def base_figure(nivel: str = NIVEL_PADRAO) -> "go.Figure":
+    """Choropleth montado uma única vez; por render só os valores mudam."""
+    import plotly.express as px  # só quando o painel chega ao mapa
+
+    uf_base = pd.DataFrame({"uf": UFS, "qtd": 0.0})
+
+    fig_mapa = px.choropleth(
+        uf_base,
+        geojson=load_geojson(nivel),
+        locations="uf",
+        featureidkey="properties.sigla",
+        color="qtd",
+        hover_name="uf",
+        hover_data={"qtd": True},
+        color_continuous_scale="Blues",
+        range_color=(0, 0),
+        #title="Distribuição do Endereço Profissional por UF",
+        labels={
+                "uf": "UF",
+                "qtd": "Quantidade de Instituições/Empresas"
+            },
+    )
+    fig_mapa.update_geos(fitbounds="locations", visible=False, scope="south america")
+    fig_mapa.update_layout(
+        height=500,
+        margin=dict(l=0, r=0, t=40, b=0),
+        coloraxis_colorbar=dict(title="Instituições"),
+        dragmode=False,
+    )
+    return fig_mapa
+
+
+def contagem_uf(info_instituicao: pd.DataFrame) -> pd.DataFrame:
+    """Quantidade de instituições/empresas por UF, com todas as 27 UFs."""
+    uf_base = pd.DataFrame({"uf": UFS})
+
+    if not info_instituicao.empty:
+        uf_counts = (
+            info_instituicao.groupby("uf", observed=True)["nome_instituicao_empresa"]
+            .count()
+            .reset_index(name="qtd")
+        )
+    else:
+        uf_counts = pd.DataFrame(columns=["uf", "qtd"])
+
+    return uf_base.merge(uf_counts, on="uf", how="left").fillna(0)
+
+
+def figura_uf(uf_counts: pd.DataFrame, nivel: str = NIVEL_PADRAO) -> "go.Figure":
+    """Cópia da figura base com os valores `qtd` da entidade (na ordem de UFS)."""
+    import plotly.graph_objects as go
+
+    qtd = uf_counts.set_index("uf")["qtd"].reindex(UFS).fillna(0).astype(float)
+
+    fig_mapa = go.Figure(base_figure(nivel))
+    # `hover_data` do px lê `qtd` de customdata; z define a cor
+    fig_mapa.update_traces(z=qtd.to_numpy(), customdata=qtd.to_numpy().reshape(-1, 1))
+    fig_mapa.update_coloraxes(cmin=0, cmax=int(qtd.max()) if len(qtd) else 0)
+    return fig_mapa
@@ -0,0 +1,267 @@
+# metricas.py — Métricas das redes de coautoria (centralidade e comunidades), pré-calculadas no build
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+import dados
+import grafos
+import indices
+
+METRICAS_DIR = Path("grafos_dados")
+NOS_PATH = METRICAS_DIR / "metricas_nos.parquet"
+GRAFOS_PATH = METRICAS_DIR / "metricas_grafos.parquet"
+
+# Intermediação exata até esse tamanho; acima, estimada com k pivôs amostrados
+BETWEENNESS_EXATO_ATE = 500
+BETWEENNESS_AMOSTRA = 200
+SEMENTE = 42
+
+SCHEMA_NOS = pa.schema([
+    ("grafo", pa.dictionary(pa.int16(), pa.string())),
+    ("id", pa.string()),
+    ("nome", pa.string()),
+    ("instituicao", pa.dictionary(pa.int32(), pa.string())),
+    ("uf", pa.dictionary(pa.int8(), pa.string())),
+    ("grau", pa.int32()),
+    ("grau_ponderado", pa.float32()),
+    ("betweenness", pa.float32()),
+    ("clustering", pa.float32()),
+    ("comunidade", pa.int32()),
+])
+
+SCHEMA_GRAFOS = pa.schema([
+    ("grafo", pa.string()),
+    ("origem", pa.string()),
+    ("origem_sha256", pa.string()),
+    ("nos", pa.int32()),
+    ("arestas", pa.int32()),
+    ("densidade", pa.float64()),
+    ("componentes", pa.int32()),
+    ("clustering_medio", pa.float64()),
+    ("comunidades", pa.int32()),
+    ("modularidade", pa.float64()),
+    ("betweenness_amostrado", pa.bool_()),
+    ("segundos", pa.float64()),
+])
+
+
+# ==========================================================
+# 🧮 CÁLCULO
+# ==========================================================
+
+def calcular_metricas(nome: str, fonte, origem_sha256: str | None = None) -> tuple:
+    """Métricas por pesquisador (linhas) e o resumo do grafo `nome`."""
+    import networkx as nx
+
+    inicio = time.perf_counter()
+    G = grafos.carregar_nx(fonte)
+    n = G.number_of_nodes()
+
+    amostrado = n > BETWEENNESS_EXATO_ATE
+    betweenness = nx.betweenness_centrality(
+        G, k=BETWEENNESS_AMOSTRA if amostrado else None, seed=SEMENTE
+    )
+    clustering = nx.clustering(G)
+
+    # comunidades numeradas da maior para a menor
+    comunidades = nx.community.louvain_communities(G, weight="weight", seed=SEMENTE) if n else []
+    comunidades = sorted(comunidades, key=lambda c: (-len(c), min(c)))
+    comunidade = {no: i for i, c in enumerate(comunidades) for no in c}
+    modularidade = (
+        nx.community.modularity(G, comunidades, weight="weight") if G.number_of_edges() else 0.0
+    )
+
+    grau = dict(G.degree())
+    grau_ponderado = dict(G.degree(weight="weight"))
+    linhas = [
+        {
+            "grafo": nome,
+            "id": str(no),
+            "nome": str(attrs.get("label", no)),
+            "instituicao": attrs.get("Institution"),
+            "uf": attrs.get("State"),
+            "grau": grau[no],
+            "grau_ponderado": grau_ponderado[no],
+            "betweenness": betweenness[no],
+            "clustering": clustering[no],
+            "comunidade": comunidade.get(no, -1),
+        }
+        for no, attrs in G.nodes(data=True)
+    ]
+    resumo = {
+        "grafo": nome,
+        "origem": str(fonte),
+        "origem_sha256": origem_sha256 or dados.file_sha256(fonte),
+        "nos": n,
+        "arestas": G.number_of_edges(),
+        "densidade": nx.density(G) if n > 1 else 0.0,
+        "componentes": nx.number_connected_components(G) if n else 0,
+        "clustering_medio": sum(clustering.values()) / n if n else 0.0,
+        "comunidades": len(comunidades),
+        "modularidade": modularidade,
+        "betweenness_amostrado": amostrado,
+        "segundos": round(time.perf_counter() - inicio, 3),
+    }
+    return linhas, resumo
+
+
+def _calcular_tarefa(args):
+    return calcular_metricas(*args)
+
+
+def _write_parquet(tabela: pa.Table, out: Path):
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(".tmp")
+    pq.write_table(tabela, tmp, compression="zstd")
+    os.replace(tmp, out)
+
+
+def build_metricas(fontes: dict, workers: int | None = None) -> dict:
+    """
+    Calcula as métricas de todos os grafos de `fontes` ({nome: gexf}) em
+    paralelo. Grafos cuja fonte tem o mesmo sha256 do último build são reaproveitados.
+    """
+    anteriores, nos_anteriores = {}, pd.DataFrame()
+    if GRAFOS_PATH.exists() and NOS_PATH.exists():
+        anteriores = {r["grafo"]: r for r in pq.read_table(GRAFOS_PATH).to_pylist()}
+        nos_anteriores = pq.read_table(NOS_PATH).to_pandas()
+
+    resumos, partes, pendentes, ausentes = [], [], [], []
+    for nome, gexf in sorted(fontes.items()):
+        fonte = grafos.fonte_grafo(nome, gexf)
+        if fonte is None:
+            ausentes.append(nome)
+            continue
+        sha = dados.file_sha256(fonte)
+        anterior = anteriores.get(nome)
+        if anterior and anterior["origem"] == str(fonte) and anterior["origem_sha256"] == sha:
+            resumos.append(anterior)
+            partes.append(nos_anteriores[nos_anteriores["grafo"] == nome])
+        else:
+            pendentes.append((nome, fonte, sha))
+
+    if pendentes:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for linhas, resumo in pool.map(_calcular_tarefa, pendentes):
+                resumos.append(resumo)
+                partes.append(pd.DataFrame(linhas))
+
+    partes = [p for p in partes if not p.empty]
+    nos = pd.concat(partes, ignore_index=True) if partes else SCHEMA_NOS.empty_table().to_pandas()
+    nos["grafo"] = nos["grafo"].astype(str)
+    for col in ("instituicao", "uf"):
+        nos[col] = nos[col].astype(object).where(nos[col].notna(), None)
+    nos = nos.sort_values(["grafo", "betweenness"], ascending=[True, False], kind="stable")
+
+    _write_parquet(pa.Table.from_pandas(nos, schema=SCHEMA_NOS, preserve_index=False), NOS_PATH)
+    resumos = sorted(resumos, key=lambda r: r["grafo"])
+    _write_parquet(pa.Table.from_pylist(resumos, schema=SCHEMA_GRAFOS), GRAFOS_PATH)
+    return {"grafos": len(resumos), "calculados": len(pendentes), "ausentes": ausentes}
+
+
+# ==========================================================
+# 📊 CONSULTA (painel)
+# ==========================================================
+
+class MetricasRede:
+    """Métricas por pesquisador indexadas por grafo + resumo de cada grafo."""
+
+    def __init__(self, nos: pd.DataFrame, resumos: pd.DataFrame):
+        self._nos = indices.BaseIndexada(nos, nos["grafo"].astype(str))
+        self._resumos = {r["grafo"]: r for r in resumos.to_dict("records")}
+        self._comunidades = {}
+
+    def resumo(self, grafo: str) -> dict | None:
+        return self._resumos.get(grafo)
+
+    def pesquisadores(self, grafo: str) -> pd.DataFrame:
+        return self._nos.get(grafo)
+
+    def centrais(self, grafo: str, n: int = 10, por: str = "betweenness") -> pd.DataFrame:
+        """Os `n` pesquisadores mais centrais do grafo (intermediação, depois grau)."""
+        nos = self._nos.get(grafo)
+        outra = "grau" if por != "grau" else "betweenness"
+        return nos.sort_values([por, outra], ascending=False, kind="stable").head(n)
+
+    def comunidades(self, grafo: str) -> pd.DataFrame:
+        """Uma linha por comunidade: tamanho, instituição e UFs predominantes, pesquisador mais conectado."""
+        if grafo not in self._comunidades:
+            nos = self._nos.get(grafo)
+            if nos.empty:
+                return nos
+            ordenados = nos.sort_values(["grau", "betweenness"], ascending=False, kind="stable")
+            grupos = ordenados.groupby("comunidade", sort=True, observed=True)
+            self._comunidades[grafo] = pd.DataFrame({
+                "pesquisadores": grupos.size(),
+                "instituicao": grupos["instituicao"].agg(lambda s: s.mode().iat[0] if s.notna().any() else None),
+                "ufs": grupos["uf"].agg(lambda s: ", ".join(s.dropna().astype(str).value_counts().index[:3])),
+                "destaque": grupos["nome"].first(),
+            }).reset_index()
+        return indices.visao(self._comunidades[grafo])
+
+
+@st.cache_resource(show_spinner=False)
+def load_metricas() -> MetricasRede | None:
+    """Métricas pré-calculadas (build_assets.py metricas), únicas por processo."""
+    if not (NOS_PATH.exists() and GRAFOS_PATH.exists()):
+        return None
+    return MetricasRede(pq.read_table(NOS_PATH).to_pandas(), pq.read_table(GRAFOS_PATH).to_pandas())
+
+
+# ==========================================================
+# 🖼️ CARD (painel)
+# ==========================================================
+
+def render_card(nome_grafo: str):
+    """Card "Atores Centrais e Comunidades" do grafo (INCT ou Área); não aparece sem métricas."""
+    rede = load_metricas()
+    resumo_rede = rede.resumo(nome_grafo) if rede is not None else None
+
+    if resumo_rede:
+        st.subheader("Atores Centrais e Comunidades")
+        st.caption(
+            f"{resumo_rede['nos']} pesquisadores · {resumo_rede['arestas']} pares de coautores · "
+            f"{resumo_rede['comunidades']} comunidades (modularidade {resumo_rede['modularidade']:.2f})"
+            + (" · intermediação estimada por amostragem" if resumo_rede["betweenness_amostrado"] else "")
+        )
+
+        col_centrais, col_comunidades = st.columns(2, gap="medium")
+
+        with col_centrais:
+            with st.container(border=True):
+                st.markdown("#### Pesquisadores mais centrais")
+                df_centrais = rede.centrais(nome_grafo, n=10)[
+                    ["nome", "instituicao", "uf", "grau", "betweenness"]
+                ].rename(columns={
+                    "nome": "Pesquisador",
+                    "instituicao": "Instituição",
+                    "uf": "UF",
+                    "grau": "Coautores",
+                    "betweenness": "Intermediação",
+                })
+                st.dataframe(
+                    df_centrais,
+                    width="stretch",
+                    hide_index=True,
+                    column_config={"Intermediação": st.column_config.NumberColumn(format="%.3f")},
+                )
+
+        with col_comunidades:
+            with st.container(border=True):
+                st.markdown("#### Maiores comunidades")
+                df_comunidades = rede.comunidades(nome_grafo).head(10).assign(
+                    comunidade=lambda d: d["comunidade"] + 1
+                ).rename(columns={
+                    "comunidade": "Comunidade",
+                    "pesquisadores": "Pesquisadores",
+                    "instituicao": "Instituição predominante",
+                    "ufs": "UFs",
+                    "destaque": "Mais conectado",
+                })
+                st.dataframe(df_comunidades, width="stretch", hide_index=True)
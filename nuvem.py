@@ -0,0 +1,254 @@
+# nuvem.py — Nuvem de palavras: frequências, renderização e cache das imagens
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+CACHE_DIR = Path("cache_nuvem")
+CACHE_MAX_BYTES = 64 * 2**20  # limite do tier em memória (por processo)
+
+WC_INCT_PATH = "bases/wordcloud_inct_agg.csv"
+WC_AREA_PATH = "bases/wordcloud_area_agg.csv"
+
+# Passos do slider "Número de expressões exibidas"
+TOP_N_VALORES = range(10, 301, 10)
+
+# Remove stopwords simples
+STOPWORDS_ONEWORD = {
+    "de","da","do","das","dos","em","no","na","nas","nos","para","por",
+    "e","a","o","os","as","um","uma","com","ao","aos","se","que",
+    "sobre","entre","ou","como"
+}
+
+
+# ==========================================================
+# 🔤 FREQUÊNCIAS
+# ==========================================================
+
+def palavras_validas(palavras: pd.Series) -> pd.Series:
+    """Máscara das expressões que não são um conectivo isolado."""
+    s = palavras.astype(str)
+    mascara_um_termo = ~s.str.contains(r"\s", regex=True)
+    return ~(mascara_um_termo & s.isin(STOPWORDS_ONEWORD))
+
+
+def frequencias(wc_sel: pd.DataFrame) -> dict:
+    """Dicionário palavra → freq, sem conectivos isolados."""
+    wc_filtrado = wc_sel[palavras_validas(wc_sel["palavra"])]
+    return dict(zip(wc_filtrado["palavra"], wc_filtrado["freq"]))
+
+
+def top_frequencias(freqs: dict, top_n: int) -> dict:
+    """Ordena e pega o top_n."""
+    return dict(sorted(freqs.items(), key=lambda x: x[1], reverse=True)[:top_n])
+
+
+def digest_frequencias(freqs: dict) -> str:
+    """Hash do conteúdo das frequências (muda quando a base muda)."""
+    payload = json.dumps([[str(k), int(v)] for k, v in freqs.items()], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ==========================================================
+# 🖼️ RENDERIZAÇÃO
+# ==========================================================
+
+def render_png(freqs_top: dict) -> bytes:
+    """Gera a wordcloud 900×500 diretamente das frequências e devolve PNG."""
+    import matplotlib
+    matplotlib.use("Agg")  # renderização estática, sem display no servidor
+    from wordcloud import WordCloud
+
+    wc = WordCloud(
+        width=900,
+        height=500,
+        background_color="white",
+        colormap="Blues",
+        collocations=False,
+    ).generate_from_frequencies(freqs_top)
+
+    buf = io.BytesIO()
+    wc.to_image().save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+def cache_key(entidade: str, top_n: int, periodos, freqs_top: dict) -> str:
+    """Chave estável de (entidade, top_n, períodos, conteúdo)."""
+    partes = [str(entidade), str(int(top_n)), "|".join(sorted(map(str, periodos or []))),
+              digest_frequencias(freqs_top)]
+    return hashlib.sha256("\x1f".join(partes).encode("utf-8")).hexdigest()
+
+
+# ==========================================================
+# 🗄️ CACHE (LRU em memória + disco)
+# ==========================================================
+
+class NuvemCache:
+    """
+    Cache das imagens renderizadas: LRU em memória limitado por bytes e um
+    tier persistente em disco (PNG), compartilhável entre processos/réplicas.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._mem = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def path(self, chave: str) -> Path:
+        return self.cache_dir / chave[:2] / f"{chave}.png"
+
+    def _mem_put(self, chave: str, png: bytes):
+        with self._lock:
+            if chave in self._mem:
+                self._mem.move_to_end(chave)
+                return
+            self._mem[chave] = png
+            self._bytes += len(png)
+            while self._bytes > self.max_bytes and len(self._mem) > 1:
+                _, antigo = self._mem.popitem(last=False)
+                self._bytes -= len(antigo)
+
+    def get(self, chave: str) -> bytes | None:
+        with self._lock:
+            png = self._mem.get(chave)
+            if png is not None:
+                self._mem.move_to_end(chave)
+                return png
+
+        p = self.path(chave)
+        if p.exists():
+            png = p.read_bytes()
+            self._mem_put(chave, png)
+            return png
+        return None
+
+    def put(self, chave: str, png: bytes, memoria: bool = True):
+        if memoria:
+            self._mem_put(chave, png)
+        p = self.path(chave)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        # sessões são threads do mesmo processo: o tmp é único por escritor
+        tmp = p.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp.write_bytes(png)
+            os.replace(tmp, p)
+        except OSError:
+            # corrida perdida para outro escritor da mesma chave (mesmo conteúdo): vale a imagem dele
+            tmp.unlink(missing_ok=True)
+            if not p.exists():
+                raise
+
+    def get_or_render(self, entidade: str, top_n: int, periodos, freqs_top: dict) -> bytes:
+        chave = cache_key(entidade, top_n, periodos, freqs_top)
+        png = self.get(chave)
+        if png is None:
+            png = render_png(freqs_top)
+            self.put(chave, png)
+        return png
+
+
+@st.cache_resource(show_spinner=False)
+def load_nuvem_cache() -> NuvemCache:
+    """Cache único por processo, compartilhado entre sessões."""
+    return NuvemCache()
+
+
+# ==========================================================
+# 🏭 PRÉ-RENDERIZAÇÃO EM LOTE
+# ==========================================================
+
+def _combinacoes_periodos(periodos):
+    """Todas as seleções possíveis do multiselect de períodos (inclusive vazia)."""
+    for r in range(len(periodos) + 1):
+        yield from (list(c) for c in combinations(periodos, r))
+
+
+def variantes(idx) -> dict:
+    """
+    Enumera todas as nuvens que a UI pode pedir e agrupa as chaves de cache
+    pelo conteúdo: {digest: (freqs_top, [chaves...])}. Seleções diferentes
+    com as mesmas frequências (ex.: top_n maior que o vocabulário) são
+    renderizadas uma única vez.
+    """
+    grupos = {}
+
+    def _add(entidade, top_n, periodos, freqs):
+        freqs_top = top_frequencias(freqs, top_n)
+        digest = digest_frequencias(freqs_top)
+        grupos.setdefault(digest, (freqs_top, []))[1].append(
+            cache_key(entidade, top_n, periodos, freqs_top)
+        )
+
+    for id_inct in idx.catalogo["Identificador"]:
+        wc_sel = idx.inct(WC_INCT_PATH, id_inct)
+        freqs = frequencias(wc_sel) if not wc_sel.empty else {}
+        if freqs:
+            for top_n in TOP_N_VALORES:
+                _add(f"inct:{id_inct}", top_n, [], freqs)
+
+    base_area = idx.base(WC_AREA_PATH)
+    periodos_wc = sorted(base_area["periodo"].unique()) if not base_area.empty else []
+    for id_area in idx.catalogo["identificador_area"].unique():
+        wc_area = idx.area(WC_AREA_PATH, id_area)
+        if wc_area.empty:
+            continue
+        for periodos_sel in _combinacoes_periodos(periodos_wc):
+            wc_sel = wc_area[wc_area["periodo"].isin(periodos_sel)] if periodos_sel else wc_area
+            freqs = frequencias(wc_sel) if not wc_sel.empty else {}
+            if freqs:
+                for top_n in TOP_N_VALORES:
+                    _add(f"area:{id_area}", top_n, periodos_sel, freqs)
+
+    return grupos
+
+
+def prerender(idx, cache: NuvemCache | None = None, workers: int | None = None,
+              limpar: bool = False) -> dict:
+    """
+    Renderiza em paralelo todas as variantes ainda ausentes do tier em disco.
+    Como a chave inclui o hash das frequências, só entradas cujo conteúdo
+    mudou são renderizadas de novo. Com `limpar=True`, remove PNGs órfãos.
+    """
+    cache = cache or NuvemCache()
+    grupos = variantes(idx)
+
+    pendentes = {
+        digest: (freqs_top, chaves)
+        for digest, (freqs_top, chaves) in grupos.items()
+        if not all(cache.path(c).exists() for c in chaves)
+    }
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futuros = {
+            digest: pool.submit(render_png, freqs_top)
+            for digest, (freqs_top, _) in pendentes.items()
+        }
+        for digest, futuro in futuros.items():
+            png = futuro.result()
+            for chave in pendentes[digest][1]:
+                cache.put(chave, png, memoria=False)
+
+    removidos = 0
+    if limpar and cache.cache_dir.exists():
+        validas = {c for _, chaves in grupos.values() for c in chaves}
+        for p in cache.cache_dir.glob("*/*.png"):
+            if p.stem not in validas:
+                p.unlink()
+                removidos += 1
+
+    return {
+        "variantes": sum(len(chaves) for _, chaves in grupos.values()),
+        "imagens_unicas": len(grupos),
+        "renderizadas": len(pendentes),
+        "removidas": removidos,
+    }
@@ -0,0 +1,321 @@
+# sankey.py — Sankey de palavras-chave por período: motor de fluxos + figura nativa
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+import indices
+
+# Agregado (nivel, chave, periodo, palavra, freq) — entrada do motor
+PALAVRAS_PATH = Path("sankey_dados/palavras_periodo.parquet")
+# Sankeys pré-calculados na configuração padrão (saída do modo em lote)
+SANKEY_PATH = Path("sankey_dados/sankey.parquet")
+
+# Diretórios com os HTMLs Plotly legados (um arquivo por INCT/Área)
+HTML_DIRS = {
+    "inct": Path("sankey_inct_palavra_tratada"),
+    "area": Path("sankey_inct_palavra_tratada_area"),
+}
+
+# Quantidade de fluxos mantidos (os de maior peso)
+TOP_K_PADRAO = 80
+TOP_K_VALORES = [20, 40, 80, 120, 200, 300, 0]  # 0 = todos
+
+SCHEMA_PALAVRAS = pa.schema([
+    ("nivel", pa.dictionary(pa.int8(), pa.string())),
+    ("chave", pa.dictionary(pa.int16(), pa.string())),
+    ("periodo", pa.dictionary(pa.int8(), pa.string())),
+    ("palavra", pa.string()),
+    ("freq", pa.int32()),
+])
+
+SCHEMA = pa.schema([
+    ("nivel", pa.dictionary(pa.int8(), pa.string())),
+    ("chave", pa.string()),
+    ("janelas", pa.list_(pa.string())),
+    ("top_k", pa.int32()),
+    ("titulo", pa.string()),
+    ("label", pa.list_(pa.string())),
+    ("freq", pa.list_(pa.int32())),
+    ("cor", pa.list_(pa.dictionary(pa.int8(), pa.string()))),
+    ("source", pa.list_(pa.int32())),
+    ("target", pa.list_(pa.int32())),
+    ("value", pa.list_(pa.int32())),
+])
+
+COR_NO_ATIVO = "rgba(30,144,255,0.8)"
+COR_NO_INATIVO = "rgba(180,180,180,0.5)"
+COR_LINK = "rgba(100,149,237,0.25)"
+
+
+def _write_parquet(tabela: pa.Table, out):
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(".tmp")
+    pq.write_table(tabela, tmp, compression="zstd")
+    os.replace(tmp, out)
+
+
+# ==========================================================
+# 🔧 IMPORTAÇÃO DOS HTMLs LEGADOS
+# ==========================================================
+
+def parse_sankey_html(path) -> list:
+    """Extrai (palavra, periodo, freq) dos nós do `Plotly.newPlot(...)` de um HTML exportado."""
+    html = Path(path).read_text(encoding="utf-8")
+    inicio = html.index("Plotly.newPlot(")
+    data, _ = json.JSONDecoder().raw_decode(html, html.index("[", inicio))
+
+    node = data[0]["node"]
+    linhas = []
+    for label, freq in zip(node["label"], node["customdata"]):
+        palavra, periodo = label.rsplit(" (", 1)
+        if int(freq) > 0:
+            linhas.append((palavra, periodo.rstrip(")"), int(freq)))
+    return linhas
+
+
+def build_palavras_periodo(html_dirs: dict = HTML_DIRS, out=PALAVRAS_PATH) -> int:
+    """Converte os HTMLs legados no agregado de palavras por período usado pelo motor."""
+    linhas = []
+    for nivel, pasta in html_dirs.items():
+        for p in sorted(Path(pasta).glob("sankey_inct_*.html")):
+            chave = p.stem.removeprefix("sankey_inct_")
+            linhas.extend(
+                {"nivel": nivel, "chave": chave, "periodo": periodo, "palavra": palavra, "freq": freq}
+                for palavra, periodo, freq in parse_sankey_html(p)
+            )
+
+    if not linhas:
+        raise FileNotFoundError(f"Nenhum HTML de Sankey encontrado em {list(map(str, html_dirs.values()))}")
+
+    _write_parquet(pa.Table.from_pylist(linhas, schema=SCHEMA_PALAVRAS), out)
+    return len(linhas)
+
+
+# ==========================================================
+# ⚙️ MOTOR DE FLUXOS
+# ==========================================================
+
+def rotulo_janela(janela) -> str:
+    """Rótulo da janela: o próprio período ou o intervalo coberto (ex.: 2010-2020)."""
+    if len(janela) == 1:
+        return janela[0]
+    return f"{janela[0].split('-')[0]}-{janela[-1].split('-')[-1]}"
+
+
+def calcular_sankey(palavras: np.ndarray, matriz: np.ndarray, periodos: list,
+                    janelas, top_k: int = TOP_K_PADRAO, titulo: str = "") -> dict:
+    """
+    Fluxos de palavras-chave entre janelas consecutivas.
+
+    `matriz` é (n_palavras × n_periodos) com as frequências da entidade e cada
+    janela é uma tupla de períodos somados. O fluxo de uma palavra entre duas
+    janelas vale min(freq_i, freq_i+1) e só existe se ela aparece nas duas.
+    Mantém só os `top_k` fluxos de maior peso (0 = todos) e os nós que eles tocam.
+    """
+    pos = {p: j for j, p in enumerate(periodos)}
+    rotulos = [rotulo_janela(janela) for janela in janelas]
+    freq_jan = np.stack(
+        [matriz[:, [pos[p] for p in janela if p in pos]].sum(axis=1) for janela in janelas], axis=1
+    ) if len(janelas) else np.zeros((len(palavras), 0), dtype=matriz.dtype)
+
+    fluxo = np.minimum(freq_jan[:, :-1], freq_jan[:, 1:])
+    i_pal, i_jan = np.nonzero(fluxo)
+    valores = fluxo[i_pal, i_jan]
+
+    # maior peso primeiro; empates em ordem de janela/palavra (determinístico)
+    ordem = np.lexsort((i_pal, i_jan, -valores))
+    if top_k:
+        ordem = ordem[:top_k]
+    i_pal, i_jan, valores = i_pal[ordem], i_jan[ordem], valores[ordem]
+
+    # nós = (janela, palavra) tocados pelos fluxos mantidos, em ordem de janela/palavra
+    n = len(palavras)
+    cod_origem = i_jan * n + i_pal
+    cod_destino = (i_jan + 1) * n + i_pal
+    nos, inverso = np.unique(np.concatenate([cod_origem, cod_destino]), return_inverse=True)
+    no_jan, no_pal = np.divmod(nos, n) if n else (nos, nos)
+    freq_nos = freq_jan[no_pal, no_jan]
+
+    return {
+        "janelas": rotulos,
+        "top_k": int(top_k),
+        "titulo": titulo,
+        "label": [f"{palavras[p]} ({rotulos[j]})" for j, p in zip(no_jan, no_pal)],
+        "freq": freq_nos.tolist(),
+        "cor": [COR_NO_ATIVO if f > 0 else COR_NO_INATIVO for f in freq_nos],
+        "source": inverso[:len(valores)].tolist(),
+        "target": inverso[len(valores):].tolist(),
+        "value": valores.tolist(),
+    }
+
+
+class MotorSankey:
+    """
+    Agregado de palavras por período mantido por entidade como
+    (palavras, matriz n_palavras × n_periodos) para recortes sob demanda.
+    """
+
+    def __init__(self, palavras_periodo: pd.DataFrame, catalogo: pd.DataFrame):
+        self.periodos = sorted(palavras_periodo["periodo"].astype(str).unique())
+        self._entidades = {}
+        for (nivel, chave), grupo in palavras_periodo.groupby(["nivel", "chave"], observed=True):
+            tabela = grupo.pivot_table(
+                index="palavra", columns="periodo", values="freq", aggfunc="sum", fill_value=0, observed=True
+            ).reindex(columns=self.periodos, fill_value=0)
+            self._entidades[(str(nivel), str(chave))] = (
+                tabela.index.to_numpy(dtype=object), tabela.to_numpy(dtype="int32")
+            )
+
+        self.titulos = {
+            ("inct", str(r.Identificador)): f"Evolução das Palavras-Chave — {r.nome_inct} ({r.area})"
+            for r in catalogo.itertuples()
+        }
+        for id_area, area in catalogo.groupby("identificador_area")["area"].first().items():
+            self.titulos[("area", str(id_area))] = f"Evolução das Palavras-Chave — ({area})"
+
+    @property
+    def janelas_padrao(self) -> tuple:
+        """Um período por janela, como nos Sankeys originais."""
+        return tuple((p,) for p in self.periodos)
+
+    def entidades(self) -> list:
+        return list(self._entidades)
+
+    def sankey(self, nivel: str, chave, janelas=None, top_k: int = TOP_K_PADRAO) -> dict | None:
+        entrada = self._entidades.get((nivel, str(chave)))
+        if entrada is None:
+            return None
+        janelas = self.janelas_padrao if janelas is None else janelas
+        return calcular_sankey(*entrada, self.periodos, janelas, top_k,
+                               self.titulos.get((nivel, str(chave)), ""))
+
+
+def build_motor(palavras_path=PALAVRAS_PATH) -> MotorSankey | None:
+    if not Path(palavras_path).exists():
+        return None
+    palavras_periodo = pq.read_table(palavras_path).to_pandas()
+    return MotorSankey(palavras_periodo, indices.load_indices().catalogo)
+
+
+@st.cache_resource(show_spinner=False)
+def load_motor() -> MotorSankey | None:
+    """Motor único por processo, compartilhado entre sessões."""
+    return build_motor()
+
+
+# ==========================================================
+# 🏭 GERAÇÃO EM LOTE
+# ==========================================================
+
+def _gerar(args):
+    nivel, chave, palavras, matriz, periodos, janelas, top_k, titulo = args
+    return {"nivel": nivel, "chave": chave,
+            **calcular_sankey(palavras, matriz, periodos, janelas, top_k, titulo)}
+
+
+def gerar_todos(motor: MotorSankey, janelas=None, top_k: int = TOP_K_PADRAO,
+                workers: int | None = None, out=SANKEY_PATH) -> int:
+    """Recalcula o Sankey de todos os INCTs e Áreas em paralelo e grava o Parquet."""
+    janelas = motor.janelas_padrao if janelas is None else janelas
+    tarefas = [
+        (nivel, chave, *motor._entidades[(nivel, chave)], motor.periodos, janelas, top_k,
+         motor.titulos.get((nivel, chave), ""))
+        for nivel, chave in motor.entidades()
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        linhas = list(pool.map(_gerar, tarefas, chunksize=8))
+
+    _write_parquet(pa.Table.from_pylist(linhas, schema=SCHEMA), out)
+    return len(linhas)
+
+
+# ==========================================================
+# 🪢 FIGURA
+# ==========================================================
+
+@st.cache_resource(show_spinner=False)
+def load_sankeys(path=SANKEY_PATH) -> dict:
+    """{(nivel, chave): linha} — lido uma vez por processo."""
+    if not Path(path).exists():
+        return {}
+    return {
+        (linha["nivel"], linha["chave"]): linha
+        for linha in pq.read_table(path).to_pylist()
+    }
+
+
+@st.cache_resource(show_spinner=False, max_entries=512)
+def get_dados(nivel: str, chave, janelas: tuple | None = None, top_k: int = TOP_K_PADRAO) -> dict | None:
+    """
+    Dados do Sankey de (entidade, janelas, top_k), memoizados por processo.
+    A configuração padrão sai do Parquet pré-calculado; as demais, do motor.
+    """
+    motor = load_motor()
+    if motor is not None and janelas is not None and tuple(janelas) == motor.janelas_padrao:
+        janelas = None
+
+    if janelas is None:
+        dados = load_sankeys().get((nivel, str(chave)))
+        if dados and dados["top_k"] == top_k:
+            return dados
+
+    return motor.sankey(nivel, chave, janelas, top_k) if motor is not None else None
+
+
+def figura_sankey(dados: dict) -> "go.Figure":
+    import plotly.graph_objects as go  # só quando o painel chega ao Sankey
+
+    fig = go.Figure(go.Sankey(
+        node=dict(
+            label=dados["label"],
+            customdata=dados["freq"],
+            color=dados["cor"],
+            hovertemplate="%{label}<br>Frequência real: %{customdata}<extra></extra>",
+            line=dict(color="black", width=0.4),
+            pad=20,
+            thickness=18,
+        ),
+        link=dict(
+            source=dados["source"],
+            target=dados["target"],
+            value=dados["value"],
+            color=COR_LINK,
+            hovertemplate="Fluxo: %{value}<extra></extra>",
+        ),
+    ))
+    fig.update_layout(
+        title=dict(text=dados["titulo"]),
+        font=dict(size=11),
+        height=950,
+        margin=dict(l=10, r=10, t=60, b=10),
+    )
+    return fig
+
+
+def get_figura(nivel: str, chave, janelas: tuple | None = None, top_k: int = TOP_K_PADRAO) -> "go.Figure | None":
+    """Figura do Sankey da entidade (`nivel` = "inct" ou "area"), ou None sem fluxos."""
+    dados = get_dados(nivel, chave, janelas, top_k)
+    return figura_sankey(dados) if dados and dados["value"] else None
+
+
+def periodos() -> list:
+    """Períodos disponíveis para montar as janelas."""
+    motor = load_motor()
+    return motor.periodos if motor is not None else []
+
+
+def janelas_consecutivas(periodos_sel, por_janela: int = 1) -> tuple:
+    """
+    Janelas a partir dos períodos escolhidos, em ordem: cada `por_janela`
+    períodos consecutivos somados numa janela (a última pode ficar menor).
+    """
+    periodos_sel = sorted(periodos_sel)
+    return tuple(tuple(periodos_sel[i:i + por_janela]) for i in range(0, len(periodos_sel), por_janela))
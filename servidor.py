@@ -0,0 +1,155 @@
+# servidor.py — Sobe o Streamlit com os caches do processo já aquecidos
+#
+# Uso (no lugar de `streamlit run main_app.py`, com as mesmas opções):
+#   python servidor.py --server.port=8502 --server.address=0.0.0.0
+#
+# Antes de abrir a porta, carrega uma vez tudo o que os painéis leem via
+# st.cache_resource (cache do processo, compartilhado pelas sessões): bases e
+# índices, KPIs, busca, consultas Polars, Sankeys padrão, métricas/relações/tendências,
+# adjacências em mmap, figura base do mapa, entradas dos grafos e nuvens padrão
+# (do cache em disco). Os arquivos que o navegador pede primeiro em static/grafos/
+# são lidos para ficarem no cache de páginas do SO.
+# Enquanto aquece, /_stcore/health não responde: o healthcheck do Docker (e o
+# balanceador) só passa a ver a réplica quando ela já está quente.
+import logging
+import sys
+import time
+from pathlib import Path
+
+MAIN_SCRIPT = "main_app.py"
+
+
+def _entidades(idx):
+    """(nivel, info) de cada INCT e Área, montados como no main_app."""
+    for nome in sorted(idx.catalogo["nome_inct"].unique()):
+        yield "inct", idx.catalogo_inct(nome).iloc[0]
+    for area in sorted(idx.catalogo["area"].unique()):
+        yield "area", idx.catalogo_area(area).iloc[0]
+
+
+def _grafo(nivel: str, info) -> str:
+    """Nome do grafo, com as mesmas chaves usadas pelos painéis."""
+    if nivel == "inct":
+        return Path(info.get("path_gexf_html", "")).stem
+    return Path(info.get("path_area_gexf_html", "")).stem
+
+
+def _chave(nivel: str, info):
+    return info["Identificador"] if nivel == "inct" else info["identificador_area"]
+
+
+def aquecer_paineis(idx):
+    """Importa os módulos dos painéis e monta os objetos compartilhados que não dependem da entidade."""
+    import app_area  # noqa: F401
+    import app_inct  # noqa: F401
+    import busca
+    import consultas
+    import kpis
+    import mapa
+
+    consultas.load_consultas()
+    kpis.load_kpis()
+    busca.load_busca()
+    mapa.base_figure()
+
+
+def aquecer_sankeys(idx) -> int:
+    import sankey
+
+    janelas = tuple((p,) for p in sorted(sankey.periodos()))
+    return sum(
+        sankey.get_dados(nivel, _chave(nivel, info), janelas, sankey.TOP_K_PADRAO) is not None
+        for nivel, info in _entidades(idx)
+    )
+
+
+def aquecer_grafos(idx) -> int:
+    """Entradas do manifest + leitura do arquivo inicial (vista reduzida ou completa) de cada grafo."""
+    import estaticos
+    import grafos
+
+    lidos = 0
+    for nivel, info in _entidades(idx):
+        entrada = grafos.entrada_grafo(_grafo(nivel, info))
+        arquivo = entrada and (entrada.get("arquivo_lod") or entrada.get("arquivo"))
+        if arquivo and (estaticos.STATIC_DIR / arquivo).exists():
+            (estaticos.STATIC_DIR / arquivo).read_bytes()
+            lidos += 1
+    return lidos
+
+
+def aquecer_redes(idx) -> int:
+    import adjacencia
+    import metricas
+    import similaridade
+    import sobreposicao
+    import tendencias
+
+    metricas.load_metricas()
+    sobreposicao.load_sobreposicao()
+    similaridade.load_similaridade()
+    tendencias.load_tendencias()
+    abertas = adjacencia.load_adjacencia(adjacencia.GLOBAL) is not None
+    for nivel, info in _entidades(idx):
+        if nivel == "inct":
+            abertas += adjacencia.load_adjacencia(_grafo(nivel, info)) is not None
+    return abertas
+
+
+def aquecer_nuvens(idx) -> int:
+    """Nuvens na posição padrão do slider, do disco para o LRU em memória (sem renderizar)."""
+    import nuvem
+
+    cache = nuvem.load_nuvem_cache()
+    wc_area = idx.base(nuvem.WC_AREA_PATH)
+    periodos_area = sorted(wc_area["periodo"].unique()) if "periodo" in wc_area else []
+    carregadas = 0
+    for nivel, info in _entidades(idx):
+        chave = _chave(nivel, info)
+        if nivel == "inct":
+            wc_sel, periodos = idx.inct(nuvem.WC_INCT_PATH, chave), []
+        else:
+            wc_sel, periodos = idx.area(nuvem.WC_AREA_PATH, chave), periodos_area
+        if wc_sel.empty:
+            continue
+        freqs_top = nuvem.top_frequencias(nuvem.frequencias(wc_sel), 30)
+        carregadas += cache.get(nuvem.cache_key(f"{nivel}:{chave}", 30, periodos, freqs_top)) is not None
+    return carregadas
+
+
+def aquecer(log=print) -> dict:
+    """Executa cada etapa do aquecimento e devolve {etapa: segundos}."""
+    import indices
+
+    tempos = {}
+
+    def etapa(nome, fn, *args):
+        inicio = time.perf_counter()
+        resultado = fn(*args)
+        tempos[nome] = time.perf_counter() - inicio
+        log(f"[aquecimento] {nome}: {tempos[nome]:.2f}s" + (f" ({resultado})" if isinstance(resultado, int) else ""))
+        return resultado
+
+    idx = etapa("bases e índices", indices.load_indices)
+    etapa("painéis, KPIs, busca e mapa", aquecer_paineis, idx)
+    etapa("sankeys", aquecer_sankeys, idx)
+    etapa("redes e relações", aquecer_redes, idx)
+    etapa("grafos", aquecer_grafos, idx)
+    etapa("nuvens", aquecer_nuvens, idx)
+    log(f"[aquecimento] pronto em {sum(tempos.values()):.2f}s")
+    return tempos
+
+
+def main():
+    # fora de uma sessão o Streamlit avisa a cada chamada cacheada; o aviso não se aplica aqui
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+    aquecer()
+
+    from streamlit.web import cli
+
+    sys.argv = ["streamlit", "run", MAIN_SCRIPT, *sys.argv[1:]]
+    sys.exit(cli.main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+# similaridade.py — Temática semelhante: TF-IDF esparso das palavras-chave e vizinhos mais próximos pré-calculados
+#
+# Uma matriz esparsa entidade × palavra (INCTs e Áreas nas linhas) com peso
+# TF-IDF (tf sublinear, idf suavizado calculado sobre os INCTs) e linhas
+# normalizadas. Um único produto esparso X·Xᵀ dá o cosseno entre todas as
+# entidades; para cada uma ficam gravados os `TOP_K` INCTs e Áreas mais
+# próximos e as palavras que mais pesam em cada par.
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+import indices
+import nuvem
+import sobreposicao
+
+SIMILARIDADE_PATH = sobreposicao.RELACOES_DIR / "similaridade.parquet"
+TOP_K = 10
+TERMOS_POR_PAR = 3
+
+SCHEMA = pa.schema([
+    ("entidade", pa.string()),      # "inct:<Identificador>" ou "area:<identificador_area>"
+    ("nivel", pa.string()),         # nível do vizinho: "inct" ou "area"
+    ("relacionado", pa.string()),   # chave do vizinho (Identificador ou identificador_area)
+    ("posicao", pa.int8()),
+    ("similaridade", pa.float32()),
+    ("termos", pa.string()),        # palavras que mais contribuem para o cosseno
+])
+
+
+# ==========================================================
+# 🧮 CÁLCULO
+# ==========================================================
+
+def matriz_tfidf(linhas: np.ndarray, palavras: pd.Series, freqs: np.ndarray, n: int, docs_idf: int) -> tuple:
+    """
+    (X, vocabulário): X é `n` × palavras em CSR, com tf = 1 + log(freq) e
+    idf = log((1 + N) / (1 + df)) + 1, onde N e df contam só as `docs_idf`
+    primeiras linhas. Cada linha tem norma L2 = 1.
+    """
+    from scipy import sparse  # só no build; o painel lê a tabela pronta
+
+    codigos, vocab = pd.factorize(palavras)
+    X = sparse.csr_matrix(
+        (freqs.astype(np.float64), (linhas, codigos)), shape=(n, len(vocab))
+    )
+    X.sum_duplicates()
+    X.data = 1.0 + np.log(X.data)
+
+    df = np.bincount(X[:docs_idf].indices, minlength=len(vocab))
+    idf = np.log((1 + docs_idf) / (1 + df)) + 1.0
+    X = X.multiply(idf).tocsr()
+
+    normas = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+    normas[normas == 0] = 1.0
+    return sparse.diags(1.0 / normas) @ X, np.asarray(vocab)
+
+
+def vizinhos(S: np.ndarray, candidatos: np.ndarray, k: int) -> tuple:
+    """Para cada linha de S, as `k` colunas de `candidatos` com maior valor (exclui a própria linha)."""
+    S = S[:, candidatos].copy()
+    S[candidatos[None, :] == np.arange(len(S))[:, None]] = -np.inf
+    k = min(k, S.shape[1])
+    topo = np.argpartition(-S, k - 1, axis=1)[:, :k]
+    valores = np.take_along_axis(S, topo, axis=1)
+    ordem = np.argsort(-valores, axis=1, kind="stable")
+    topo = np.take_along_axis(topo, ordem, axis=1)
+    return candidatos[topo], np.take_along_axis(valores, ordem, axis=1)
+
+
+def termos_comuns(X: "sparse.csr_matrix", vocab: np.ndarray, a: np.ndarray, b: np.ndarray, n: int) -> list:
+    """As `n` palavras com maior contribuição X[a]·X[b] para o cosseno de cada par (a, b)."""
+    contrib = X[a].multiply(X[b]).tocsr()
+    termos = []
+    for i in range(contrib.shape[0]):
+        inicio, fim = contrib.indptr[i], contrib.indptr[i + 1]
+        pesos, cols = contrib.data[inicio:fim], contrib.indices[inicio:fim]
+        melhores = cols[np.argsort(-pesos, kind="stable")[:n]]
+        termos.append(", ".join(vocab[melhores]))
+    return termos
+
+
+def calcular_similaridade(idx: indices.IndiceEntidades, k: int = TOP_K) -> pd.DataFrame:
+    """
+    Vizinhos temáticos (INCTs e Áreas) de todos os INCTs e Áreas. Sem as bases
+    de palavras-chave, devolve a tabela vazia (o card do painel não aparece).
+    """
+    wc_inct = idx.base(nuvem.WC_INCT_PATH)
+    wc_area = idx.base(nuvem.WC_AREA_PATH)
+
+    ids_inct = idx.catalogo["Identificador"].drop_duplicates().to_numpy()
+    ids_area = np.sort(idx.catalogo["identificador_area"].unique())
+    linha_inct = {int(i): k for k, i in enumerate(ids_inct)}
+    linha_area = {a: len(ids_inct) + k for k, a in enumerate(ids_area)}
+    entidades = np.array([f"inct:{i}" for i in ids_inct] + [f"area:{a}" for a in ids_area])
+    chaves = np.array([str(i) for i in ids_inct] + list(ids_area))
+    niveis = np.array(["inct"] * len(ids_inct) + ["area"] * len(ids_area))
+
+    # só as bases presentes (como em busca.BuscaINCT)
+    fontes = []
+    if not wc_inct.empty:
+        wc_inct = wc_inct[nuvem.palavras_validas(wc_inct["palavra"])]
+        fontes.append((wc_inct["Identificador"].map(linha_inct), wc_inct))
+    if not wc_area.empty:
+        wc_area = wc_area[nuvem.palavras_validas(wc_area["palavra"])]
+        fontes.append((idx.chave_area(wc_area["id_area"]).map(linha_area), wc_area))
+    if not fontes:
+        return SCHEMA.empty_table().to_pandas()
+
+    linhas = pd.concat([l for l, _ in fontes], ignore_index=True)
+    palavras = pd.concat([wc["palavra"] for _, wc in fontes], ignore_index=True).astype(str)
+    freqs = pd.concat([wc["freq"] for _, wc in fontes], ignore_index=True)
+    validas = (linhas.notna() & (freqs > 0)).to_numpy()
+    if not validas.any():
+        return SCHEMA.empty_table().to_pandas()
+
+    X, vocab = matriz_tfidf(
+        linhas[validas].to_numpy(dtype=np.int64),
+        palavras[validas],
+        freqs[validas].to_numpy(),
+        len(entidades),
+        docs_idf=len(ids_inct),
+    )
+    S = (X @ X.T).toarray()
+
+    partes = []
+    for nivel, candidatos in (("inct", np.arange(len(ids_inct))), ("area", len(ids_inct) + np.arange(len(ids_area)))):
+        topo, valores = vizinhos(S, candidatos, k)
+        a = np.repeat(np.arange(len(entidades)), topo.shape[1])
+        b, v = topo.ravel(), valores.ravel()
+        manter = v > 0
+        a, b, v = a[manter], b[manter], v[manter]
+        partes.append(pd.DataFrame({
+            "entidade": entidades[a],
+            "nivel": nivel,
+            "relacionado": chaves[b],
+            "posicao": np.tile(np.arange(topo.shape[1]), len(entidades))[manter] + 1,
+            "similaridade": v,
+            "termos": termos_comuns(X, vocab, a, b, TERMOS_POR_PAR),
+        }))
+    return pd.concat(partes, ignore_index=True).sort_values(
+        ["entidade", "nivel", "posicao"], kind="stable"
+    ).reset_index(drop=True)
+
+
+def build_similaridade(idx: indices.IndiceEntidades, out: Path = SIMILARIDADE_PATH, k: int = TOP_K) -> dict:
+    inicio = time.perf_counter()
+    tabela = calcular_similaridade(idx, k)
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(".tmp")
+    pq.write_table(pa.Table.from_pandas(tabela, schema=SCHEMA, preserve_index=False), tmp, compression="zstd")
+    os.replace(tmp, out)
+    return {
+        "entidades": tabela["entidade"].nunique(),
+        "pares": len(tabela),
+        "segundos": round(time.perf_counter() - inicio, 3),
+    }
+
+
+# ==========================================================
+# 📊 CONSULTA (painel)
+# ==========================================================
+
+class Similaridade:
+    """Vizinhos temáticos pré-calculados, fatiados por entidade."""
+
+    def __init__(self, tabela: pd.DataFrame):
+        self._vizinhos = indices.BaseIndexada(tabela, tabela["entidade"])
+
+    def semelhantes(self, nivel: str, chave, nivel_vizinho: str = "inct", n: int = TOP_K) -> pd.DataFrame:
+        """Os `n` INCTs (ou Áreas) de temática mais próxima do INCT/Área `chave`."""
+        vizinhos = self._vizinhos.get(f"{nivel}:{chave}")
+        return vizinhos[vizinhos["nivel"] == nivel_vizinho].head(n)
+
+
+@st.cache_resource(show_spinner=False)
+def load_similaridade() -> Similaridade | None:
+    """Similaridade pré-calculada (build_assets.py similaridade), única por processo."""
+    if not SIMILARIDADE_PATH.exists():
+        return None
+    return Similaridade(pq.read_table(SIMILARIDADE_PATH).to_pandas())
+
+
+# ==========================================================
+# 🖼️ CARD (painel)
+# ==========================================================
+
+def render_card(nivel: str, chave):
+    """
+    Card "INCTs com temática semelhante" do INCT/Área (`nivel`, `chave`); no
+    painel da Área, com as Áreas mais próximas na legenda. Não aparece sem vizinhos.
+    """
+    simil = load_similaridade()
+    df_semelhantes = simil.semelhantes(nivel, chave) if simil is not None else None
+    if df_semelhantes is None or df_semelhantes.empty:
+        return
+
+    catalogo = indices.load_indices().catalogo
+    with st.container(border=True):
+        st.markdown("#### INCTs com temática semelhante")
+        if nivel == "area":
+            areas_proximas = simil.semelhantes("area", chave, nivel_vizinho="area", n=3)
+            nome_area = dict(zip(catalogo["identificador_area"], catalogo["area"]))
+            if not areas_proximas.empty:
+                st.caption(
+                    "Áreas mais próximas: "
+                    + " · ".join(f"{nome_area.get(a, a)} ({v:.2f})" for a, v in zip(
+                        areas_proximas["relacionado"], areas_proximas["similaridade"]
+                    ))
+                )
+        catalogo = catalogo.set_index("Identificador")
+        ids_semelhantes = df_semelhantes["relacionado"].astype(int)
+        st.dataframe(
+            pd.DataFrame({
+                "INCT": ids_semelhantes.map(catalogo["nome_inct"]).to_numpy(),
+                "Área": ids_semelhantes.map(catalogo["area"]).to_numpy(),
+                "Similaridade": df_semelhantes["similaridade"].to_numpy(),
+                "Palavras que aproximam": df_semelhantes["termos"].to_numpy(),
+            }),
+            width="stretch",
+            hide_index=True,
+            column_config={"Similaridade": st.column_config.ProgressColumn(format="%.2f", min_value=0, max_value=1)},
+        )
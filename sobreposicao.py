@@ -0,0 +1,143 @@
+# sobreposicao.py — INCTs relacionados: pesquisadores e instituições em comum (matrizes de incidência esparsas)
+#
+# Duas matrizes binárias INCT × pesquisador (nós dos grafos de cada INCT) e
+# INCT × instituição (select_instituicoes_por_inct.csv). Um único produto
+# esparso A·Aᵀ por matriz dá o número de itens em comum de todos os pares de
+# INCTs; o Jaccard sai da diagonal (tamanho de cada conjunto). Só os pares com
+# alguma sobreposição são gravados, ordenados por INCT, e o painel lê a fatia
+# do INCT em tempo constante.
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+import grafos_area
+import indices
+import kpis
+
+RELACOES_DIR = Path("relacoes_dados")
+SOBREPOSICAO_PATH = RELACOES_DIR / "sobreposicao.parquet"
+INST_PATH = "bases/select_instituicoes_por_inct.csv"
+
+SCHEMA = pa.schema([
+    ("inct", pa.int16()),
+    ("relacionado", pa.int16()),
+    ("pesquisadores_comuns", pa.int32()),
+    ("jaccard_pesquisadores", pa.float32()),
+    ("instituicoes_comuns", pa.int32()),
+    ("jaccard_instituicoes", pa.float32()),
+])
+
+
+# ==========================================================
+# 🧮 CÁLCULO
+# ==========================================================
+
+def incidencia(linhas: pd.Series, colunas: pd.Series, n_linhas: int) -> "sparse.csr_matrix":
+    """Matriz binária esparsa `n_linhas` × (itens distintos de `colunas`)."""
+    from scipy import sparse  # só no build; o painel lê a tabela pronta
+
+    validas = linhas.notna().to_numpy() & colunas.notna().to_numpy()
+    linhas = linhas[validas].to_numpy(dtype=np.int64)
+    codigos, _ = pd.factorize(colunas[validas])
+    m = sparse.csr_matrix(
+        (np.ones(len(linhas), dtype=np.int32), (linhas, codigos)),
+        shape=(n_linhas, int(codigos.max()) + 1 if len(codigos) else 0),
+    )
+    m.data[:] = 1  # entradas repetidas (mesmo item duas vezes no INCT) contam uma vez
+    return m
+
+
+def sobreposicao(A: "sparse.csr_matrix") -> tuple:
+    """(itens em comum, Jaccard) de todos os pares de linhas de A, como matrizes densas."""
+    comuns = (A @ A.T).toarray()
+    tamanhos = np.diag(comuns)
+    uniao = tamanhos[:, None] + tamanhos[None, :] - comuns
+    with np.errstate(divide="ignore", invalid="ignore"):
+        jaccard = np.where(uniao > 0, comuns / uniao, 0.0)
+    return comuns, jaccard
+
+
+def calcular_sobreposicao(catalogo: pd.DataFrame, nos: pd.DataFrame, inst: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tabela de pares (inct, relacionado) com pesquisadores e instituições em comum.
+    `nos` traz (inct = nome do grafo, id) e `inst` as linhas da base de instituições.
+    """
+    ids = catalogo["Identificador"].to_numpy()
+    linha_por_id = {int(i): k for k, i in enumerate(ids)}
+    linha_por_grafo = {
+        Path(p).stem: linha_por_id[int(i)] for p, i in zip(catalogo["path_gexf_html"], ids)
+    }
+
+    A_pesq = incidencia(nos["inct"].map(linha_por_grafo), nos["id"], len(ids))
+
+    # "NA" é instituição não informada; nomes comparados sem diferenciar caixa
+    nomes_inst = inst["nome_instituicao_empresa"].where(inst["nome_instituicao_empresa"].astype(str) != "NA")
+    A_inst = incidencia(inst["Identificador"].map(linha_por_id), nomes_inst.map(kpis.normalize_text, na_action="ignore"), len(ids))
+
+    comuns_p, jaccard_p = sobreposicao(A_pesq)
+    comuns_i, jaccard_i = sobreposicao(A_inst)
+
+    a, b = np.nonzero((comuns_p > 0) | (comuns_i > 0))
+    outros = a != b
+    a, b = a[outros], b[outros]
+    tabela = pd.DataFrame({
+        "inct": ids[a],
+        "relacionado": ids[b],
+        "pesquisadores_comuns": comuns_p[a, b],
+        "jaccard_pesquisadores": jaccard_p[a, b],
+        "instituicoes_comuns": comuns_i[a, b],
+        "jaccard_instituicoes": jaccard_i[a, b],
+    })
+    return tabela.sort_values(
+        ["inct", "jaccard_pesquisadores", "jaccard_instituicoes"], ascending=[True, False, False], kind="stable"
+    ).reset_index(drop=True)
+
+
+def build_sobreposicao(idx: indices.IndiceEntidades, out: Path = SOBREPOSICAO_PATH) -> dict:
+    """Calcula a sobreposição de todos os pares de INCTs (rodar `grafos-area` antes)."""
+    nos = pq.read_table(grafos_area.NOS_PATH, columns=["inct", "id"]).to_pandas()
+    tabela = calcular_sobreposicao(idx.catalogo, nos, idx.base(INST_PATH))
+
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(".tmp")
+    pq.write_table(pa.Table.from_pandas(tabela, schema=SCHEMA, preserve_index=False), tmp, compression="zstd")
+    os.replace(tmp, out)
+    return {
+        "incts": len(idx.catalogo),
+        "pares": len(tabela),
+        "pares_pesquisadores": int((tabela["pesquisadores_comuns"] > 0).sum()),
+        "pares_instituicoes": int((tabela["instituicoes_comuns"] > 0).sum()),
+    }
+
+
+# ==========================================================
+# 📊 CONSULTA (painel)
+# ==========================================================
+
+class Sobreposicao:
+    """Pares de INCTs com sobreposição, fatiados por INCT (consulta sem varrer a tabela)."""
+
+    def __init__(self, tabela: pd.DataFrame):
+        self._pares = indices.BaseIndexada(tabela, tabela["inct"])
+
+    def relacionados(self, identificador, n: int = 10, por: str = "pesquisadores") -> pd.DataFrame:
+        """Os `n` INCTs com maior Jaccard de `por` ("pesquisadores" ou "instituicoes")."""
+        pares = self._pares.get(int(identificador))
+        outra = "instituicoes" if por == "pesquisadores" else "pesquisadores"
+        ordem = [f"jaccard_{por}", f"{por}_comuns", f"jaccard_{outra}"]
+        pares = pares[pares[f"{por}_comuns"] > 0]
+        return pares.sort_values(ordem, ascending=False, kind="stable").head(n)
+
+
+@st.cache_resource(show_spinner=False)
+def load_sobreposicao() -> Sobreposicao | None:
+    """Sobreposição pré-calculada (build_assets.py sobreposicao), única por processo."""
+    if not SOBREPOSICAO_PATH.exists():
+        return None
+    return Sobreposicao(pq.read_table(SOBREPOSICAO_PATH).to_pandas())
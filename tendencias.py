@@ -0,0 +1,162 @@
+# tendencias.py — Sinais fracos e fortes: palavras emergentes e em declínio por INCT/Área
+#
+# Sobre o agregado palavra × período do Sankey (sankey_dados/palavras_periodo.parquet),
+# compara o último período com os anteriores para todos os pares (entidade, palavra)
+# de uma vez:
+#   crescimento  log2 da razão entre a participação da palavra no último período e
+#                nos anteriores (suavização aditiva ALFA por palavra);
+#   novidade     a palavra só aparece no último período;
+#   burst        desvio padronizado da frequência atual em relação à esperada pela
+#                participação anterior: (f - E) / sqrt(E), E = total_atual · p_anterior.
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+import indices
+import sankey
+
+TENDENCIAS_PATH = Path("sankey_dados") / "tendencias.parquet"
+ALFA = 0.5
+MIN_FREQ = 3  # frequência mínima no período em que a palavra é forte (evita ruído de contagens 1–2)
+
+SCHEMA = pa.schema([
+    ("nivel", pa.dictionary(pa.int8(), pa.string())),
+    ("chave", pa.dictionary(pa.int16(), pa.string())),
+    ("palavra", pa.string()),
+    ("freq_anterior", pa.int32()),
+    ("freq_atual", pa.int32()),
+    ("crescimento", pa.float32()),
+    ("novidade", pa.bool_()),
+    ("burst", pa.float32()),
+])
+
+
+# ==========================================================
+# 🧮 CÁLCULO (vetorizado para todas as entidades)
+# ==========================================================
+
+def calcular_tendencias(palavras_periodo: pd.DataFrame, periodo_atual: str | None = None) -> pd.DataFrame:
+    """Uma linha por (nivel, chave, palavra) com as métricas de tendência."""
+    df = palavras_periodo.astype({"nivel": str, "chave": str, "periodo": str})
+    periodos = sorted(df["periodo"].unique())
+    periodo_atual = periodo_atual or periodos[-1]
+
+    # matriz (entidade, palavra) × {anterior, atual}
+    atual = df["periodo"] == periodo_atual
+    anterior = df["periodo"] < periodo_atual
+    df = df[atual | anterior].assign(coluna=np.where(atual[atual | anterior], "freq_atual", "freq_anterior"))
+    F = df.pivot_table(
+        index=["nivel", "chave", "palavra"], columns="coluna", values="freq", aggfunc="sum", fill_value=0
+    ).reindex(columns=["freq_anterior", "freq_atual"], fill_value=0)
+
+    f_ant = F["freq_anterior"].to_numpy(dtype=np.float64)
+    f_atu = F["freq_atual"].to_numpy(dtype=np.float64)
+
+    # totais e vocabulário por entidade, propagados para cada linha
+    entidade = F.index.droplevel("palavra")
+    codigos, _ = pd.factorize(entidade)
+    tot_ant = np.bincount(codigos, weights=f_ant)[codigos]
+    tot_atu = np.bincount(codigos, weights=f_atu)[codigos]
+    vocab = np.bincount(codigos)[codigos]
+
+    p_ant = (f_ant + ALFA) / (tot_ant + ALFA * vocab)
+    p_atu = (f_atu + ALFA) / (tot_atu + ALFA * vocab)
+    esperado = tot_atu * p_ant
+
+    tabela = F.reset_index()
+    tabela.columns.name = None
+    tabela["crescimento"] = np.log2(p_atu / p_ant)
+    tabela["novidade"] = (f_ant == 0) & (f_atu > 0)
+    tabela["burst"] = np.where(esperado > 0, (f_atu - esperado) / np.sqrt(np.maximum(esperado, 1e-12)), 0.0)
+    return tabela.sort_values(["nivel", "chave", "burst"], ascending=[True, True, False], kind="stable")
+
+
+def build_tendencias(palavras_path=sankey.PALAVRAS_PATH, out: Path = TENDENCIAS_PATH) -> dict:
+    inicio = time.perf_counter()
+    palavras_periodo = pq.read_table(palavras_path).to_pandas()
+    tabela = calcular_tendencias(palavras_periodo)
+
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(".tmp")
+    pq.write_table(pa.Table.from_pandas(tabela, schema=SCHEMA, preserve_index=False), tmp, compression="zstd")
+    os.replace(tmp, out)
+    return {
+        "pares": len(tabela),
+        "entidades": tabela[["nivel", "chave"]].drop_duplicates().shape[0],
+        "segundos": round(time.perf_counter() - inicio, 3),
+    }
+
+
+# ==========================================================
+# 📊 CONSULTA (painel)
+# ==========================================================
+
+class Tendencias:
+    """Métricas de tendência fatiadas por entidade (linhas já ordenadas por burst)."""
+
+    def __init__(self, tabela: pd.DataFrame):
+        chaves = tabela["nivel"].astype(str) + ":" + tabela["chave"].astype(str)
+        self._tabela = indices.BaseIndexada(tabela, chaves)
+
+    def emergentes(self, nivel: str, chave, n: int = 10) -> pd.DataFrame:
+        t = self._tabela.get(f"{nivel}:{chave}")
+        return t[(t["burst"] > 0) & (t["freq_atual"] >= MIN_FREQ)].head(n)
+
+    def em_declinio(self, nivel: str, chave, n: int = 10) -> pd.DataFrame:
+        t = self._tabela.get(f"{nivel}:{chave}")
+        return t[(t["burst"] < 0) & (t["freq_anterior"] >= MIN_FREQ)].iloc[::-1].head(n)
+
+
+@st.cache_resource(show_spinner=False)
+def load_tendencias() -> Tendencias | None:
+    """Tendências pré-calculadas (build_assets.py tendencias), únicas por processo."""
+    if not TENDENCIAS_PATH.exists():
+        return None
+    return Tendencias(pq.read_table(TENDENCIAS_PATH).to_pandas())
+
+
+# ==========================================================
+# 🖼️ CARDS (painel)
+# ==========================================================
+
+def render_cards(nivel: str, chave):
+    """Cards "Palavras emergentes" | "Palavras em declínio" do INCT/Área, com a legenda."""
+    tend = load_tendencias()
+    if tend is None:
+        return
+
+    atual = sankey.periodos()[-1]
+    col_emergentes, col_declinio = st.columns(2, gap="medium")
+    for col, titulo, df_tend in (
+        (col_emergentes, "#### Palavras emergentes", tend.emergentes(nivel, chave)),
+        (col_declinio, "#### Palavras em declínio", tend.em_declinio(nivel, chave)),
+    ):
+        with col:
+            with st.container(border=True):
+                st.markdown(titulo)
+                if df_tend.empty:
+                    st.info("Nenhuma palavra com variação relevante entre os períodos.")
+                    continue
+                st.dataframe(
+                    pd.DataFrame({
+                        "Palavra": df_tend["palavra"].to_numpy(),
+                        "Antes": df_tend["freq_anterior"].to_numpy(),
+                        atual: df_tend["freq_atual"].to_numpy(),
+                        "Variação (log₂)": df_tend["crescimento"].to_numpy(),
+                        "Nova": df_tend["novidade"].to_numpy(),
+                    }),
+                    width="stretch",
+                    hide_index=True,
+                    column_config={"Variação (log₂)": st.column_config.NumberColumn(format="%+.2f")},
+                )
+    st.caption(
+        f"Frequência das palavras-chave em {atual} comparada à dos períodos anteriores, "
+        "ordenadas pelo desvio em relação ao esperado (burst)."
+    )